@@ -1,12 +1,28 @@
 # app/api/routes.py
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+import json
+import openai
+from pandas.tseries.frequencies import to_offset
 from typing import Optional, List, Dict
 from datetime import datetime
 
 from app.data.reddit_client import collect as collect_reddit_data
-from app.rag.query_engine import search_similar_posts, generate_answer_from_context
+from app.rag.query_engine import (
+    search_similar_posts, generate_answer_from_context, search_collections, generate_comparison_from_context
+)
 from app.embedding.embed_posts import process_and_store_embeddings
+from app.llm.gateway import LLMUnavailableError
+from app.monitoring.metrics import span
+from app.monitoring.progress import bind_pipeline, get_progress_broker, publish_status
+from app.rag.warmup import get_precomputed_answer, schedule_warmup
+from app.scheduler import WatchedTicker, get_scheduler
+from app.sentiment.aggregate import aggregate_sentiment
+from app.vector_store.client import scroll_payloads
+from app.vector_store.profiles import COLLECTION_PROFILES
+from app.vector_store.registry import list_collection_info
+from app.vector_store.restore import restore_collections
 
 router = APIRouter()
 
@@ -15,11 +31,29 @@ class StockRequest(BaseModel):
     stock_symbol: str
     search_query: Optional[str] = None
     limit: Optional[int] = 50
+    profile: Optional[str] = None  # "small", "medium" or "large"; chosen by size if omitted
+    include_comments: Optional[bool] = None  # INGEST_COMMENTS if omitted
 
 class QueryRequest(BaseModel):
     stock_symbol: str
     question: str
     top_k: Optional[int] = 5
+    # MMR re-ranking: 1.0 = relevance only, lower values favour diverse posts; MMR_LAMBDA if omitted
+    mmr_lambda: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+class CompareRequest(BaseModel):
+    stock_symbols: List[str]
+    question: str
+    top_k: Optional[int] = 5  # per ticker
+
+class RestoreRequest(BaseModel):
+    datasets: Optional[List[str]] = None  # all saved datasets if omitted
+    recreate: Optional[bool] = False
+
+class WatchRequest(BaseModel):
+    stock_symbol: str
+    search_query: Optional[str] = None
+    interval_seconds: Optional[int] = None  # REFRESH_INTERVAL_SECONDS if omitted
 
 class PipelineResponse(BaseModel):
     status: str
@@ -30,6 +64,12 @@ class PipelineResponse(BaseModel):
 # Global storage for pipeline status
 pipeline_status = {}
 
+# Seconds between keep-alive comments on idle progress streams
+PROGRESS_KEEPALIVE_SECONDS = 15
+
+# Status of the latest bulk restore
+restore_status = {"status": "idle", "results": []}
+
 @router.get("/")
 async def root():
     return {"message": "RAG Stock Sentiment API is running."}
@@ -44,13 +84,15 @@ async def collect_stock_data(request: StockRequest, background_tasks: Background
     search_query = request.search_query or f"{stock_symbol} stock"
     limit = request.limit or 50
     collection_name = f"{stock_symbol.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if request.profile and request.profile not in COLLECTION_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown profile '{request.profile}', choose one of {list(COLLECTION_PROFILES)}"
+        )
     
     # Update status
-    pipeline_status[collection_name] = {
-        "status": "starting",
-        "message": f"Starting data collection for {stock_symbol}",
-        "timestamp": datetime.now().isoformat()
-    }
+    pipeline_status[collection_name] = {}
+    set_pipeline_status(collection_name, "starting", f"Starting data collection for {stock_symbol}")
     
     # Start background task
     background_tasks.add_task(
@@ -58,7 +100,9 @@ async def collect_stock_data(request: StockRequest, background_tasks: Background
         stock_symbol, 
         search_query, 
         limit, 
-        collection_name
+        collection_name,
+        request.profile,
+        request.include_comments
     )
     
     return PipelineResponse(
@@ -76,12 +120,48 @@ async def get_pipeline_status(collection_name: str):
     if collection_name not in pipeline_status:
         raise HTTPException(status_code=404, detail="Pipeline not found")
     
-    return pipeline_status[collection_name]
+    return {
+        **pipeline_status[collection_name],
+        "progress": get_progress_broker().latest(collection_name)
+    }
+
+@router.get("/pipeline-progress/{collection_name}")
+async def stream_pipeline_progress(collection_name: str, request: Request):
+    """
+    Stream structured progress events of a pipeline as Server-Sent Events.
+    The stream ends after the pipeline completed or failed.
+    """
+    if collection_name not in pipeline_status:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+    
+    broker = get_progress_broker()
+    subscription = broker.subscribe(collection_name)
+    
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                batch = await subscription.get(PROGRESS_KEEPALIVE_SECONDS)
+                if not batch:
+                    yield ": keep-alive\n\n"
+                    continue
+                for event in batch:
+                    yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                if any(event.get("done") for event in batch):
+                    break
+        finally:
+            broker.unsubscribe(collection_name, subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/query")
-async def query_stock_sentiment(request: QueryRequest):
+def query_stock_sentiment(request: QueryRequest):
     """
     Query the sentiment analysis for a specific stock using the RAG system.
+    Runs in the threadpool, so concurrent identical questions share one LLM call.
     """
     stock_symbol = request.stock_symbol.upper()
     question = request.question
@@ -95,12 +175,28 @@ async def query_stock_sentiment(request: QueryRequest):
             detail=f"No data found for {stock_symbol}. Please run data collection first."
         )
     
+    # Canonical questions were answered right after ingestion
+    if request.mmr_lambda is None:
+        precomputed = get_precomputed_answer(collection_name, question, top_k)
+        if precomputed is not None:
+            return {
+                "stock_symbol": stock_symbol,
+                "question": question,
+                "answer": precomputed["answer"],
+                "context_posts": precomputed["context_posts"],
+                "collection_name": collection_name,
+                "precomputed": True,
+                "computed_at": precomputed["computed_at"],
+                "timestamp": datetime.now().isoformat()
+            }
+    
     try:
-        # Search for similar posts
-        context = search_similar_posts(question, collection_name, top_k)
-        
-        # Generate answer
-        answer = generate_answer_from_context(question, context)
+        with span("api_query"):
+            # Search for similar posts
+            context = search_similar_posts(question, collection_name, top_k, request.mmr_lambda)
+
+            # Generate answer
+            answer = generate_answer_from_context(question, context)
         
         return {
             "stock_symbol": stock_symbol,
@@ -108,29 +204,213 @@ async def query_stock_sentiment(request: QueryRequest):
             "answer": answer,
             "context_posts": len(context),
             "collection_name": collection_name,
+            "precomputed": False,
             "timestamp": datetime.now().isoformat()
         }
+    except (openai.RateLimitError, LLMUnavailableError):
+        raise HTTPException(status_code=503, detail="LLM rate limit reached, please retry later.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
+@router.post("/compare")
+def compare_stocks(request: CompareRequest):
+    """
+    Answer one question comparatively across several stocks.
+    The question is encoded once and all collections are searched concurrently.
+    """
+    stock_symbols = list(dict.fromkeys(s.upper() for s in request.stock_symbols))
+    if not stock_symbols:
+        raise HTTPException(status_code=400, detail="At least one stock symbol is required.")
+    question = request.question
+    top_k = request.top_k or 5
+    
+    collections = {symbol: find_latest_collection(symbol) for symbol in stock_symbols}
+    missing = [symbol for symbol, name in collections.items() if not name]
+    collections = {symbol: name for symbol, name in collections.items() if name}
+    if not collections:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No data found for {', '.join(missing)}. Please run data collection first."
+        )
+    
+    try:
+        with span("api_compare"):
+            results = search_collections(question, list(collections.values()), top_k)
+            contexts = {symbol: results[name] for symbol, name in collections.items()}
+            answer, used = generate_comparison_from_context(question, contexts)
+        
+        return {
+            "stock_symbols": list(collections),
+            "question": question,
+            "answer": answer,
+            "tickers": {
+                symbol: {
+                    "collection_name": collections[symbol],
+                    "context_posts": used[symbol],
+                    "sources": [
+                        {
+                            "post_id": post.get("post_id"),
+                            "title": post.get("title"),
+                            "score": post.get("score"),
+                            "sentiment_label": post.get("sentiment_label"),
+                            "relevance": post.get("relevance"),
+                        }
+                        for post in contexts[symbol][:used[symbol]]
+                    ],
+                }
+                for symbol in collections
+            },
+            "missing": missing,
+            "timestamp": datetime.now().isoformat()
+        }
+    except (openai.RateLimitError, LLMUnavailableError):
+        raise HTTPException(status_code=503, detail="LLM rate limit reached, please retry later.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing comparison: {str(e)}")
+
+@router.get("/sentiment/{stock_symbol}")
+def get_sentiment_aggregate(
+    stock_symbol: str,
+    bucket: str = Query("1D", description="Time bucket as pandas offset alias, e.g. 1h, 1D, 1W")
+):
+    """
+    Aggregate the precomputed per-post sentiment of the latest collection, and
+    separately the sentiment of its comments.
+    No LLM call is made; the scores are read from the stored payloads.
+    Runs in the threadpool, so scrolling the collection does not block the event loop.
+    """
+    try:
+        to_offset(bucket)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid bucket '{bucket}': {str(e)}")
+
+    stock_symbol = stock_symbol.upper()
+    collection_name = find_latest_collection(stock_symbol)
+    if not collection_name:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"No data found for {stock_symbol}. Please run data collection first."
+        )
+    
+    try:
+        with span("api_sentiment"):
+            payloads = scroll_payloads(
+                collection_name,
+                fields=[
+                    "post_id", "sentiment", "score", "created_utc",
+                    "comment_id", "comment_sentiment", "comment_score", "comment_created_utc",
+                ]
+            )
+            aggregates = aggregate_sentiment(payloads, bucket)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error aggregating sentiment: {str(e)}")
+    
+    return {
+        "stock_symbol": stock_symbol,
+        "collection_name": collection_name,
+        **aggregates,
+        "timestamp": datetime.now().isoformat()
+    }
+
 @router.get("/collections")
 async def list_collections():
     """
     List all available data collections.
     """
-    # This would typically query your vector store for available collections
-    # For now, return the pipeline status keys
+    # Pipelines of this process plus everything recorded in the collection registry
+    collections = sorted(set(pipeline_status) | set(list_collection_info()))
+    return {
+        "collections": collections,
+        "total": len(collections)
+    }
+
+@router.get("/watchlist")
+async def get_watchlist():
+    """
+    List watched tickers with their refresh schedule and latest result.
+    """
+    entries = get_scheduler().status()
+    return {"tickers": entries, "total": len(entries)}
+
+@router.post("/watchlist")
+async def watch_ticker(request: WatchRequest):
+    """
+    Keep a ticker current in its live collection with scheduled incremental refreshes.
+    """
+    if request.interval_seconds is not None and request.interval_seconds <= 0:
+        raise HTTPException(status_code=400, detail="interval_seconds must be positive")
+    
+    scheduler = get_scheduler()
+    ticker = scheduler.watchlist.add(WatchedTicker(
+        request.stock_symbol, request.search_query, request.interval_seconds
+    ))
+    # The first refresh runs right away
+    scheduler.trigger(ticker.symbol)
     return {
-        "collections": list(pipeline_status.keys()),
-        "total": len(pipeline_status)
+        "status": "watching",
+        "stock_symbol": ticker.symbol,
+        "collection_name": ticker.collection_name,
+        "interval_seconds": ticker.interval,
+        "timestamp": datetime.now().isoformat()
     }
 
+@router.delete("/watchlist/{stock_symbol}")
+async def unwatch_ticker(stock_symbol: str):
+    """
+    Stop refreshing a ticker. Its live collection is kept.
+    """
+    if not get_scheduler().watchlist.remove(stock_symbol):
+        raise HTTPException(status_code=404, detail=f"{stock_symbol.upper()} is not watched")
+    return {"status": "removed", "stock_symbol": stock_symbol.upper()}
+
+@router.post("/watchlist/{stock_symbol}/refresh")
+async def refresh_ticker(stock_symbol: str):
+    """
+    Refresh a watched ticker now instead of waiting for its interval.
+    """
+    if not get_scheduler().trigger(stock_symbol):
+        raise HTTPException(
+            status_code=409,
+            detail=f"{stock_symbol.upper()} is not watched or is already refreshing"
+        )
+    return {"status": "started", "stock_symbol": stock_symbol.upper()}
+
+@router.post("/restore")
+async def restore_saved_collections(request: RestoreRequest, background_tasks: BackgroundTasks):
+    """
+    Rebuild collections from the saved datasets and embeddings without re-embedding.
+    """
+    if restore_status["status"] == "running":
+        raise HTTPException(status_code=409, detail="A restore is already running")
+    
+    restore_status.update({
+        "status": "running",
+        "datasets": request.datasets,
+        "results": [],
+        "timestamp": datetime.now().isoformat()
+    })
+    background_tasks.add_task(run_restore, request.datasets, bool(request.recreate))
+    
+    return PipelineResponse(
+        status="started",
+        message="Restore of saved collections started",
+        timestamp=datetime.now().isoformat()
+    )
+
+@router.get("/restore-status")
+async def get_restore_status():
+    """
+    Get the status and per-dataset results of the latest restore.
+    """
+    return restore_status
+
 def find_latest_collection(stock_symbol: str) -> Optional[str]:
     """
     Find the most recent collection for a given stock symbol.
     """
+    # Registered collections survive restarts and restores, pipeline status does not
     stock_collections = [
-        name for name in pipeline_status.keys() 
+        name for name in set(pipeline_status) | set(list_collection_info())
         if name.startswith(stock_symbol.lower())
     ]
     
@@ -140,32 +420,66 @@ def find_latest_collection(stock_symbol: str) -> Optional[str]:
     # Return the most recent one (assuming timestamp format)
     return sorted(stock_collections)[-1]
 
-async def run_data_pipeline(stock_symbol: str, search_query: str, limit: int, collection_name: str):
+def set_pipeline_status(collection_name: str, status: str, message: str, done: bool = False):
+    """
+    Update the status of a pipeline and push it to progress subscribers.
+    """
+    pipeline_status[collection_name].update({
+        "status": status,
+        "message": message,
+        "timestamp": datetime.now().isoformat()
+    })
+    publish_status(collection_name, status, message, done)
+
+def run_data_pipeline(
+    stock_symbol: str, 
+    search_query: str, 
+    limit: int, 
+    collection_name: str, 
+    profile: Optional[str] = None,
+    include_comments: Optional[bool] = None
+):
     """
     Run the complete data pipeline in the background.
+    Runs in the threadpool so the event loop keeps serving progress streams.
     """
     try:
-        # Step 1: Update status
-        pipeline_status[collection_name]["status"] = "collecting_data"
-        pipeline_status[collection_name]["message"] = f"Collecting Reddit data for {stock_symbol}"
-        
-        # Step 2: Collect Reddit data
-        collect_reddit_data(search_query, collection_name, limit)
-        
-        # Step 3: Update status
-        pipeline_status[collection_name]["status"] = "processing_embeddings"
-        pipeline_status[collection_name]["message"] = f"Processing embeddings for {stock_symbol}"
-        
-        # Step 4: Process and store embeddings
-        process_and_store_embeddings(collection_name)
+        with bind_pipeline(collection_name):
+            # Step 1: Update status
+            set_pipeline_status(collection_name, "collecting_data", f"Collecting Reddit data for {stock_symbol}")
+            
+            # Step 2: Collect Reddit data
+            with span("pipeline_collect"):
+                collect_reddit_data(search_query, collection_name, limit, include_comments)
+            
+            # Step 3: Update status
+            set_pipeline_status(collection_name, "processing_embeddings", f"Processing embeddings for {stock_symbol}")
+            
+            # Step 4: Process and store embeddings
+            with span("pipeline_embed"):
+                process_and_store_embeddings(collection_name, profile=profile)
         
         # Step 5: Update status to completed
-        pipeline_status[collection_name]["status"] = "completed"
-        pipeline_status[collection_name]["message"] = f"Pipeline completed for {stock_symbol}"
-        pipeline_status[collection_name]["timestamp"] = datetime.now().isoformat()
+        set_pipeline_status(collection_name, "completed", f"Pipeline completed for {stock_symbol}", done=True)
+        
+        # Step 6: Answer the canonical questions at low priority
+        schedule_warmup(collection_name, stock_symbol)
         
     except Exception as e:
         # Update status to failed
-        pipeline_status[collection_name]["status"] = "failed"
-        pipeline_status[collection_name]["message"] = f"Pipeline failed: {str(e)}"
-        pipeline_status[collection_name]["timestamp"] = datetime.now().isoformat()
+        set_pipeline_status(collection_name, "failed", f"Pipeline failed: {str(e)}", done=True)
+
+def run_restore(datasets: Optional[List[str]], recreate: bool):
+    """
+    Run a bulk restore in the background.
+    """
+    try:
+        with span("pipeline_restore"):
+            results = restore_collections(datasets, recreate)
+        failed = [r for r in results if r["status"] == "failed"]
+        restore_status["status"] = "failed" if failed else "completed"
+        restore_status["results"] = results
+    except Exception as e:
+        restore_status["status"] = "failed"
+        restore_status["message"] = f"Restore failed: {str(e)}"
+    restore_status["timestamp"] = datetime.now().isoformat()
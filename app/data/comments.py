@@ -0,0 +1,203 @@
+"""
+Comment-tree ingestion for collected submissions.
+
+Comment trees are expanded on a bounded worker pool, one submission per task,
+with limits on depth, comments per submission and ``replace_more`` calls (one
+API request each). All Reddit requests go through the shared rate limiter of
+:mod:`app.data.reddit_client`. Comments of a submission are appended to the
+dataset's comment CSV as soon as its tree is done, so memory stays bounded by
+the number of in-flight submissions.
+"""
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.monitoring.metrics import span
+from app.monitoring.progress import stage_progress
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
+COMMENTS_FOLDER = ROOT_FOLDER / "data" / "processed" / "comments"
+
+COMMENT_COLUMNS = ["id", "post_id", "parent_id", "depth", "body", "score", "created_utc"]
+
+
+class CommentConfig:
+    """Configuration for comment ingestion."""
+
+    # Collect comments together with the submissions
+    ENABLED = os.getenv("INGEST_COMMENTS", "false").lower() in ("1", "true", "yes")
+
+    # Submissions expanded concurrently
+    MAX_WORKERS = int(os.getenv("COMMENT_WORKERS", "4"))
+
+    # Top-level comments have depth 0; deeper replies are skipped
+    MAX_DEPTH = int(os.getenv("COMMENT_MAX_DEPTH", "3"))
+
+    # "load more comments" expansions per submission, one API request each
+    REPLACE_MORE_LIMIT = int(os.getenv("COMMENT_REPLACE_MORE_LIMIT", "4"))
+
+    MAX_PER_POST = int(os.getenv("COMMENT_MAX_PER_POST", "200"))
+
+    # Comments shorter than this (after stripping) carry no signal ("this", "+1")
+    MIN_LENGTH = int(os.getenv("COMMENT_MIN_LENGTH", "20"))
+
+
+class ThreadLocalReddit:
+    """Comment source with one PRAW client per worker thread, sharing one rate limiter."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def submission(self, id: str):
+        if not hasattr(self._local, "reddit"):
+            from app.data.reddit_client import create_reddit
+            self._local.reddit = create_reddit()
+        return self._local.reddit.submission(id=id)
+
+
+class CommentCollector:
+    """Expands comment trees of submissions concurrently and streams them to CSV."""
+
+    def __init__(
+        self,
+        source: Optional[Any] = None,
+        max_workers: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        replace_more_limit: Optional[int] = None,
+        max_per_post: Optional[int] = None
+    ):
+        """
+        Args:
+            source: Object with ``submission(id)`` returning PRAW-like submissions;
+                thread-local PRAW clients if None
+            max_workers: Submissions expanded concurrently
+            max_depth: Maximum reply depth, 0 keeps only top-level comments
+            replace_more_limit: ``replace_more`` expansions per submission
+            max_per_post: Maximum comments kept per submission
+        """
+        self.source = source or ThreadLocalReddit()
+        self.max_workers = max_workers or CommentConfig.MAX_WORKERS
+        self.max_depth = CommentConfig.MAX_DEPTH if max_depth is None else max_depth
+        self.replace_more_limit = (
+            CommentConfig.REPLACE_MORE_LIMIT if replace_more_limit is None else replace_more_limit
+        )
+        self.max_per_post = max_per_post or CommentConfig.MAX_PER_POST
+
+    def fetch_comments(self, post_id: str) -> List[Dict[str, Any]]:
+        """
+        Expand the comment tree of one submission.
+
+        Args:
+            post_id: Reddit ID of the submission
+
+        Returns:
+            Comment rows in depth-first order
+        """
+        submission = self.source.submission(id=post_id)
+        submission.comment_sort = "top"
+        submission.comment_limit = self.max_per_post
+        forest = submission.comments
+        forest.replace_more(limit=self.replace_more_limit)
+
+        rows = []
+        stack = [(comment, 0) for comment in reversed(list(forest))]
+        while stack and len(rows) < self.max_per_post:
+            comment, depth = stack.pop()
+            body = getattr(comment, "body", None)
+            # MoreComments left over after the replace_more budget have no body
+            if body is None:
+                continue
+            if len(body.strip()) >= CommentConfig.MIN_LENGTH and body not in ("[deleted]", "[removed]"):
+                rows.append({
+                    "id": comment.id,
+                    "post_id": post_id,
+                    "parent_id": comment.parent_id,
+                    "depth": depth,
+                    "body": body,
+                    "score": comment.score,
+                    "created_utc": comment.created_utc,
+                })
+            if depth < self.max_depth:
+                stack.extend((reply, depth + 1) for reply in reversed(list(comment.replies)))
+        return rows
+
+    def collect(self, post_ids: List[str], dataset_name: str) -> int:
+        """
+        Collect the comments of submissions into the dataset's comment CSV.
+
+        At most ``2 * max_workers`` submissions are in flight; finished trees are
+        written immediately. A failing submission is skipped.
+
+        Args:
+            post_ids: Reddit IDs of the submissions
+            dataset_name: Name of the dataset
+
+        Returns:
+            Number of comments written
+        """
+        os.makedirs(COMMENTS_FOLDER, exist_ok=True)
+        csv_path = COMMENTS_FOLDER / f"{dataset_name}.csv"
+        if csv_path.exists():
+            os.remove(csv_path)
+
+        written = 0
+        pending = list(reversed(post_ids))
+        in_flight: Dict[Future, str] = {}
+        with span("reddit_comments"), stage_progress("comments", len(post_ids)) as progress, \
+                ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="comments") as executor:
+            while pending or in_flight:
+                while pending and len(in_flight) < 2 * self.max_workers:
+                    post_id = pending.pop()
+                    in_flight[executor.submit(self.fetch_comments, post_id)] = post_id
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    post_id = in_flight.pop(future)
+                    progress.advance()
+                    try:
+                        rows = future.result()
+                    except Exception as e:
+                        print(f"⚠️ Kommentare von {post_id} übersprungen: {str(e)}")
+                        continue
+                    if rows:
+                        pd.DataFrame(rows, columns=COMMENT_COLUMNS).to_csv(
+                            csv_path, mode="a", header=not csv_path.exists(), index=False
+                        )
+                        written += len(rows)
+
+        print(f"💬 {written} Kommentare zu {len(post_ids)} Posts gespeichert unter {csv_path}")
+        return written
+
+
+def load_comments(dataset_name: str) -> Optional[pd.DataFrame]:
+    """
+    Load the collected comments of a dataset.
+
+    Args:
+        dataset_name: Name of the dataset
+
+    Returns:
+        Comments dataframe, or None if no comments were collected
+    """
+    csv_path = COMMENTS_FOLDER / f"{dataset_name}.csv"
+    if not csv_path.exists():
+        return None
+    return pd.read_csv(csv_path, dtype={"id": str, "post_id": str, "parent_id": str})
+
+
+def collect_comments(post_ids: List[str], dataset_name: str) -> int:
+    """
+    Convenience function to collect comments with a default collector.
+
+    Args:
+        post_ids: Reddit IDs of the submissions
+        dataset_name: Name of the dataset
+
+    Returns:
+        Number of comments written
+    """
+    return CommentCollector().collect(post_ids, dataset_name)
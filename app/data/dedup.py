@@ -0,0 +1,262 @@
+"""
+Near-duplicate detection for Reddit posts with MinHash and LSH banding.
+
+Cross-posts, reposts and copy-pasted DD threads are collapsed into one
+canonical post (the highest-scored one) before embedding, so they are encoded
+and stored once and do not fill several retrieval slots with the same text.
+Texts shorter than one shingle (e.g. link or image posts without a body) carry
+too little text to compare and are always kept as their own posts.
+"""
+
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Prime just above 2**32 so (a * x + b) stays below 2**64 for 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+_URL_PATTERN = re.compile(r"https?://\S+")
+_WORD_PATTERN = re.compile(r"[a-z0-9$]+")
+
+
+class DedupConfig:
+    """Configuration for near-duplicate detection."""
+
+    NUM_PERM = 128
+    SHINGLE_SIZE = 3
+    DEFAULT_THRESHOLD = 0.8
+    SEED = 42
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_PATTERN.findall(_URL_PATTERN.sub(" ", text.lower()))
+
+
+def _shingle_hashes(text: str, size: int) -> np.ndarray:
+    words = _words(text)
+    if len(words) < size:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Pick the (bands, rows) split whose S-curve midpoint (1/b)^(1/r) is the highest
+    one not above the threshold. Candidates are verified against the threshold
+    afterwards, so erring towards false positives only costs a comparison.
+    """
+    best = (num_perm, 1)
+    best_midpoint = 0.0
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1.0 / bands) ** (1.0 / rows)
+        if best_midpoint < midpoint <= threshold:
+            best, best_midpoint = (bands, rows), midpoint
+    return best
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash LSH index over post texts."""
+
+    def __init__(
+        self,
+        threshold: float = DedupConfig.DEFAULT_THRESHOLD,
+        num_perm: int = DedupConfig.NUM_PERM
+    ):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = _optimal_bands(threshold, num_perm)
+
+        rng = np.random.default_rng(DedupConfig.SEED)
+        self._a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**31, size=num_perm, dtype=np.uint64)
+
+        self.ids: List[str] = []
+        self._signatures: List[np.ndarray] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Text to hash
+
+        Returns:
+            Array of ``num_perm`` minimum hash values
+        """
+        hashes = _shingle_hashes(text, DedupConfig.SHINGLE_SIZE)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def query(self, text: str) -> Optional[str]:
+        """
+        Find an indexed post that is a near-duplicate of ``text``.
+
+        Args:
+            text: Text to look up
+
+        Returns:
+            ID of the most similar indexed post above the threshold, or None
+        """
+        if len(_words(text)) < DedupConfig.SHINGLE_SIZE:
+            return None
+        match, _ = self._query_signature(self.signature(text))
+        return match
+
+    def _query_signature(self, signature: np.ndarray) -> Tuple[Optional[str], List[bytes]]:
+        keys = self._band_keys(signature)
+        candidates = set()
+        for band, key in enumerate(keys):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return None, keys
+
+        candidates = np.fromiter(candidates, dtype=np.int64)
+        stacked = np.stack([self._signatures[i] for i in candidates])
+        similarity = (stacked == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        if similarity[best] >= self.threshold:
+            return self.ids[candidates[best]], keys
+        return None, keys
+
+    def add(self, post_id: str, text: str) -> Optional[str]:
+        """
+        Add a post unless it is a near-duplicate of an indexed post.
+
+        Args:
+            post_id: ID of the post
+            text: Text of the post
+
+        Returns:
+            ID of the canonical post it duplicates, or None if it was added
+            or is too short to compare
+        """
+        # All empty texts would share one signature and collapse into one post
+        if len(_words(text)) < DedupConfig.SHINGLE_SIZE:
+            return None
+        signature = self.signature(text)
+        match, keys = self._query_signature(signature)
+        if match is not None:
+            return match
+
+        position = len(self.ids)
+        self.ids.append(str(post_id))
+        self._signatures.append(signature)
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(position)
+        return None
+
+    def deduplicate(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, List[int]]]:
+        """
+        Collapse near-duplicate posts of a dataframe into canonical posts.
+
+        The highest-scored post of each cluster is kept. It gets a ``duplicate_count``,
+        the summed ``aggregate_score`` and the ``duplicate_ids`` of its cluster.
+
+        Args:
+            df: Posts with "id", "title", "selftext" and "score" columns
+
+        Returns:
+            Tuple of (canonical posts in original order, mapping of already indexed
+            post IDs to the row positions of new posts that duplicate them)
+        """
+        df = df.reset_index(drop=True)
+        if "id" not in df.columns:
+            df["id"] = df.index.astype(str)
+        texts = (df["title"].fillna("") + " " + df["selftext"].fillna("")).tolist()
+        scores = df.get("score", pd.Series(0, index=df.index)).fillna(0).astype(int)
+        ids = df["id"].astype(str).tolist()
+
+        existing = set(self.ids)
+        clusters: Dict[str, List[int]] = {}
+        external: Dict[str, List[int]] = {}
+        for i in scores.sort_values(ascending=False, kind="stable").index:
+            canonical = self.add(ids[i], texts[i])
+            if canonical is None:
+                clusters[ids[i]] = [i]
+            elif canonical in clusters:
+                clusters[canonical].append(i)
+            elif canonical in existing:
+                external.setdefault(canonical, []).append(i)
+
+        keep = sorted(members[0] for members in clusters.values())
+        result = df.loc[keep].copy()
+        by_row = {members[0]: members for members in clusters.values()}
+        result["duplicate_count"] = [len(by_row[i]) - 1 for i in keep]
+        result["aggregate_score"] = [int(scores.loc[by_row[i]].sum()) for i in keep]
+        result["duplicate_ids"] = [";".join(ids[j] for j in by_row[i][1:]) for i in keep]
+        return result.reset_index(drop=True), external
+
+    def save(self, path: Path) -> None:
+        """
+        Persist the index so new posts can be added incrementally later.
+
+        Args:
+            path: Target .npz path
+        """
+        if self._signatures:
+            signatures = np.stack(self._signatures)
+        else:
+            signatures = np.zeros((0, self.num_perm), dtype=np.uint64)
+        np.savez(
+            str(path),
+            ids=np.array(self.ids, dtype=str),
+            signatures=signatures,
+            threshold=np.array(self.threshold),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "NearDuplicateIndex":
+        """
+        Load an index saved with :meth:`save`.
+
+        Args:
+            path: Path of the .npz file
+
+        Returns:
+            Restored index
+        """
+        data = np.load(str(path))
+        signatures = data["signatures"]
+        index = cls(threshold=float(data["threshold"]), num_perm=signatures.shape[1])
+        for post_id, signature in zip(data["ids"].tolist(), signatures):
+            position = len(index.ids)
+            index.ids.append(post_id)
+            index._signatures.append(signature)
+            for band, key in enumerate(index._band_keys(signature)):
+                index._buckets[band].setdefault(key, []).append(position)
+        return index
+
+
+def deduplicate_posts(df: pd.DataFrame, threshold: float = DedupConfig.DEFAULT_THRESHOLD) -> pd.DataFrame:
+    """
+    Collapse near-duplicate posts using a fresh index.
+
+    Args:
+        df: Posts dataframe
+        threshold: Estimated Jaccard similarity above which posts are duplicates
+
+    Returns:
+        Canonical posts with duplicate_count, aggregate_score and duplicate_ids
+    """
+    result, _ = NearDuplicateIndex(threshold).deduplicate(df)
+    return result
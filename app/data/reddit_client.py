@@ -6,7 +6,13 @@ from pathlib import Path
 import pandas as pd
 from dotenv import load_dotenv  # load vars from .env into env vars
 import praw  # Python Reddit API Wrapper
-from typing import List, Dict
+from prawcore import Requestor
+from typing import List, Dict, Optional
+
+from app.data.comments import CommentConfig, collect_comments
+from app.monitoring.metrics import span
+from app.monitoring.progress import stage_progress
+from app.utils.rate_limit import TokenBucket
 
 load_dotenv()
 
@@ -15,18 +21,55 @@ REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
 
+# Reddit erlaubt ~100 Requests pro Minute und OAuth-Client
+REDDIT_REQUESTS_PER_MINUTE = float(os.getenv("REDDIT_REQUESTS_PER_MINUTE", "100"))
+
 print(f"client_id={REDDIT_CLIENT_ID}, secret={'✓' if REDDIT_CLIENT_SECRET else '❌'}, agent={REDDIT_USER_AGENT}")
 
+# Gemeinsamer Rate-Limiter für alle Reddit-Requests des Prozesses (Suche und Kommentare)
+reddit_rate_limiter = TokenBucket(REDDIT_REQUESTS_PER_MINUTE / 60.0, capacity=10)
+
+
+class RateLimitedRequestor(Requestor):
+    """prawcore-Requestor, der vor jedem HTTP-Request ein Token des Rate-Limiters nimmt."""
+
+    def request(self, *args, **kwargs):
+        reddit_rate_limiter.acquire()
+        return super().request(*args, **kwargs)
+
+
+def create_reddit() -> praw.Reddit:
+    """
+    Erzeugt einen PRAW-Client mit dem gemeinsamen Rate-Limiter.
+
+    PRAW ist nicht thread-safe; parallele Worker nutzen je einen eigenen Client.
+    """
+    return praw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        user_agent=REDDIT_USER_AGENT,
+        requestor_class=RateLimitedRequestor
+    )
+
+
 # Reddit API-Client mit PRAW
-reddit = praw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_CLIENT_SECRET,
-    user_agent=REDDIT_USER_AGENT
-)
+reddit = create_reddit()
 
 print("Verbindung erfolgreich. Reddit user:", reddit.user.me())
 
 
+def _post_from_submission(submission) -> Dict:
+    return {
+        "id": submission.id,
+        "title": submission.title,
+        "score": submission.score,
+        "url": submission.url,
+        "created_utc": submission.created_utc,
+        "num_comments": submission.num_comments,
+        "selftext": submission.selftext
+    }
+
+
 def search_stock_posts(keyword: str, limit: int = 20) -> List[Dict]:
     """
     Sucht nach Reddit-Posts zu einem bestimmten Aktien-Stichwort.
@@ -34,28 +77,93 @@ def search_stock_posts(keyword: str, limit: int = 20) -> List[Dict]:
     posts = []
     subreddit = reddit.subreddit("stocks+investing+wallstreetbets")
 
-    for submission in subreddit.search(keyword, sort="new", limit=limit):
-        post_data = {
-            "title": submission.title,
-            "score": submission.score,
-            "url": submission.url,
-            "created_utc": submission.created_utc,
-            "num_comments": submission.num_comments,
-            "selftext": submission.selftext
-        }
-        posts.append(post_data)
+    with stage_progress("collect", limit) as progress:
+        for submission in subreddit.search(keyword, sort="new", limit=limit):
+            posts.append(_post_from_submission(submission))
+            progress.advance()
 
     return posts
 
 
+def search_new_posts(
+    keyword: str,
+    since_utc: float,
+    limit: int = 100,
+    after: Optional[str] = None
+) -> Dict:
+    """
+    Sucht nur Posts, die neuer als ``since_utc`` sind.
+
+    Die Suche ist nach Erstellungszeit absteigend sortiert und bricht beim ersten
+    bereits bekannten Post ab, der Aufwand wächst also mit der neuen Aktivität.
+    Greift ``limit`` vorher, ist die Lücke bis ``since_utc`` nicht vollständig
+    geholt; der nächste Aufruf setzt mit ``after`` beim ältesten geholten Post fort.
+
+    Returns:
+        Dict mit ``posts``, ``complete`` (``since_utc`` oder das Ende der Suche
+        erreicht) und ``after`` (Fullname des ältesten geholten Posts)
+    """
+    posts = []
+    oldest = None
+    complete = False
+    subreddit = reddit.subreddit("stocks+investing+wallstreetbets")
+    params = {"after": after} if after else None
+
+    with stage_progress("collect", limit) as progress:
+        for submission in subreddit.search(keyword, sort="new", limit=limit, params=params):
+            if submission.created_utc <= since_utc:
+                complete = True
+                break
+            posts.append(_post_from_submission(submission))
+            oldest = submission.fullname
+            progress.advance()
+
+    # Weniger Treffer als angefragt: die Suche ist erschöpft
+    if len(posts) < limit:
+        complete = True
+    return {"posts": posts, "complete": complete, "after": oldest or after}
+
+
+def fetch_post_stats(post_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Lädt aktuelle Scores und Kommentarzahlen bekannter Posts (100 pro Request).
+    """
+    stats = {}
+    fullnames = [f"t3_{post_id}" for post_id in post_ids]
+    for submission in reddit.info(fullnames=fullnames):
+        stats[submission.id] = {
+            "score": submission.score,
+            "num_comments": submission.num_comments
+        }
+    return stats
+
+
 ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
 CSV_FOLDER = ROOT_FOLDER / "data" / "processed" / "csv"
 os.makedirs(CSV_FOLDER, exist_ok=True)
 
+# Deduplizierte und bewertete Posts; die Roh-CSV bleibt so, wie sie gesammelt wurde
+POSTS_FOLDER = ROOT_FOLDER / "data" / "processed" / "posts"
+os.makedirs(POSTS_FOLDER, exist_ok=True)
+
+
+def processed_posts_path(dataset_name: str) -> Path:
+    """
+    Pfad der verarbeiteten Posts eines Datasets.
 
-def collect(search_query: str, dataset_name: str, limit: int = 50):
+    Datasets aus älteren Versionen ohne eigene Datei fallen auf die Roh-CSV zurück.
+    """
+    path = POSTS_FOLDER / f"{dataset_name}.csv"
+    raw_path = CSV_FOLDER / f"{dataset_name}.csv"
+    if not path.exists() and raw_path.exists():
+        return raw_path
+    return path
+
+
+def collect(search_query: str, dataset_name: str, limit: int = 50, comments: Optional[bool] = None):
     print(f"🔍 Suche Reddit-Posts zu: '{search_query}'")
-    posts = search_stock_posts(search_query, limit=limit)
+    with span("reddit_fetch"):
+        posts = search_stock_posts(search_query, limit=limit)
 
     if not posts:
         raise ValueError("❌ Keine Posts gefunden – überprüfe deine Query oder Reddit-API!")
@@ -64,5 +172,12 @@ def collect(search_query: str, dataset_name: str, limit: int = 50):
 
     # Speichern als CSV
     df = pd.DataFrame(posts)
-    df.to_csv(csv_path, index=False)
+    with span("csv_write"):
+        df.to_csv(csv_path, index=False)
     print(f"✅ Reddit-Daten gespeichert unter {csv_path}")
+
+    # Optional: Kommentarbäume der gefundenen Posts laden
+    if comments is None:
+        comments = CommentConfig.ENABLED
+    if comments:
+        collect_comments(df["id"].tolist(), dataset_name)
@@ -0,0 +1,330 @@
+"""
+Inference backends for sentence-transformer encoders.
+
+The "torch" backend is the plain ``SentenceTransformer``. The "onnx" backend
+runs a dynamically int8-quantized ONNX export of the same model through ONNX
+Runtime, which is considerably faster on CPU-only nodes. An export is only used
+if its parity check against the PyTorch embeddings passed.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
+ONNX_FOLDER = ROOT_FOLDER / "data" / "models" / "onnx"
+
+# Default sentence-transformers model for ingestion and queries; kept here so
+# importing it does not load the ingestion pipeline
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+PARITY_SAMPLE_TEXTS = [
+    "TSLA earnings beat expectations, calls are printing 🚀",
+    "I think Apple is overvalued at these levels and will drop after the keynote.",
+    "What is the sentiment around Nvidia after the latest guidance?",
+    "Bought more shares today. Long term hold, not selling.",
+    "The CEO dumped shares right before the announcement, this looks like fraud.",
+    "Margins improved, deliveries were a record and the balance sheet is strong.",
+    "Is anyone else worried about the upcoming recession and its effect on tech stocks?",
+    "Neutral post: the stock traded sideways all week on low volume.",
+]
+
+
+class BackendConfig:
+    """Configuration for the encoder inference backend."""
+
+    # "torch" or "onnx"
+    BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+    # Intra-op threads for ONNX Runtime, defaults to the number of CPU cores
+    ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0")) or (os.cpu_count() or 1)
+
+    # Minimum cosine similarity between ONNX and PyTorch embeddings
+    MIN_PARITY = 0.99
+
+
+def export_folder(model_name: str) -> Path:
+    """Folder holding the ONNX export, tokenizer and encoder config of a model."""
+    return ONNX_FOLDER / model_name.replace("/", "__")
+
+
+class OnnxEncoder:
+    """Quantized ONNX Runtime encoder with the ``SentenceTransformer.encode`` interface."""
+
+    def __init__(self, folder: Path, intra_op_threads: Optional[int] = None):
+        from transformers import AutoTokenizer
+
+        with open(folder / "encoder.json") as f:
+            self.config = json.load(f)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(folder))
+        self.max_seq_length = self.config["max_seq_length"]
+        self.folder = folder
+        self.intra_op_threads = intra_op_threads or BackendConfig.ONNX_INTRA_OP_THREADS
+        self.start_session()
+
+    def start_session(self) -> None:
+        """Create the ONNX Runtime session; needed again in a forked child, as sessions are not fork-safe."""
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(self.folder / self.config["model_file"]),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dim"]
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        """
+        Encode texts like ``SentenceTransformer.encode``.
+
+        Args:
+            sentences: Text or list of texts
+            batch_size: Number of texts per inference call
+
+        Returns:
+            Embeddings as float32 array, 1-D for a single text
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.config["dim"]), dtype=np.float32)
+
+        # Length-sorted batches keep padding small
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        embeddings = np.empty((len(texts), self.config["dim"]), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            batch = order[start:start + batch_size]
+            embeddings[batch] = self._encode_batch([texts[i] for i in batch])
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        feeds = {
+            name: encoded[name].astype(np.int64)
+            for name in ("input_ids", "attention_mask", "token_type_ids")
+            if name in self._input_names and name in encoded
+        }
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        if self.config["pooling"] == "cls":
+            pooled = token_embeddings[:, 0]
+        else:
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.config["normalize"]:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+
+def export_onnx(model_name: str, sample_texts: Optional[List[str]] = None) -> Dict:
+    """
+    Export a sentence-transformer to ONNX, quantize it to int8 and check parity.
+
+    Args:
+        model_name: Name of the sentence-transformers model
+        sample_texts: Texts for the parity check, built-in samples if None
+
+    Returns:
+        Encoder config including the measured parity (min/mean cosine similarity)
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    folder = export_folder(model_name)
+    os.makedirs(folder, exist_ok=True)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    module_names = [type(module).__name__ for module in model]
+    pooling = "mean"
+    if "Pooling" in module_names:
+        pooling_module = model[module_names.index("Pooling")]
+        if getattr(pooling_module, "pooling_mode_cls_token", False):
+            pooling = "cls"
+
+    dummy = model.tokenizer(["export"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = folder / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    quantize_dynamic(str(fp32_path), str(folder / "model.int8.onnx"), weight_type=QuantType.QInt8)
+    model.tokenizer.save_pretrained(str(folder))
+
+    config = {
+        "model_name": model_name,
+        "model_file": "model.int8.onnx",
+        "dim": model.get_sentence_embedding_dimension(),
+        "max_seq_length": model.max_seq_length,
+        "pooling": pooling,
+        "normalize": "Normalize" in module_names,
+    }
+    with open(folder / "encoder.json", "w") as f:
+        json.dump(config, f, indent=2)
+
+    config["parity"] = parity_check(model, OnnxEncoder(folder), sample_texts)
+    with open(folder / "encoder.json", "w") as f:
+        json.dump(config, f, indent=2)
+    return config
+
+
+def parity_check(reference, candidate, texts: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Compare embeddings of two encoders by cosine similarity.
+
+    Args:
+        reference: Reference encoder (PyTorch)
+        candidate: Encoder to check (ONNX)
+        texts: Texts to compare on, built-in samples if None
+
+    Returns:
+        Dictionary with min and mean cosine similarity
+    """
+    texts = texts or PARITY_SAMPLE_TEXTS
+    a = np.asarray(reference.encode(texts), dtype=np.float32)
+    b = np.asarray(candidate.encode(texts), dtype=np.float32)
+    cosine = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    return {"min_cosine": float(cosine.min()), "mean_cosine": float(cosine.mean())}
+
+
+def benchmark(encoder, texts: List[str], repeats: int = 3, batch_size: int = 32) -> Dict[str, float]:
+    """
+    Measure encode throughput of an encoder.
+
+    Args:
+        encoder: Encoder with an ``encode`` method
+        texts: Texts to encode per repeat
+        repeats: Number of timed repeats after one warm-up run
+        batch_size: Batch size passed to ``encode``
+
+    Returns:
+        Dictionary with best seconds per repeat and texts per second
+    """
+    encoder.encode(texts[:batch_size], batch_size=batch_size)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encoder.encode(texts, batch_size=batch_size)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"seconds": best, "texts_per_second": len(texts) / best if best else 0.0}
+
+
+# Loaded encoders by (model name, backend); shared by ingestion and queries
+_encoders: Dict[Tuple[str, str], object] = {}
+_encoders_lock = threading.Lock()
+
+
+def load_encoder(model_name: str, backend: Optional[str] = None):
+    """
+    Get the encoder for a model with the configured backend, loading it once per process.
+
+    The ONNX backend is used only if an export exists and passed the parity
+    check; otherwise the PyTorch model is loaded.
+
+    Args:
+        model_name: Name of the sentence-transformers model
+        backend: "torch" or "onnx", defaults to EMBEDDING_BACKEND
+
+    Returns:
+        Encoder with ``encode``, ``tokenizer`` and ``max_seq_length``
+    """
+    backend = backend or BackendConfig.BACKEND
+    key = (model_name, backend)
+    with _encoders_lock:
+        if key not in _encoders:
+            _encoders[key] = _load_encoder(model_name, backend)
+        return _encoders[key]
+
+
+def _load_encoder(model_name: str, backend: str):
+    if backend == "onnx":
+        folder = export_folder(model_name)
+        config_path = folder / "encoder.json"
+        if not config_path.exists():
+            print(f"⚠️ Kein ONNX-Export für {model_name} gefunden, nutze PyTorch "
+                  f"(scripts/export_onnx_encoder.py erzeugt ihn)")
+        else:
+            with open(config_path) as f:
+                parity = json.load(f).get("parity", {})
+            if parity.get("min_cosine", 0.0) < BackendConfig.MIN_PARITY:
+                print(f"⚠️ ONNX-Export für {model_name} hat den Parity-Check nicht bestanden "
+                      f"({parity}), nutze PyTorch")
+            else:
+                print(f"⚡ Nutze quantisiertes ONNX-Modell für {model_name}")
+                return OnnxEncoder(folder)
+    elif backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def warm_up_encoders(texts: Optional[List[str]] = None) -> float:
+    """
+    Run every loaded encoder once so lazy initialization is not paid by the first request.
+
+    Args:
+        texts: Texts to encode, built-in samples if None
+
+    Returns:
+        Seconds spent
+    """
+    start = time.perf_counter()
+    with _encoders_lock:
+        encoders = list(_encoders.values())
+    for encoder in encoders:
+        encoder.encode(texts or PARITY_SAMPLE_TEXTS)
+    return time.perf_counter() - start
+
+
+def after_fork() -> None:
+    """
+    Prepare encoders loaded by a parent process for use in a forked worker.
+
+    PyTorch weights stay shared copy-on-write; ONNX Runtime sessions get new
+    thread pools.
+    """
+    with _encoders_lock:
+        for encoder in _encoders.values():
+            if isinstance(encoder, OnnxEncoder):
+                encoder.start_session()
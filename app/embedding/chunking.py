@@ -0,0 +1,203 @@
+"""
+Sentence-aware chunking of long posts into token-bounded, overlapping passages.
+"""
+
+import re
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+# Sentence ends at ., ! or ? followed by whitespace, or at blank lines / list breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n\s*\n|\n(?=\s*[-*•\d])")
+
+TokenCounter = Callable[[List[str]], List[int]]
+
+
+def approximate_token_counts(texts: List[str]) -> List[int]:
+    """
+    Rough token count for when no tokenizer is available (~1.3 tokens per word).
+
+    Args:
+        texts: Texts to count
+
+    Returns:
+        Estimated token count per text
+    """
+    return [int(len(text.split()) * 1.3) + 1 for text in texts]
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split a text into sentences.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Non-empty, stripped sentences
+    """
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def _split_long_sentence(sentence: str, tokens: int, max_tokens: int) -> List[str]:
+    """Split a sentence that alone exceeds the budget into word windows."""
+    words = sentence.split()
+    words_per_piece = max(1, int(len(words) * max_tokens / max(tokens, 1)))
+    return [" ".join(words[i:i + words_per_piece]) for i in range(0, len(words), words_per_piece)]
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    count_tokens: Optional[TokenCounter] = None
+) -> List[str]:
+    """
+    Split a text into passages of at most ``max_tokens`` tokens on sentence boundaries.
+
+    Consecutive passages share trailing sentences worth up to ``overlap_tokens``.
+
+    Args:
+        text: Text to split
+        max_tokens: Token budget per passage
+        overlap_tokens: Token budget of the overlap between passages
+        count_tokens: Batched token counter, approximated from words if None
+
+    Returns:
+        List of passages, a single passage for short texts
+    """
+    count_tokens = count_tokens or approximate_token_counts
+    sentences = split_sentences(text)
+    if not sentences:
+        return [text.strip()] if text.strip() else []
+
+    counts = count_tokens(sentences)
+    if sum(counts) <= max_tokens:
+        return [" ".join(sentences)]
+
+    # Break up sentences that do not fit into a passage on their own
+    pieces, piece_counts = [], []
+    for sentence, tokens in zip(sentences, counts):
+        if tokens <= max_tokens:
+            pieces.append(sentence)
+            piece_counts.append(tokens)
+        else:
+            split = _split_long_sentence(sentence, tokens, max_tokens)
+            pieces.extend(split)
+            piece_counts.extend(count_tokens(split))
+
+    chunks = []
+    current, current_tokens = [], 0
+    for piece, tokens in zip(pieces, piece_counts):
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(p for p, _ in current))
+            # Carry the trailing sentences over as overlap
+            overlap, overlap_count = [], 0
+            for p, t in reversed(current):
+                if overlap_count + t > overlap_tokens or overlap_count + t + tokens > max_tokens:
+                    break
+                overlap.insert(0, (p, t))
+                overlap_count += t
+            current, current_tokens = overlap, overlap_count
+        current.append((piece, tokens))
+        current_tokens += tokens
+    if current:
+        chunks.append(" ".join(p for p, _ in current))
+    return chunks
+
+
+def build_chunks(
+    df: pd.DataFrame,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    count_tokens: Optional[TokenCounter] = None
+) -> pd.DataFrame:
+    """
+    Chunk the selftext of every post; each chunk is embedded together with the title.
+
+    Args:
+        df: Posts with "id", "title" and "selftext" columns
+        max_tokens: Token budget per embedded passage, including the title
+        overlap_tokens: Token budget of the overlap between passages
+        count_tokens: Batched token counter, approximated from words if None
+
+    Returns:
+        Dataframe with post_id, chunk_index, num_chunks, text, embed_text and num_tokens
+    """
+    count_tokens = count_tokens or approximate_token_counts
+    titles = df["title"].fillna("").astype(str).tolist()
+    bodies = df["selftext"].fillna("").astype(str).tolist()
+    post_ids = df["id"].astype(str).tolist() if "id" in df.columns else [str(i) for i in range(len(df))]
+    title_tokens = count_tokens(titles) if titles else []
+
+    rows = []
+    for post_id, title, body, t_tokens in zip(post_ids, titles, bodies, title_tokens):
+        # Keep room for the title that prefixes every passage
+        budget = max(max_tokens - t_tokens - 2, 32)
+        passages = chunk_text(body, budget, overlap_tokens, count_tokens) or [""]
+        for chunk_index, passage in enumerate(passages):
+            rows.append({
+                "post_id": post_id,
+                "chunk_index": chunk_index,
+                "num_chunks": len(passages),
+                "text": passage,
+                "embed_text": f"{title} {passage}".strip(),
+            })
+
+    chunks = pd.DataFrame(
+        rows, columns=["post_id", "chunk_index", "num_chunks", "text", "embed_text"]
+    )
+    chunks["num_tokens"] = count_tokens(chunks["embed_text"].tolist()) if len(chunks) else []
+    return chunks
+
+
+def build_comment_chunks(
+    comments: pd.DataFrame,
+    df: pd.DataFrame,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    count_tokens: Optional[TokenCounter] = None
+) -> pd.DataFrame:
+    """
+    Chunk comments as child documents of their posts, prefixed with the post title.
+
+    Args:
+        comments: Comments with "id", "post_id", "body", "score" and "created_utc"
+        df: Posts the comments belong to; comments of other posts are dropped
+        max_tokens: Token budget per embedded passage, including the title
+        overlap_tokens: Token budget of the overlap between passages
+        count_tokens: Batched token counter, approximated from words if None
+
+    Returns:
+        Dataframe like :func:`build_chunks` with the comment_id, comment_score
+        and comment_created_utc of every passage
+    """
+    count_tokens = count_tokens or approximate_token_counts
+    titles = dict(zip(df["id"].astype(str), df["title"].fillna("").astype(str)))
+    comments = comments[comments["post_id"].astype(str).isin(titles)]
+    bodies = comments["body"].fillna("").astype(str).tolist()
+    post_ids = comments["post_id"].astype(str).tolist()
+    title_tokens = dict(zip(titles, count_tokens(list(titles.values())))) if titles else {}
+
+    rows = []
+    for comment, post_id, body in zip(comments.itertuples(index=False), post_ids, bodies):
+        budget = max(max_tokens - title_tokens[post_id] - 2, 32)
+        passages = chunk_text(body, budget, overlap_tokens, count_tokens)
+        for chunk_index, passage in enumerate(passages):
+            rows.append({
+                "post_id": post_id,
+                "chunk_index": chunk_index,
+                "num_chunks": len(passages),
+                "text": passage,
+                "embed_text": f"{titles[post_id]} {passage}".strip(),
+                "comment_id": str(comment.id),
+                "comment_score": comment.score,
+                "comment_created_utc": comment.created_utc,
+            })
+
+    chunks = pd.DataFrame(rows, columns=[
+        "post_id", "chunk_index", "num_chunks", "text", "embed_text",
+        "comment_id", "comment_score", "comment_created_utc",
+    ])
+    chunks["num_tokens"] = count_tokens(chunks["embed_text"].tolist()) if len(chunks) else []
+    return chunks
@@ -3,15 +3,25 @@ Embedding generation and processing for Reddit posts.
 """
 
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
 import pandas as pd
 import numpy as np
 import os
-import mlflow
-from typing import Tuple, Dict, Any
+from datetime import datetime
+from typing import Tuple, Dict, Any, List, Optional
 
-from app.data.reddit_client import CSV_FOLDER
-from app.vector_store.client import upload_embeddings_with_payloads
+from app.data.comments import load_comments
+from app.data.dedup import NearDuplicateIndex
+from app.data.reddit_client import CSV_FOLDER, POSTS_FOLDER, processed_posts_path
+from app.embedding.backends import DEFAULT_EMBEDDING_MODEL, load_encoder
+from app.embedding.chunking import build_chunks, build_comment_chunks, approximate_token_counts
+from app.embedding.reduction import Projection, PROJECTIONS_FOLDER, parse_reduction_spec, recall_at_k
+from app.monitoring.metrics import span, POSTS_EMBEDDED
+from app.monitoring.progress import stage_progress
+from app.monitoring.tracking import file_sha256, start_run as start_tracking_run
+from app.sentiment.scorer import score_posts, score_texts
+from app.utils.file_utils import append_npy_rows
+from app.vector_store.client import append_embeddings, update_post_fields, upload_embeddings_with_payloads
+from app.vector_store.registry import get_collection_info, update_collection_info
 
 
 class EmbeddingConfig:
@@ -28,12 +38,14 @@ class EmbeddingConfig:
             "provider": "openai",
             "dim": 1536,
             "cost": "$0.00002 / 1k tokens",
+            "matryoshka": True,
             "description": "Schnelles, günstiges Embedding-Modell von OpenAI mit guter Qualität."
         },
         "text-embedding-3-large": {
             "provider": "openai",
             "dim": 3072,
             "cost": "$0.00013 / 1k tokens",
+            "matryoshka": True,
             "description": "Hochwertiges Embedding-Modell von OpenAI mit maximaler Genauigkeit für Such- und RAG-Anwendungen."
         },
         "multi-qa-MiniLM-L6-cos-v1": {
@@ -50,20 +62,98 @@ class EmbeddingConfig:
         }
     }
     
-    DEFAULT_MODEL = "all-MiniLM-L6-v2"
+    DEFAULT_MODEL = DEFAULT_EMBEDDING_MODEL
+
+    # Estimated Jaccard similarity above which posts are collapsed; 0 disables dedup
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+
+    # Long posts are split into passages of at most this many tokens (capped by the model)
+    CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "256"))
+    CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "32"))
+
+    # Upper bound for padded tokens per encode batch (batch size x longest passage)
+    ENCODE_BATCH_TOKENS = int(os.getenv("ENCODE_BATCH_TOKENS", "8192"))
+
+    # Optional reduction of stored vectors, e.g. "pca:128" or "truncate:256" (Matryoshka models)
+    REDUCTION = os.getenv("EMBEDDING_REDUCTION", "")
+
+    # PCA needs clearly more samples than target dimensions to be meaningful
+    MIN_SAMPLES_PER_PCA_DIM = 2
 
 
 class EmbeddingProcessor:
     """Processor for generating and managing embeddings."""
     
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, backend: str = None):
         self.model_name = model_name or EmbeddingConfig.DEFAULT_MODEL
-        self.model = SentenceTransformer(self.model_name)
+        self.model = load_encoder(self.model_name, backend)
         
         # Setup paths
         self.root_folder = Path(__file__).resolve().parent.parent.parent
         self.npy_folder = self.root_folder / "data" / "processed" / "npy"
+        self.dedup_folder = self.root_folder / "data" / "processed" / "dedup"
+        self.chunks_folder = self.root_folder / "data" / "processed" / "chunks"
+        self.projections_folder = PROJECTIONS_FOLDER
         os.makedirs(self.npy_folder, exist_ok=True)
+        os.makedirs(self.dedup_folder, exist_ok=True)
+        os.makedirs(self.chunks_folder, exist_ok=True)
+        os.makedirs(self.projections_folder, exist_ok=True)
+
+    @property
+    def max_tokens(self) -> int:
+        """Token budget per embedded passage."""
+        model_limit = getattr(self.model, "max_seq_length", None) or EmbeddingConfig.CHUNK_MAX_TOKENS
+        return min(EmbeddingConfig.CHUNK_MAX_TOKENS, model_limit)
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens with the model's tokenizer, without special tokens.
+        
+        Args:
+            texts: Texts to count
+            
+        Returns:
+            Token count per text
+        """
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is None:
+            return approximate_token_counts(texts)
+        encoded = tokenizer(texts, add_special_tokens=False, truncation=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    def encode_passages(self, texts: List[str], token_counts: List[int]) -> np.ndarray:
+        """
+        Encode passages in length-sorted batches bounded by ``ENCODE_BATCH_TOKENS``
+        padded tokens, so encode time grows with the number of tokens.
+        
+        Args:
+            texts: Passages to encode
+            token_counts: Token count per passage
+            
+        Returns:
+            Embeddings in the order of ``texts``
+        """
+        if not texts:
+            dim = self.model.get_sentence_embedding_dimension()
+            return np.zeros((0, dim), dtype=np.float32)
+
+        lengths = np.minimum(np.asarray(token_counts) + 2, self.max_tokens)
+        order = np.argsort(-lengths, kind="stable")
+        embeddings = [None] * len(texts)
+        start = 0
+        with stage_progress("encode", len(texts)) as progress:
+            while start < len(order):
+                # Sorted longest first, so the first passage sets the padded length
+                batch_size = max(1, EmbeddingConfig.ENCODE_BATCH_TOKENS // int(lengths[order[start]]))
+                batch = order[start:start + batch_size]
+                encoded = self.model.encode(
+                    [texts[i] for i in batch], batch_size=len(batch), show_progress_bar=False
+                )
+                for i, vector in zip(batch, encoded):
+                    embeddings[i] = vector
+                start += len(batch)
+                progress.advance(len(batch))
+        return np.vstack(embeddings)
     
     def generate_embeddings(self, dataset_name: str) -> Tuple[np.ndarray, pd.DataFrame]:
         """
@@ -73,7 +163,21 @@ class EmbeddingProcessor:
             dataset_name: Name of the dataset to process
             
         Returns:
-            Tuple of (embeddings, dataframe)
+            Tuple of (embeddings, dataframe), one embedding per chunk
+        """
+        embeddings, df, _ = self.generate_chunk_embeddings(dataset_name)
+        return embeddings, df
+
+    def generate_chunk_embeddings(self, dataset_name: str) -> Tuple[np.ndarray, pd.DataFrame, pd.DataFrame]:
+        """
+        Generate one embedding per post chunk for a dataset.
+        
+        Args:
+            dataset_name: Name of the dataset to process
+            
+        Returns:
+            Tuple of (embeddings, posts dataframe, chunks dataframe aligned with the embeddings);
+            comment passages follow the post passages in the chunk table
         """
         csv_path = CSV_FOLDER / f"{dataset_name}.csv"
         npy_path = self.npy_folder / f"{dataset_name}.npy"
@@ -82,74 +186,348 @@ class EmbeddingProcessor:
             raise FileNotFoundError(f"❌ CSV-Datei nicht gefunden: {csv_path}")
 
         print(f"📥 Lade CSV: {csv_path}")
-        df = pd.read_csv(csv_path)
+        with span("csv_read"):
+            df = pd.read_csv(csv_path)
+
+        # Collapse cross-posts and reposts before they are encoded and stored
+        if EmbeddingConfig.DEDUP_THRESHOLD > 0:
+            with span("dedup"):
+                index = NearDuplicateIndex(EmbeddingConfig.DEDUP_THRESHOLD)
+                num_posts = len(df)
+                df, _ = index.deduplicate(df)
+                index.save(self.dedup_folder / f"{dataset_name}.npz")
+            print(f"🧹 {num_posts - len(df)} Near-Duplicates zusammengefasst, {len(df)} Posts verbleiben")
+        else:
+            # A stale index would fold later appends into posts stored without counts
+            (self.dedup_folder / f"{dataset_name}.npz").unlink(missing_ok=True)
+
+        # Label every post with a local sentiment score; the raw CSV stays untouched,
+        # so reprocessing deduplicates the original rows again
+        with span("sentiment"):
+            score_posts(df)
+        with span("csv_write"):
+            df.to_csv(POSTS_FOLDER / f"{dataset_name}.csv", index=False)
+
+        # Split long posts into token-bounded passages prefixed with the title
+        with span("chunking"):
+            chunks = build_chunks(
+                df, self.max_tokens, EmbeddingConfig.CHUNK_OVERLAP_TOKENS, self.count_tokens
+            )
 
-        # Combine title and text for embedding
-        texts = (df["title"].fillna("") + " " + df["selftext"].fillna("")).tolist()
+        # Collected comments become child documents of the posts that survived dedup
+        comments = load_comments(dataset_name)
+        if comments is not None and len(comments):
+            with span("chunking"):
+                comment_chunks = build_comment_chunks(
+                    comments, df, self.max_tokens, EmbeddingConfig.CHUNK_OVERLAP_TOKENS, self.count_tokens
+                )
+            with span("sentiment"):
+                comment_chunks["comment_sentiment"] = score_texts(comment_chunks["text"].tolist())
+            chunks = pd.concat([chunks, comment_chunks], ignore_index=True)
+            print(f"💬 {comment_chunks['comment_id'].nunique()} Kommentare als {len(comment_chunks)} Passagen")
+        texts = chunks["embed_text"].tolist()
 
         print(f"🧠 Lade Modell: {self.model_name}")
-        print(f"⚙️ Erzeuge {len(texts)} Embeddings ...")
-        embeddings = self.model.encode(texts, show_progress_bar=True)
+        print(f"⚙️ Erzeuge {len(texts)} Embeddings für {len(df)} Posts ...")
+        with span("encode"):
+            embeddings = self.encode_passages(texts, chunks["num_tokens"].tolist())
+        POSTS_EMBEDDED.inc(len(texts))
 
-        # Save embeddings
-        np.save(str(npy_path), embeddings)
+        # Save embeddings and the chunk table aligned with their rows
+        with span("npy_write"):
+            np.save(str(npy_path), embeddings)
+            chunks.drop(columns=["embed_text"]).to_csv(
+                self.chunks_folder / f"{dataset_name}.csv", index=False
+            )
         print(f"✅ Embeddings gespeichert unter {npy_path}")
 
-        return embeddings, df
+        return embeddings, df, chunks
     
-    def process_and_store_embeddings(self, dataset_name: str) -> Tuple[np.ndarray, pd.DataFrame]:
+    def reduce_embeddings(
+        self, 
+        embeddings: np.ndarray, 
+        dataset_name: str, 
+        reduction: Optional[str] = None
+    ) -> Tuple[np.ndarray, Optional[Dict[str, Any]]]:
+        """
+        Reduce embeddings for storage and save the fitted projection.
+        
+        Args:
+            embeddings: Full-dimension embeddings
+            dataset_name: Name of the dataset (and collection)
+            reduction: Spec like "pca:128" or "truncate:256", EMBEDDING_REDUCTION if None
+            
+        Returns:
+            Tuple of (vectors to store, reduction metadata or None)
+        """
+        spec = parse_reduction_spec(reduction if reduction is not None else EmbeddingConfig.REDUCTION)
+        if spec is None:
+            return embeddings, None
+
+        method, dim = spec
+        model_info = EmbeddingConfig.EMBEDDING_MODELS.get(self.model_name, {})
+        if method == "truncate" and not model_info.get("matryoshka", False):
+            print(f"⚠️ {self.model_name} ist kein Matryoshka-Modell, nutze PCA statt Truncation")
+            method = "pca"
+        if dim >= embeddings.shape[1]:
+            print(f"⚠️ Zieldimension {dim} ≥ {embeddings.shape[1]}, keine Reduktion")
+            return embeddings, None
+        if method == "pca" and len(embeddings) < dim * EmbeddingConfig.MIN_SAMPLES_PER_PCA_DIM:
+            print(f"⚠️ Zu wenige Vektoren ({len(embeddings)}) für PCA auf {dim} Dimensionen, keine Reduktion")
+            return embeddings, None
+
+        with span("reduce"):
+            projection = Projection.fit(embeddings, method, dim)
+            reduced = projection.transform(embeddings)
+            projection_path = self.projections_folder / f"{dataset_name}.npz"
+            projection.save(projection_path)
+        with span("reduce_recall"):
+            recall = recall_at_k(embeddings, reduced, k=10)
+        print(f"📉 Reduktion {method}: {embeddings.shape[1]} → {dim} Dimensionen, Recall@10 = {recall:.3f}")
+
+        return reduced, {
+            "method": method,
+            "dim": dim,
+            "file": projection_path.name,
+            "recall_at_10": recall,
+        }
+
+    def process_and_store_embeddings(
+        self, 
+        dataset_name: str, 
+        reduction: Optional[str] = None,
+        profile: Optional[str] = None
+    ) -> Tuple[np.ndarray, pd.DataFrame]:
         """
         Complete pipeline: generate embeddings and store them in vector store.
-        With MLflow tracking.
+        MLflow tracking runs on a background thread and never blocks the pipeline.
         
         Args:
             dataset_name: Name of the dataset to process
+            reduction: Optional reduction spec for the stored vectors, e.g. "pca:128"
+            profile: Collection profile ("small", "medium", "large"), chosen by size if None
             
         Returns:
-            Tuple of (embeddings, dataframe)
+            Tuple of (embeddings, dataframe) with full-dimension embeddings
         """
+        run = start_tracking_run(f"embeddings_{dataset_name}")
+        csv_path = CSV_FOLDER / f"{dataset_name}.csv"
+        posts_path = POSTS_FOLDER / f"{dataset_name}.csv"
+        npy_path = self.npy_folder / f"{dataset_name}.npy"
+        run.log_params({
+            "embedding_model": self.model_name,
+            "dataset_name": dataset_name,
+            "csv_path": str(csv_path),
+        })
+
         try:
-            with mlflow.start_run(run_name=f"embeddings_{dataset_name}"):
-                print(f"🔄 Processing embeddings for dataset: {dataset_name}")
-                
-                # Generate embeddings
-                print("📥 Loading and processing data...")
-                embeddings, df = self.generate_embeddings(dataset_name)
-                
-                # Get CSV path
-                csv_path = CSV_FOLDER / f"{dataset_name}.csv"
-                
-                # Log parameters
-                print("📊 Logging parameters to MLflow...")
-                mlflow.log_param("embedding_model", self.model_name)
-                mlflow.log_param("dataset_name", dataset_name)
-                mlflow.log_param("num_posts", len(df))
-                mlflow.log_param("csv_path", str(csv_path))
-                
-                # Log artifacts
-                print("💾 Logging artifacts to MLflow...")
-                npy_path = f"data/processed/npy/{dataset_name}.npy"
-                if os.path.exists(csv_path):
-                    mlflow.log_artifact(str(csv_path))
-                if os.path.exists(npy_path):
-                    mlflow.log_artifact(npy_path)
-                
-                # Upload to vector store
-                print("🚀 Uploading to vector store...")
-                upload_embeddings_with_payloads(embeddings, str(csv_path), dataset_name)
-                
-                print(f"✅ Complete pipeline finished for {dataset_name}")
-                return embeddings, df
+            print(f"🔄 Processing embeddings for dataset: {dataset_name}")
+            
+            # Generate embeddings
+            print("📥 Loading and processing data...")
+            with span("embed_dataset") as embed_span:
+                embeddings, df, chunks = self.generate_chunk_embeddings(dataset_name)
+            
+            # Optionally reduce the stored vectors; the .npy keeps the full dimension
+            vectors, reduction_info = self.reduce_embeddings(embeddings, dataset_name, reduction)
+            
+            # Upload to vector store
+            print("🚀 Uploading to vector store...")
+            with span("upload") as upload_span:
+                profile_name = upload_embeddings_with_payloads(
+                    vectors, str(posts_path), dataset_name, chunks, profile
+                )
+
+            update_collection_info(
+                dataset_name,
+                dataset=dataset_name,
+                model=self.model_name,
+                dim=int(embeddings.shape[1]),
+                stored_dim=int(vectors.shape[1]),
+                reduction=reduction_info,
+                profile=profile_name,
+                num_posts=len(df),
+                num_points=len(vectors),
+                # Lets a restore verify the matrix before re-uploading it
+                npy_sha256=file_sha256(str(npy_path)),
+            )
+
+            run.log_params({
+                "num_posts": len(df),
+                "num_chunks": len(chunks),
+                "num_comment_chunks": int(chunks["comment_id"].notna().sum()) if "comment_id" in chunks else 0,
+                "embedding_dim": embeddings.shape[1],
+                "stored_dim": vectors.shape[1],
+                "reduction": reduction_info["method"] if reduction_info else "none",
+                "collection_profile": profile_name,
+                "chunk_max_tokens": self.max_tokens,
+            })
+            if reduction_info:
+                run.log_metrics({"reduction_recall_at_10": reduction_info["recall_at_10"]})
+            run.log_metrics({
+                "embed_seconds": embed_span.elapsed,
+                "embed_posts_per_second": len(df) / embed_span.elapsed if embed_span.elapsed else 0.0,
+                "upload_seconds": upload_span.elapsed,
+                "upload_vectors_per_second": len(embeddings) / upload_span.elapsed if upload_span.elapsed else 0.0,
+            })
+            # Artifacts are recorded by path and content hash instead of being copied
+            run.log_artifact_ref("csv", str(csv_path))
+            run.log_artifact_ref("posts", str(posts_path))
+            run.log_artifact_ref("embeddings", str(npy_path))
+            run.end("FINISHED")
+            
+            print(f"✅ Complete pipeline finished for {dataset_name}")
+            return embeddings, df
                 
         except Exception as e:
             print(f"❌ Error in process_and_store_embeddings: {str(e)}")
-            # Log error to MLflow if run is still active
-            try:
-                mlflow.log_param("error", str(e))
-            except:
-                pass
+            run.log_params({"error": str(e)[:500]})
+            run.end("FAILED")
             raise e
 
+    @staticmethod
+    def _append_raw(csv_path: Path, new_posts: pd.DataFrame) -> None:
+        # The raw CSV keeps every collected post, reposts included, for reprocessing
+        if new_posts.empty:
+            return
+        new_posts.to_csv(csv_path, mode="a", header=not csv_path.exists(), index=False)
+
+    def append_posts(
+        self, 
+        dataset_name: str, 
+        new_posts: pd.DataFrame,
+        profile: Optional[str] = None
+    ) -> int:
+        """
+        Embed new posts of a growing dataset and append them to its collection.
+        
+        Near-duplicates of already ingested posts are folded into those posts
+        (duplicate count and aggregate score, updated in place) instead of being
+        stored again. The chunk table and the .npy grow by the new rows only; the
+        raw CSV keeps every new post, reposts included.
+        Vectors are reduced with the collection's saved projection, if any.
+        
+        Args:
+            dataset_name: Name of the dataset (and collection)
+            new_posts: Posts not yet in the dataset
+            profile: Collection profile used if the collection is created
+            
+        Returns:
+            Number of posts appended
+        """
+        csv_path = CSV_FOLDER / f"{dataset_name}.csv"
+        posts_path = POSTS_FOLDER / f"{dataset_name}.csv"
+        npy_path = self.npy_folder / f"{dataset_name}.npy"
+        chunks_path = self.chunks_folder / f"{dataset_name}.csv"
+        dedup_path = self.dedup_folder / f"{dataset_name}.npz"
+        info = get_collection_info(dataset_name) or {}
+
+        with span("csv_read"):
+            existing_path = processed_posts_path(dataset_name)
+            existing = pd.read_csv(existing_path) if existing_path.exists() else pd.DataFrame()
+            raw = pd.read_csv(csv_path, usecols=["id"]) if csv_path.exists() else existing
+        df = new_posts.drop_duplicates("id")
+        if not raw.empty:
+            # Raw IDs include the reposts that were folded into other posts
+            df = df[~df["id"].astype(str).isin(raw["id"].astype(str))]
+        raw_new = df
+
+        index = None
+        external: Dict[str, List[int]] = {}
+        if EmbeddingConfig.DEDUP_THRESHOLD > 0 and not df.empty:
+            with span("dedup"):
+                if dedup_path.exists():
+                    index = NearDuplicateIndex.load(dedup_path)
+                else:
+                    index = NearDuplicateIndex(EmbeddingConfig.DEDUP_THRESHOLD)
+                new_rows = df.reset_index(drop=True)
+                df, external = index.deduplicate(new_rows)
+
+        # Reposts of known posts are folded into them instead of being stored again
+        updates: Dict[str, Dict[str, Any]] = {}
+        if external:
+            positions = pd.Index(existing["id"].astype(str)) if not existing.empty else pd.Index([])
+            for post_id, rows in external.items():
+                if post_id not in positions:
+                    continue
+                i = positions.get_loc(post_id)
+                row = existing.loc[i]
+                # Posts stored without dedup have no counts yet: no duplicates, their own score
+                count = row.get("duplicate_count")
+                count = 0 if pd.isna(count) else int(count)
+                aggregate = row.get("aggregate_score")
+                if pd.isna(aggregate):
+                    aggregate = 0 if pd.isna(row["score"]) else row["score"]
+                updates[post_id] = {
+                    "duplicate_count": count + len(rows),
+                    "aggregate_score": int(aggregate) + int(new_rows.loc[rows, "score"].fillna(0).sum()),
+                }
+                for key, value in updates[post_id].items():
+                    existing.loc[i, key] = value
+
+        if df.empty:
+            if updates:
+                update_post_fields(dataset_name, updates)
+                # Payload-only change: outdates the precomputed answers
+                update_collection_info(dataset_name, folded_at=datetime.now().isoformat())
+            with span("csv_write"):
+                if updates:
+                    existing.to_csv(posts_path, index=False)
+                self._append_raw(csv_path, raw_new)
+            if index is not None:
+                index.save(dedup_path)
+            return 0
+
+        with span("sentiment"):
+            score_posts(df)
+        with span("chunking"):
+            chunks = build_chunks(
+                df, self.max_tokens, EmbeddingConfig.CHUNK_OVERLAP_TOKENS, self.count_tokens
+            )
+        with span("encode"):
+            embeddings = self.encode_passages(chunks["embed_text"].tolist(), chunks["num_tokens"].tolist())
+        POSTS_EMBEDDED.inc(len(chunks))
+
+        vectors = embeddings
+        if info.get("reduction"):
+            projection = Projection.load(self.projections_folder / info["reduction"]["file"])
+            vectors = projection.transform(embeddings)
+
+        with span("upload"):
+            profile_name = append_embeddings(vectors, df, dataset_name, chunks, info.get("profile") or profile)
+            if updates:
+                update_post_fields(dataset_name, updates)
+
+        # Grow the dataset files only after the upload succeeded
+        with span("npy_write"):
+            append_npy_rows(str(npy_path), embeddings)
+            chunks.drop(columns=["embed_text"]).to_csv(
+                chunks_path, mode="a", header=not chunks_path.exists(), index=False
+            )
+        with span("csv_write"):
+            posts = pd.concat([existing, df], ignore_index=True) if not existing.empty else df
+            posts.to_csv(posts_path, index=False)
+            self._append_raw(csv_path, raw_new)
+        # Saved last, so a failed append is retried instead of matching its own posts
+        if index is not None:
+            index.save(dedup_path)
+
+        update_collection_info(
+            dataset_name,
+            dataset=dataset_name,
+            model=self.model_name,
+            dim=int(embeddings.shape[1]),
+            stored_dim=int(vectors.shape[1]),
+            reduction=info.get("reduction"),
+            profile=profile_name,
+            num_posts=len(posts),
+            num_points=int(info.get("num_points", 0)) + len(vectors),
+            npy_sha256=file_sha256(str(npy_path)),
+            **({"folded_at": datetime.now().isoformat()} if updates else {}),
+        )
+        print(f"➕ {len(df)} neue Posts ({len(vectors)} Vektoren) an {dataset_name} angehängt")
+        return len(df)
+
 
 # Global processor instance
 _default_processor = EmbeddingProcessor()
@@ -168,17 +546,38 @@ def generate_embeddings(dataset_name: str) -> Tuple[np.ndarray, pd.DataFrame]:
     return _default_processor.generate_embeddings(dataset_name)
 
 
-def process_and_store_embeddings(dataset_name: str) -> Tuple[np.ndarray, pd.DataFrame]:
+def process_and_store_embeddings(
+    dataset_name: str, 
+    reduction: Optional[str] = None,
+    profile: Optional[str] = None
+) -> Tuple[np.ndarray, pd.DataFrame]:
     """
     Convenience function to process and store embeddings using the default processor.
     
     Args:
         dataset_name: Name of the dataset to process
+        reduction: Optional reduction spec for the stored vectors, e.g. "pca:128"
+        profile: Collection profile ("small", "medium", "large"), chosen by size if None
         
     Returns:
         Tuple of (embeddings, dataframe)
     """
-    return _default_processor.process_and_store_embeddings(dataset_name)
+    return _default_processor.process_and_store_embeddings(dataset_name, reduction, profile)
+
+
+def append_posts(dataset_name: str, new_posts: pd.DataFrame, profile: Optional[str] = None) -> int:
+    """
+    Convenience function to append new posts using the default processor.
+    
+    Args:
+        dataset_name: Name of the dataset (and collection)
+        new_posts: Posts not yet in the dataset
+        profile: Collection profile used if the collection is created
+        
+    Returns:
+        Number of posts appended
+    """
+    return _default_processor.append_posts(dataset_name, new_posts, profile)
 
 
 # For backward compatibility
@@ -0,0 +1,181 @@
+"""
+Dimensionality reduction of stored vectors (PCA or Matryoshka truncation).
+
+Vectors are reduced per collection before upload; the fitted projection is
+saved with the collection metadata and applied to query vectors as well.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+REDUCTION_METHODS = ("pca", "truncate")
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
+PROJECTIONS_FOLDER = ROOT_FOLDER / "data" / "processed" / "projections"
+
+
+def parse_reduction_spec(spec: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    Parse a reduction spec like "pca:128" or "truncate:256".
+
+    Args:
+        spec: Spec string, empty or None for no reduction
+
+    Returns:
+        Tuple of (method, dim), or None
+    """
+    if not spec:
+        return None
+    method, _, dim = spec.partition(":")
+    method = method.strip().lower()
+    if method not in REDUCTION_METHODS or not dim.strip().isdigit():
+        raise ValueError(f"Invalid reduction spec '{spec}', expected e.g. 'pca:128' or 'truncate:256'")
+    return method, int(dim)
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return (x / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+class Projection:
+    """Linear projection of embeddings to fewer dimensions, re-normalized for cosine."""
+
+    def __init__(
+        self,
+        method: str,
+        input_dim: int,
+        output_dim: int,
+        mean: Optional[np.ndarray] = None,
+        components: Optional[np.ndarray] = None
+    ):
+        self.method = method
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        self.mean = mean
+        self.components = components
+
+    @classmethod
+    def fit(cls, embeddings: np.ndarray, method: str, dim: int) -> "Projection":
+        """
+        Fit a projection on a dataset.
+
+        Args:
+            embeddings: Full-dimension embeddings (n, d)
+            method: "pca" or "truncate"
+            dim: Target dimension
+
+        Returns:
+            Fitted projection
+        """
+        input_dim = embeddings.shape[1]
+        if dim >= input_dim:
+            raise ValueError(f"Target dimension {dim} must be smaller than {input_dim}")
+        if method == "truncate":
+            return cls("truncate", input_dim, dim)
+
+        x = embeddings.astype(np.float64)
+        mean = x.mean(axis=0)
+        centered = x - mean
+        # Eigen-decomposition of the d x d covariance scales with n * d^2
+        covariance = centered.T @ centered / max(len(x) - 1, 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        components = eigenvectors[:, np.argsort(eigenvalues)[::-1][:dim]]
+        return cls("pca", input_dim, dim, mean.astype(np.float32), components.astype(np.float32))
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Project embeddings (a matrix or a single vector).
+
+        Args:
+            embeddings: Full-dimension embeddings
+
+        Returns:
+            Reduced, L2-normalized embeddings
+        """
+        x = np.asarray(embeddings, dtype=np.float32)
+        if self.method == "truncate":
+            return _normalize(x[..., :self.output_dim])
+        return _normalize((x - self.mean) @ self.components)
+
+    def save(self, path: Path) -> None:
+        """
+        Save the projection as .npz.
+
+        Args:
+            path: Target path
+        """
+        arrays = {
+            "method": np.array(self.method),
+            "input_dim": np.array(self.input_dim),
+            "output_dim": np.array(self.output_dim),
+        }
+        if self.method == "pca":
+            arrays["mean"] = self.mean
+            arrays["components"] = self.components
+        np.savez(str(path), **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> "Projection":
+        """
+        Load a projection saved with :meth:`save`.
+
+        Args:
+            path: Path of the .npz file
+
+        Returns:
+            Projection
+        """
+        data = np.load(str(path))
+        method = str(data["method"])
+        return cls(
+            method,
+            int(data["input_dim"]),
+            int(data["output_dim"]),
+            data["mean"] if method == "pca" else None,
+            data["components"] if method == "pca" else None,
+        )
+
+
+def recall_at_k(
+    full: np.ndarray,
+    reduced: np.ndarray,
+    k: int = 10,
+    num_queries: int = 200,
+    seed: int = 42
+) -> float:
+    """
+    Recall@k of nearest-neighbour search on reduced vectors against full-dimension search.
+
+    Dataset vectors are used as queries (excluding themselves as hits).
+
+    Args:
+        full: Full-dimension embeddings (n, d)
+        reduced: Reduced embeddings (n, k')
+        k: Number of neighbours compared
+        num_queries: Number of sampled query rows
+        seed: Seed for sampling the queries
+
+    Returns:
+        Mean overlap of the top-k neighbour sets in [0, 1]
+    """
+    n = len(full)
+    k = min(k, n - 1)
+    if k <= 0:
+        return 1.0
+    rng = np.random.default_rng(seed)
+    queries = rng.choice(n, size=min(num_queries, n), replace=False)
+
+    def _top_k(x: np.ndarray) -> np.ndarray:
+        x = _normalize(x)
+        similarities = x[queries] @ x.T
+        similarities[np.arange(len(queries)), queries] = -np.inf
+        return np.argpartition(-similarities, k, axis=1)[:, :k]
+
+    expected = _top_k(full)
+    actual = _top_k(reduced)
+    # Row-wise set intersection of the (queries, k) index matrices
+    hits = (actual[:, :, None] == expected[:, None, :]).any(axis=2).sum(axis=1)
+    return float(hits.mean() / k)
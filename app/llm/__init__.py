@@ -2,6 +2,7 @@
 LLM module for handling OpenAI interactions and response generation.
 """
 
+from .gateway import LLMGateway, LLMUnavailableError, complete, get_llm_gateway
 from .generator import generate_answer_from_context
 
-__all__ = ["generate_answer_from_context"]
+__all__ = ["LLMGateway", "LLMUnavailableError", "complete", "get_llm_gateway", "generate_answer_from_context"]
@@ -0,0 +1,335 @@
+"""
+LLM gateway: one rate-aware, concurrency-limited path to the chat completions API.
+
+* Identical prompts in flight at the same time are coalesced (single flight):
+  one request is sent and all callers get its answer.
+* Token buckets per model for requests and tokens per minute; a request
+  reserves its estimated prompt tokens plus ``max_tokens`` and gets the unused
+  part refunded once the usage is known.
+* Rate-limit, timeout, connection and server errors are retried with jittered
+  exponential backoff, honouring ``Retry-After``.
+* If the primary model has no budget left within ``FALLBACK_AFTER_SECONDS`` or
+  keeps failing with rate limits, the request goes to the cheaper fallback model.
+  Without budget within ``MAX_BUDGET_WAIT_SECONDS`` it fails with
+  ``LLMUnavailableError``, which the API answers with 503.
+
+Works with any OpenAI-compatible server through ``OPENAI_BASE_URL``.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+import openai
+from openai import OpenAI
+
+from app.monitoring.metrics import span, CACHE_HITS, CACHE_MISSES, LLM_FALLBACKS, LLM_RETRIES, LLM_TOKENS
+from app.utils.rate_limit import TokenBucket
+
+load_dotenv()
+
+
+class LLMConfig:
+    """Configuration for the LLM gateway."""
+
+    MODEL = os.getenv("LLM_MODEL", "gpt-4")
+    # Cheaper model used under rate pressure; empty disables the fallback
+    FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "gpt-4o-mini")
+
+    # OpenAI-compatible endpoint, the OpenAI API if unset
+    BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+    API_KEY = os.getenv("OPENAI_API_KEY")
+
+    # Seconds per request attempt
+    TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+    MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "20"))
+
+    # Account limits per model
+    REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+    TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "30000"))
+
+    # Requests in flight across all models
+    MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+    # Upper bound of completion tokens, also reserved from the token bucket
+    MAX_COMPLETION_TOKENS = int(os.getenv("LLM_MAX_COMPLETION_TOKENS", "800"))
+
+    # Longest wait for rate budget of the primary model before falling back
+    FALLBACK_AFTER_SECONDS = float(os.getenv("LLM_FALLBACK_AFTER_SECONDS", "2"))
+
+    # Longest wait for rate budget of the last model tried before giving up
+    MAX_BUDGET_WAIT_SECONDS = float(os.getenv("LLM_MAX_BUDGET_WAIT_SECONDS", "30"))
+
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Rough token count of chat messages (about four characters per token).
+
+    Args:
+        messages: Chat messages
+
+    Returns:
+        Estimated prompt tokens
+    """
+    return sum(len(m.get("content") or "") // 4 + 4 for m in messages) + 2
+
+
+class LLMUnavailableError(Exception):
+    """No model had rate budget for a request within the allowed wait."""
+
+
+@dataclass
+class Completion:
+    """Answer of the gateway."""
+
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    coalesced: bool = False
+
+
+class _InFlight:
+    """A request in flight that later identical requests wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Completion] = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMGateway:
+    """Coalescing, rate-limited and retrying client for chat completions."""
+
+    def __init__(
+        self,
+        client: Optional[OpenAI] = None,
+        model: Optional[str] = None,
+        fallback_model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        self._client = client
+        self.model = model or LLMConfig.MODEL
+        self.fallback_model = LLMConfig.FALLBACK_MODEL if fallback_model is None else fallback_model
+        self.requests_per_minute = requests_per_minute or LLMConfig.REQUESTS_PER_MINUTE
+        self.tokens_per_minute = tokens_per_minute or LLMConfig.TOKENS_PER_MINUTE
+        self._slots = threading.BoundedSemaphore(max_concurrency or LLMConfig.MAX_CONCURRENCY)
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> OpenAI:
+        """OpenAI client, created on first use; retries are handled by the gateway."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = OpenAI(
+                        api_key=LLMConfig.API_KEY,
+                        base_url=LLMConfig.BASE_URL,
+                        timeout=LLMConfig.TIMEOUT,
+                        max_retries=0,
+                    )
+        return self._client
+
+    def _model_buckets(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        with self._lock:
+            if model not in self._buckets:
+                # Capacity of one minute's budget allows short bursts
+                self._buckets[model] = (
+                    TokenBucket(self.requests_per_minute / 60.0, capacity=self.requests_per_minute),
+                    TokenBucket(self.tokens_per_minute / 60.0, capacity=self.tokens_per_minute),
+                )
+            return self._buckets[model]
+
+    def _reserve(self, model: str, tokens: int, timeout: Optional[float]) -> bool:
+        requests, token_budget = self._model_buckets(model)
+        if not requests.acquire(1, timeout):
+            return False
+        if not token_budget.acquire(tokens, timeout):
+            requests.refund(1)
+            return False
+        return True
+
+    def _reserve_or_fail(self, model: str, tokens: int) -> None:
+        if not self._reserve(model, tokens, LLMConfig.MAX_BUDGET_WAIT_SECONDS):
+            raise LLMUnavailableError(
+                f"No rate budget for {model} within {LLMConfig.MAX_BUDGET_WAIT_SECONDS:g}s"
+            )
+
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None
+    ) -> Completion:
+        """
+        Get a chat completion, coalescing identical requests already in flight.
+
+        Args:
+            messages: Chat messages
+            max_tokens: Completion token limit, ``MAX_COMPLETION_TOKENS`` if None
+            temperature: Sampling temperature, the API default if None
+
+        Returns:
+            Completion with the answer text and the model that produced it
+        """
+        max_tokens = max_tokens or LLMConfig.MAX_COMPLETION_TOKENS
+        key = hashlib.sha256(
+            json.dumps([self.model, messages, max_tokens, temperature], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _InFlight()
+        if not leader:
+            CACHE_HITS.labels("llm_in_flight").inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return Completion(**{**call.result.__dict__, "coalesced": True})
+
+        CACHE_MISSES.labels("llm_in_flight").inc()
+        try:
+            call.result = self._complete(messages, max_tokens, temperature)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def _complete(self, messages: List[Dict[str, str]], max_tokens: int, temperature: Optional[float]) -> Completion:
+        reserved = estimate_tokens(messages) + max_tokens
+        model = self.model
+        if not self.fallback_model:
+            self._reserve_or_fail(model, reserved)
+        elif not self._reserve(model, reserved, LLMConfig.FALLBACK_AFTER_SECONDS):
+            LLM_FALLBACKS.labels("rate_budget").inc()
+            model = self.fallback_model
+            self._reserve_or_fail(model, reserved)
+
+        with self._slots:
+            try:
+                return self._request(model, messages, max_tokens, temperature, reserved)
+            except openai.RateLimitError:
+                if not self.fallback_model or model == self.fallback_model:
+                    raise
+                LLM_FALLBACKS.labels("rate_limited").inc()
+
+        # Reserved outside the slot, so waiting for budget does not block other models
+        self._reserve_or_fail(self.fallback_model, reserved)
+        with self._slots:
+            return self._request(self.fallback_model, messages, max_tokens, temperature, reserved)
+
+    def _request(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: Optional[float],
+        reserved: int
+    ) -> Completion:
+        params: Dict[str, Any] = {"model": model, "messages": messages, "max_tokens": max_tokens}
+        if temperature is not None:
+            params["temperature"] = temperature
+
+        attempt = 0
+        while True:
+            try:
+                with span("llm_call"):
+                    response = self.client.chat.completions.create(**params)
+                break
+            except _RETRYABLE_ERRORS as e:
+                if attempt < LLMConfig.MAX_RETRIES:
+                    LLM_RETRIES.labels(model).inc()
+                    time.sleep(self._retry_delay(e, attempt))
+                    attempt += 1
+                    continue
+                # No completion was produced: hand the reserved tokens back
+                self._model_buckets(model)[1].refund(reserved)
+                raise
+            except Exception:
+                self._model_buckets(model)[1].refund(reserved)
+                raise
+
+        prompt_tokens = completion_tokens = 0
+        if response.usage is not None:
+            prompt_tokens = response.usage.prompt_tokens
+            completion_tokens = response.usage.completion_tokens
+            LLM_TOKENS.labels("prompt").inc(prompt_tokens)
+            LLM_TOKENS.labels("completion").inc(completion_tokens)
+            # Hand back what the reservation over-estimated
+            self._model_buckets(model)[1].refund(max(reserved - prompt_tokens - completion_tokens, 0))
+        return Completion(
+            text=response.choices[0].message.content or "",
+            model=response.model or model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), LLMConfig.RETRY_MAX_DELAY)
+            except ValueError:
+                pass
+        return random.uniform(0, min(LLMConfig.RETRY_MAX_DELAY, LLMConfig.RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+# Global gateway instance
+_default_gateway = LLMGateway()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Get the LLM gateway of this process.
+
+    Returns:
+        Shared LLM gateway
+    """
+    return _default_gateway
+
+
+def complete(
+    messages: List[Dict[str, str]],
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None
+) -> Completion:
+    """
+    Convenience function to get a chat completion through the default gateway.
+
+    Args:
+        messages: Chat messages
+        max_tokens: Completion token limit, ``MAX_COMPLETION_TOKENS`` if None
+        temperature: Sampling temperature, the API default if None
+
+    Returns:
+        Completion with the answer text and the model that produced it
+    """
+    return _default_gateway.complete(messages, max_tokens, temperature)
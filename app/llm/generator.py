@@ -2,13 +2,59 @@
 LLM response generator for stock sentiment analysis.
 """
 
-from openai import OpenAI
-from dotenv import load_dotenv
 import os
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
-load_dotenv()
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from app.embedding.chunking import approximate_token_counts
+from app.llm.gateway import complete
+from app.monitoring.metrics import span
+
+# Context tokens per ticker in comparative answers
+COMPARE_CONTEXT_TOKENS = int(os.getenv("COMPARE_CONTEXT_TOKENS", "600"))
+
+
+def format_post(post: Dict) -> str:
+    """
+    Format a context post with its matched comments for the prompt.
+    
+    Args:
+        post: Context post with title, selftext and optional comments
+        
+    Returns:
+        Post text
+    """
+    lines = [post["title"], post.get("selftext", "")]
+    for comment in post.get("comments", []):
+        lines.append(f"- Kommentar ({comment['score']} Punkte): {comment['text']}")
+    return "\n".join(line for line in lines if line)
+
+
+def build_context_block(posts: List[Dict], max_tokens: int) -> Tuple[str, int]:
+    """
+    Join the most relevant posts into a context block within a token budget.
+    
+    Posts are taken in order until the next one no longer fits; the first post
+    is cut to the budget rather than dropped.
+    
+    Args:
+        posts: Context posts, most relevant first
+        max_tokens: Token budget of the block
+        
+    Returns:
+        Tuple of (context text, number of posts used)
+    """
+    texts = [format_post(p) for p in posts]
+    counts = approximate_token_counts(texts)
+    parts, used = [], 0
+    for text, tokens in zip(texts, counts):
+        if used + tokens > max_tokens:
+            if not parts:
+                words = text.split()
+                parts.append(" ".join(words[:int(len(words) * max_tokens / tokens)]))
+            break
+        parts.append(text)
+        used += tokens
+    return "\n\n".join(parts), len(parts)
 
 
 def generate_answer_from_context(query: str, context_posts: List[Dict]) -> str:
@@ -22,11 +68,10 @@ def generate_answer_from_context(query: str, context_posts: List[Dict]) -> str:
     Returns:
         Generated answer based on the context
     """
-    context_text = "\n\n".join([
-        f"{p['title']}\n{p.get('selftext', '')}" for p in context_posts
-    ])
+    with span("prompt_build"):
+        context_text = "\n\n".join([format_post(p) for p in context_posts])
 
-    prompt = f"""Du bist ein Finanzanalyst. Beantworte folgende Frage basierend auf Reddit-Posts:
+        prompt = f"""Du bist ein Finanzanalyst. Beantworte folgende Frage basierend auf Reddit-Posts:
 
 Frage: {query}
 
@@ -35,9 +80,42 @@ Reddit-Kontext:
 
 Antwort:"""
 
-    response = openai_client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
-    )
+    return complete([{"role": "user", "content": prompt}]).text
+
+
+def generate_comparison_from_context(
+    query: str,
+    contexts: Dict[str, List[Dict]],
+    max_tokens_per_ticker: int = COMPARE_CONTEXT_TOKENS
+) -> Tuple[str, Dict[str, int]]:
+    """
+    Generate one comparative answer across tickers from per-ticker context posts.
+    
+    Every ticker gets its own context block of at most ``max_tokens_per_ticker``
+    tokens, so one busy ticker cannot crowd out the others.
+    
+    Args:
+        query: The user's question
+        contexts: Relevant Reddit posts per ticker symbol, most relevant first
+        max_tokens_per_ticker: Token budget of each ticker's context block
+        
+    Returns:
+        Tuple of (answer, number of posts used per ticker)
+    """
+    with span("prompt_build"):
+        blocks, used = [], {}
+        for symbol, posts in contexts.items():
+            block, used[symbol] = build_context_block(posts, max_tokens_per_ticker)
+            blocks.append(f"### {symbol}\n{block or '(keine passenden Posts)'}")
+        context_text = "\n\n".join(blocks)
+
+        prompt = f"""Du bist ein Finanzanalyst. Vergleiche die folgenden Aktien anhand von Reddit-Posts und beantworte die Frage für jede Aktie sowie im direkten Vergleich:
+
+Frage: {query}
+
+Reddit-Kontext pro Aktie:
+{context_text}
+
+Vergleichende Antwort:"""
 
-    return response.choices[0].message.content
+    return complete([{"role": "user", "content": prompt}]).text, used
@@ -1,10 +1,16 @@
 # main.py
+import asyncio
+
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
+from app.monitoring.metrics import render_metrics
+from app.monitoring.readiness import get_readiness
+from app.scheduler import get_scheduler
+from app.scheduler.refresh import RefreshConfig
 
 app = FastAPI(title="Stock Sentiment RAG")
 
@@ -24,6 +30,30 @@ templates = Jinja2Templates(directory="app/templates")
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
+@app.on_event("startup")
+async def warm_up():
+    # In the background, so /ready answers "warming_up" instead of refusing connections
+    app.state.warm_up = asyncio.get_running_loop().create_task(get_readiness().warm_up_async())
+
+@app.on_event("startup")
+async def start_refresh_scheduler():
+    if RefreshConfig.ENABLED:
+        get_scheduler().start()
+
+@app.on_event("shutdown")
+async def stop_refresh_scheduler():
+    get_scheduler().stop()
+
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    readiness = get_readiness()
+    return JSONResponse(readiness.status(), status_code=200 if readiness.ready else 503)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
 # Include API routes (after the root route)
 app.include_router(router, prefix="/api")
 
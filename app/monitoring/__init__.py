@@ -0,0 +1,7 @@
+"""
+Monitoring module for latency tracing and Prometheus metrics.
+"""
+
+from .metrics import span, timed, render_metrics, print_stage_summary
+
+__all__ = ["span", "timed", "render_metrics", "print_stage_summary"]
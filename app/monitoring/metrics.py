@@ -0,0 +1,195 @@
+"""
+Lightweight span timers and Prometheus metrics for the RAG pipeline.
+
+Spans only record into in-process histograms (a ``perf_counter`` pair and a
+bucket increment); nothing is serialized until ``/metrics`` is scraped. With
+several worker processes, ``PROMETHEUS_MULTIPROC_DIR`` must be set before this
+module is imported; every process then writes its values to that folder and a
+scrape of any worker reports the sum over all of them.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+registry = CollectorRegistry(auto_describe=True)
+
+# Covers sub-millisecond prompt builds up to multi-minute bulk encodes/uploads
+_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+STAGE_LATENCY = Histogram(
+    "rag_stage_duration_seconds",
+    "Wall-clock duration of pipeline stages",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+    registry=registry,
+)
+STAGE_ERRORS = Counter(
+    "rag_stage_errors_total",
+    "Pipeline stages that raised an exception",
+    ["stage"],
+    registry=registry,
+)
+POSTS_EMBEDDED = Counter(
+    "rag_posts_embedded_total",
+    "Texts encoded into embeddings",
+    registry=registry,
+)
+VECTORS_UPSERTED = Counter(
+    "rag_vectors_upserted_total",
+    "Vectors written to the vector store",
+    registry=registry,
+)
+LLM_TOKENS = Counter(
+    "rag_llm_tokens_total",
+    "Tokens exchanged with the LLM",
+    ["kind"],
+    registry=registry,
+)
+CACHE_HITS = Counter(
+    "rag_cache_hits_total",
+    "Cache lookups that were served without recomputation",
+    ["cache"],
+    registry=registry,
+)
+CACHE_MISSES = Counter(
+    "rag_cache_misses_total",
+    "Cache lookups that had to be recomputed",
+    ["cache"],
+    registry=registry,
+)
+VECTOR_STORE_RETRIES = Counter(
+    "rag_vector_store_retries_total",
+    "Vector store calls retried after a transient error",
+    ["operation"],
+    registry=registry,
+)
+LLM_RETRIES = Counter(
+    "rag_llm_retries_total",
+    "LLM requests retried after a rate-limit, timeout or server error",
+    ["model"],
+    registry=registry,
+)
+LLM_FALLBACKS = Counter(
+    "rag_llm_fallbacks_total",
+    "LLM requests served by the fallback model",
+    ["reason"],
+    registry=registry,
+)
+TRACKING_EVENTS_DROPPED = Counter(
+    "rag_tracking_events_dropped_total",
+    "Experiment-tracking events dropped because the tracker was full or failing",
+    registry=registry,
+)
+
+
+class Span:
+    """Result handle of a timed span; ``elapsed`` is set once the span closes."""
+
+    __slots__ = ("stage", "elapsed")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.elapsed = 0.0
+
+
+@contextmanager
+def span(stage: str) -> Iterator[Span]:
+    """
+    Time a block of code and record it under ``stage``.
+
+    Args:
+        stage: Stage label (e.g. "encode", "search", "llm_call")
+
+    Yields:
+        Span whose ``elapsed`` attribute holds the duration in seconds
+    """
+    result = Span(stage)
+    start = time.perf_counter()
+    try:
+        yield result
+    except BaseException:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        result.elapsed = time.perf_counter() - start
+        STAGE_LATENCY.labels(stage).observe(result.elapsed)
+
+
+def timed(stage: str) -> Callable:
+    """
+    Decorator variant of :func:`span`.
+
+    Args:
+        stage: Stage label to record the call under
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    Returns:
+        Tuple of (payload, content type)
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Collected from the value files of all worker processes
+        combined = CollectorRegistry()
+        multiprocess.MultiProcessCollector(combined)
+        return generate_latest(combined), CONTENT_TYPE_LATEST
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def stage_summary() -> Dict[str, Dict[str, float]]:
+    """
+    Summarize the recorded stage timings of this process.
+
+    Returns:
+        Mapping of stage -> {"count", "total_seconds", "avg_seconds"}
+    """
+    summary: Dict[str, Dict[str, float]] = {}
+    for metric in STAGE_LATENCY.collect():
+        for sample in metric.samples:
+            stage = sample.labels.get("stage")
+            if sample.name.endswith("_count"):
+                summary.setdefault(stage, {})["count"] = sample.value
+            elif sample.name.endswith("_sum"):
+                summary.setdefault(stage, {})["total_seconds"] = sample.value
+    for values in summary.values():
+        count = values.get("count", 0)
+        values["avg_seconds"] = values.get("total_seconds", 0.0) / count if count else 0.0
+    return summary
+
+
+def print_stage_summary() -> None:
+    """Print the recorded stage timings, used by the CLI scripts."""
+    summary = stage_summary()
+    if not summary:
+        return
+    print("\n⏱️ Stage timings:")
+    for stage, values in sorted(summary.items()):
+        print(
+            f"  - {stage}: {int(values['count'])}x, "
+            f"total {values['total_seconds']:.3f}s, avg {values['avg_seconds']:.3f}s"
+        )
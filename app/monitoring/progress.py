@@ -0,0 +1,269 @@
+"""
+Push-based pipeline progress.
+
+Stages report progress through :func:`stage_progress`. Events are published to
+a :class:`ProgressBroker` under the pipeline bound to the current context and
+fanned out to any number of subscribers (the SSE endpoint), each with a bounded
+buffer that drops its oldest events when the client falls behind. Outside a
+bound pipeline, e.g. in the scripts, reporting only counts and publishes
+nothing.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+
+class ProgressConfig:
+    """Configuration for progress events."""
+
+    # Events buffered per subscriber before the oldest are dropped
+    BUFFER_SIZE = int(os.getenv("PROGRESS_BUFFER_SIZE", "64"))
+
+    # Minimum seconds between two progress events of a stage
+    MIN_INTERVAL = float(os.getenv("PROGRESS_MIN_INTERVAL", "0.5"))
+
+
+_current_pipeline: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_pipeline", default=None
+)
+
+
+class Subscription:
+    """Bounded event buffer of one subscriber, filled from any thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, buffer_size: int):
+        self._loop = loop
+        self._events: deque = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+        self.dropped = 0
+
+    def push(self, event: Dict[str, Any]) -> None:
+        """
+        Buffer an event and wake up the consumer.
+
+        Args:
+            event: Progress event
+        """
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # The consumer's event loop is gone; nothing left to wake up
+            pass
+
+    async def get(self, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait for buffered events.
+
+        Args:
+            timeout: Seconds to wait before returning empty-handed
+
+        Returns:
+            All buffered events, oldest first; empty on timeout
+        """
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        with self._lock:
+            self._wakeup.clear()
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+
+class ProgressBroker:
+    """Fans out progress events of pipelines to their subscribers."""
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        self.buffer_size = buffer_size or ProgressConfig.BUFFER_SIZE
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, pipeline: str, event: Dict[str, Any]) -> None:
+        """
+        Publish an event to all subscribers of a pipeline.
+
+        Args:
+            pipeline: Pipeline (collection) name
+            event: Event fields
+        """
+        event = {**event, "pipeline": pipeline, "timestamp": datetime.now().isoformat()}
+        with self._lock:
+            self._latest[pipeline] = event
+            subscribers = list(self._subscribers.get(pipeline, ()))
+        for subscription in subscribers:
+            subscription.push(event)
+
+    def subscribe(self, pipeline: str) -> Subscription:
+        """
+        Subscribe to a pipeline from within a running event loop.
+
+        The latest event is replayed so late subscribers see the current state.
+
+        Args:
+            pipeline: Pipeline (collection) name
+
+        Returns:
+            Subscription to read events from
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._subscribers.setdefault(pipeline, set()).add(subscription)
+            latest = self._latest.get(pipeline)
+        if latest is not None:
+            subscription.push(latest)
+        return subscription
+
+    def unsubscribe(self, pipeline: str, subscription: Subscription) -> None:
+        """
+        Remove a subscription.
+
+        Args:
+            pipeline: Pipeline (collection) name
+            subscription: Subscription returned by :meth:`subscribe`
+        """
+        with self._lock:
+            subscribers = self._subscribers.get(pipeline)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[pipeline]
+
+    def latest(self, pipeline: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest event of a pipeline.
+
+        Args:
+            pipeline: Pipeline (collection) name
+
+        Returns:
+            Latest event, or None
+        """
+        with self._lock:
+            return self._latest.get(pipeline)
+
+
+class StageProgress:
+    """Progress of one stage with throughput and ETA, published at a bounded rate."""
+
+    def __init__(
+        self,
+        broker: ProgressBroker,
+        pipeline: Optional[str],
+        stage: str,
+        total: Optional[int] = None
+    ):
+        self.broker = broker
+        self.pipeline = pipeline
+        self.stage = stage
+        self.total = total
+        self.items = 0
+        self._start = time.perf_counter()
+        self._last_publish = 0.0
+
+    def advance(self, items: int = 1) -> None:
+        """
+        Record processed items.
+
+        Args:
+            items: Number of items processed since the last call
+        """
+        self.items += items
+        now = time.perf_counter()
+        if now - self._last_publish >= ProgressConfig.MIN_INTERVAL:
+            self._publish(now)
+
+    def finish(self) -> None:
+        """Publish the final state of the stage."""
+        self._publish(time.perf_counter(), done=True)
+
+    def _publish(self, now: float, done: bool = False) -> None:
+        if self.pipeline is None:
+            return
+        self._last_publish = now
+        elapsed = now - self._start
+        throughput = self.items / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.items, 0) if self.total is not None else None
+        eta = remaining / throughput if remaining is not None and throughput > 0 else None
+        self.broker.publish(self.pipeline, {
+            "type": "progress",
+            "stage": self.stage,
+            "items": self.items,
+            "total": self.total,
+            "throughput": round(throughput, 2),
+            "eta_seconds": 0.0 if done else (round(eta, 1) if eta is not None else None),
+            "elapsed_seconds": round(elapsed, 2),
+            "stage_done": done,
+        })
+
+
+# Global broker instance
+_default_broker = ProgressBroker()
+
+
+def get_progress_broker() -> ProgressBroker:
+    """
+    Get the progress broker of this process.
+
+    Returns:
+        Shared progress broker
+    """
+    return _default_broker
+
+
+@contextmanager
+def bind_pipeline(pipeline: str) -> Iterator[None]:
+    """
+    Report the progress of stages run in this context under ``pipeline``.
+
+    Args:
+        pipeline: Pipeline (collection) name
+    """
+    token = _current_pipeline.set(pipeline)
+    try:
+        yield
+    finally:
+        _current_pipeline.reset(token)
+
+
+@contextmanager
+def stage_progress(stage: str, total: Optional[int] = None) -> Iterator[StageProgress]:
+    """
+    Track the progress of a stage of the pipeline bound to this context.
+
+    Args:
+        stage: Stage name, e.g. "collect", "encode" or "upload"
+        total: Expected number of items, if known
+
+    Yields:
+        Stage progress to ``advance``; published as finished on exit
+    """
+    progress = StageProgress(_default_broker, _current_pipeline.get(), stage, total)
+    yield progress
+    progress.finish()
+
+
+def publish_status(pipeline: str, status: str, message: str, done: bool = False) -> None:
+    """
+    Publish a status change of a pipeline.
+
+    Args:
+        pipeline: Pipeline (collection) name
+        status: Status such as "collecting_data" or "completed"
+        message: Human-readable message
+        done: Whether the pipeline has ended; subscribers close their stream
+    """
+    _default_broker.publish(pipeline, {"type": "status", "status": status, "message": message, "done": done})
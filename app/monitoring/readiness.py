@@ -0,0 +1,82 @@
+"""
+Readiness of the serving process.
+
+A worker is ready once its encoders are warmed up; until then (or if the
+warm-up failed) ``/ready`` answers 503 so load balancers keep traffic away.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from app.embedding.backends import warm_up_encoders
+
+
+class Readiness:
+    """Warm-up state of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {"status": "starting"}
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._state["status"] == "ready"
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the readiness state.
+
+        Returns:
+            Status ("starting", "warming_up", "ready" or "failed") with details
+        """
+        with self._lock:
+            return dict(self._state)
+
+    def _set(self, **state: Any) -> None:
+        with self._lock:
+            self._state = {**state, "timestamp": datetime.now().isoformat()}
+
+    def warm_up(self) -> bool:
+        """
+        Warm up the encoders of this process and record the outcome.
+
+        Returns:
+            True if the process is ready
+        """
+        self._set(status="warming_up")
+        started = time.perf_counter()
+        try:
+            warm_up_encoders()
+        except Exception as e:
+            print(f"❌ Warm-up fehlgeschlagen: {str(e)}")
+            self._set(status="failed", message=str(e))
+            return False
+        self._set(status="ready", warm_up_seconds=round(time.perf_counter() - started, 3))
+        return True
+
+    async def warm_up_async(self) -> bool:
+        """
+        Warm up in the default executor so the event loop keeps serving ``/ready``.
+
+        Returns:
+            True if the process is ready
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.warm_up)
+
+
+# Global readiness instance
+_default_readiness = Readiness()
+
+
+def get_readiness() -> Readiness:
+    """
+    Get the readiness state of this process.
+
+    Returns:
+        Shared readiness state
+    """
+    return _default_readiness
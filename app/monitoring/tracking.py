@@ -0,0 +1,262 @@
+"""
+Background MLflow tracking that never blocks the ingestion pipeline.
+
+Calls on a :class:`TrackingRun` only enqueue events. A daemon thread drains
+the queue and sends params, metrics and tags to the tracking server with
+``log_batch``. If the queue is full or the server is slow or down, events are
+dropped and counted instead of slowing ingestion.
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.monitoring.metrics import TRACKING_EVENTS_DROPPED
+
+# MLflow limits per log_batch call
+_MAX_PARAMS_PER_BATCH = 100
+_MAX_METRICS_PER_BATCH = 1000
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """
+    Compute the SHA-256 content hash of a file in chunks.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TrackingRun:
+    """Handle for one tracked run; every method only enqueues an event."""
+
+    def __init__(self, tracker: "BackgroundTracker", run_key: str):
+        self._tracker = tracker
+        self.run_key = run_key
+
+    def log_params(self, params: Dict[str, Any]) -> None:
+        self._tracker._enqueue(("params", self.run_key, dict(params)))
+
+    def log_metrics(self, metrics: Dict[str, float], step: int = 0) -> None:
+        timestamp = int(time.time() * 1000)
+        self._tracker._enqueue(("metrics", self.run_key, (dict(metrics), timestamp, step)))
+
+    def log_artifact_ref(self, name: str, path: str) -> None:
+        """
+        Record an artifact by location and content hash instead of copying it.
+
+        The hash is computed on the tracking thread, not by the caller.
+
+        Args:
+            name: Logical artifact name (e.g. "csv", "embeddings")
+            path: Local path of the artifact
+        """
+        self._tracker._enqueue(("artifact_ref", self.run_key, (name, str(path))))
+
+    def end(self, status: str = "FINISHED") -> None:
+        self._tracker._enqueue(("end", self.run_key, status))
+
+
+class BackgroundTracker:
+    """Queue-backed MLflow logger running on a daemon thread."""
+
+    def __init__(
+        self,
+        experiment_name: Optional[str] = None,
+        max_queue_size: int = 10000,
+        flush_interval: float = 2.0,
+    ):
+        self.experiment_name = experiment_name or os.getenv("MLFLOW_EXPERIMENT_NAME", "Default")
+        self.enabled = os.getenv("MLFLOW_TRACKING_DISABLED", "").lower() not in ("1", "true", "yes")
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._client = None
+        self._experiment_id: Optional[str] = None
+        self._run_ids: Dict[str, Optional[str]] = {}
+
+    def start_run(self, run_name: str) -> TrackingRun:
+        """
+        Start a run without waiting for the tracking server.
+
+        Args:
+            run_name: Display name of the run
+
+        Returns:
+            Handle used to log params, metrics and artifact references
+        """
+        run_key = uuid.uuid4().hex
+        self._enqueue(("start", run_key, run_name))
+        return TrackingRun(self, run_key)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until all queued events were processed (used by tests and scripts).
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if the queue was drained in time
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self._queue.unfinished_tasks
+
+    def _enqueue(self, event: tuple) -> None:
+        if not self.enabled:
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            TRACKING_EVENTS_DROPPED.inc()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="mlflow-tracker", daemon=True
+                )
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            events = [self._queue.get()]
+            # Give producers a moment to add more events to the same batch
+            deadline = time.monotonic() + self.flush_interval
+            while len(events) < _MAX_METRICS_PER_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    events.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                if events[-1][0] == "end":
+                    break
+            try:
+                self._process(events)
+            except Exception as e:
+                TRACKING_EVENTS_DROPPED.inc(len(events))
+                print(f"⚠️ MLflow tracking failed, {len(events)} events dropped: {str(e)}")
+            finally:
+                for _ in events:
+                    self._queue.task_done()
+
+    def _get_client(self):
+        if self._client is None:
+            from mlflow.tracking import MlflowClient
+
+            client = MlflowClient()
+            experiment = client.get_experiment_by_name(self.experiment_name)
+            if experiment is None:
+                self._experiment_id = client.create_experiment(self.experiment_name)
+            else:
+                self._experiment_id = experiment.experiment_id
+            self._client = client
+        return self._client
+
+    def _process(self, events: List[tuple]) -> None:
+        from mlflow.entities import Metric, Param, RunTag
+
+        client = self._get_client()
+        params: Dict[str, List] = {}
+        metrics: Dict[str, List] = {}
+        tags: Dict[str, List] = {}
+        ends: Dict[str, str] = {}
+
+        for kind, run_key, data in events:
+            if kind == "start":
+                run = client.create_run(self._experiment_id, run_name=data)
+                self._run_ids[run_key] = run.info.run_id
+            elif kind == "params":
+                params.setdefault(run_key, []).extend(
+                    Param(key, str(value)) for key, value in data.items()
+                )
+            elif kind == "metrics":
+                values, timestamp, step = data
+                metrics.setdefault(run_key, []).extend(
+                    Metric(key, float(value), timestamp, step) for key, value in values.items()
+                )
+            elif kind == "artifact_ref":
+                name, path = data
+                run_tags = tags.setdefault(run_key, [])
+                run_tags.append(RunTag(f"artifact.{name}.path", path))
+                if os.path.exists(path):
+                    run_tags.append(RunTag(f"artifact.{name}.sha256", file_sha256(path)))
+                    run_tags.append(RunTag(f"artifact.{name}.bytes", str(Path(path).stat().st_size)))
+            elif kind == "end":
+                ends[run_key] = data
+
+        for run_key in set(params) | set(metrics) | set(tags):
+            run_id = self._run_ids.get(run_key)
+            if run_id is None:
+                continue
+            run_params = params.get(run_key, [])
+            run_metrics = metrics.get(run_key, [])
+            run_tags = tags.get(run_key, [])
+            while run_params or run_metrics or run_tags:
+                client.log_batch(
+                    run_id,
+                    metrics=run_metrics[:_MAX_METRICS_PER_BATCH],
+                    params=run_params[:_MAX_PARAMS_PER_BATCH],
+                    tags=run_tags[:_MAX_PARAMS_PER_BATCH],
+                )
+                run_metrics = run_metrics[_MAX_METRICS_PER_BATCH:]
+                run_params = run_params[_MAX_PARAMS_PER_BATCH:]
+                run_tags = run_tags[_MAX_PARAMS_PER_BATCH:]
+
+        for run_key, status in ends.items():
+            run_id = self._run_ids.pop(run_key, None)
+            if run_id is not None:
+                client.set_terminated(run_id, status=status)
+
+
+# Global tracker instance
+_default_tracker = BackgroundTracker()
+
+
+def start_run(run_name: str) -> TrackingRun:
+    """
+    Convenience function to start a run on the default tracker.
+
+    Args:
+        run_name: Display name of the run
+
+    Returns:
+        Handle used to log params, metrics and artifact references
+    """
+    return _default_tracker.start_run(run_name)
+
+
+def flush(timeout: float = 10.0) -> bool:
+    """
+    Convenience function to drain the default tracker's queue.
+
+    Args:
+        timeout: Maximum number of seconds to wait
+
+    Returns:
+        True if the queue was drained in time
+    """
+    return _default_tracker.flush(timeout)
@@ -2,28 +2,227 @@
 RAG query engine for searching similar posts and retrieving context.
 """
 
-from qdrant_client import QdrantClient
+from concurrent.futures import ThreadPoolExecutor
 from qdrant_client.http.models import Filter, FieldCondition, MatchValue
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict
+from typing import List, Dict, Any, Optional, Tuple
+import os
 
-from app.embedding.embed_posts import EMBEDDING_MODEL
-from app.llm.generator import generate_answer_from_context
+from app.embedding.backends import DEFAULT_EMBEDDING_MODEL, load_encoder
+from app.embedding.reduction import Projection, PROJECTIONS_FOLDER
+# Aliased: the module's convenience functions below reuse these names
+from app.llm.generator import (
+    generate_answer_from_context as generate_answer,
+    generate_comparison_from_context as generate_comparison,
+)
+from app.monitoring.metrics import span
+from app.rag.rerank import mmr_select
+from app.vector_store.connection import QdrantSettings, SharedQdrantClient, get_qdrant_client
+from app.vector_store.profiles import select_profile
+from app.vector_store.registry import get_collection_info
+
+
+# How chunk hits of the same post are combined into a post score: "max" or "sum"
+CHUNK_AGGREGATION = os.getenv("CHUNK_AGGREGATION", "max")
+
+# Chunk hits fetched per requested post, so merging still yields top_k posts
+CHUNK_OVERFETCH = int(os.getenv("CHUNK_OVERFETCH", "4"))
+
+# Default relevance/diversity mix of MMR re-ranking (1.0 = relevance only); empty disables it
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA")) if os.getenv("MMR_LAMBDA") else None
+
+# Posts considered by MMR per requested post
+MMR_CANDIDATE_FACTOR = int(os.getenv("MMR_CANDIDATE_FACTOR", "4"))
+
+# Collections searched at the same time by a comparison
+COMPARE_MAX_WORKERS = int(os.getenv("COMPARE_MAX_WORKERS", "8"))
+
+
+# Payload fields of comment points that do not describe the parent post
+_COMMENT_FIELDS = (
+    "doc_type", "comment_id", "comment_score", "comment_created_utc", "comment_sentiment", "selftext",
+)
+
+
+def merge_chunk_hits(
+    hits: List[Any],
+    top_k: int,
+    aggregation: str = "max",
+    with_vectors: bool = False
+) -> List[Dict]:
+    """
+    Merge scored chunk hits back into posts.
+    
+    The passages of a post that were hit are joined in chunk order and replace
+    its selftext, so the LLM sees the relevant parts of long posts. Hit comments
+    (child documents of the post) are listed under "comments".
+    
+    Args:
+        hits: Scored points with payloads (post_id, chunk_index, selftext, optional comment_id)
+        top_k: Number of posts to return
+        aggregation: "max" (best chunk) or "sum" (all hit chunks) post scoring
+        with_vectors: Add the vector of each post's best hit as "vector" (hits need vectors)
+        
+    Returns:
+        Post payloads ordered by aggregated relevance, with a "relevance" field
+    """
+    posts: Dict[str, Dict] = {}
+    for position, hit in enumerate(hits):
+        payload = hit.payload or {}
+        # Points without post_id (collections from before chunking) stay separate
+        key = str(payload.get("post_id", f"point:{hit.id}"))
+        entry = posts.get(key)
+        if entry is None:
+            # Hits arrive best first, so the first hit of a post is its best one
+            posts[key] = entry = {
+                "payload": payload, "relevance": None, "chunks": {}, "comments": {}, "rank": position,
+                "vector": hit.vector if with_vectors else None,
+            }
+        # Started from the first hit, so negative similarities are not clamped to 0
+        if entry["relevance"] is None:
+            entry["relevance"] = hit.score
+        elif aggregation == "sum":
+            entry["relevance"] += hit.score
+        else:
+            entry["relevance"] = max(entry["relevance"], hit.score)
+        if payload.get("comment_id"):
+            comment = entry["comments"].setdefault(payload["comment_id"], {
+                "comment_id": payload["comment_id"],
+                "score": payload.get("comment_score", 0),
+                "chunks": {},
+            })
+            comment["chunks"].setdefault(payload.get("chunk_index", 0), payload.get("selftext", ""))
+        else:
+            entry["chunks"].setdefault(payload.get("chunk_index", 0), payload.get("selftext", ""))
+
+    ranked = sorted(posts.values(), key=lambda e: (-e["relevance"], e["rank"]))[:top_k]
+    results = []
+    for entry in ranked:
+        post = {k: v for k, v in entry["payload"].items() if k not in _COMMENT_FIELDS}
+        post["selftext"] = " […] ".join(text for _, text in sorted(entry["chunks"].items()) if text)
+        post["comments"] = [
+            {
+                "comment_id": comment["comment_id"],
+                "score": comment["score"],
+                "text": " […] ".join(text for _, text in sorted(comment["chunks"].items()) if text),
+            }
+            for comment in entry["comments"].values()
+        ]
+        post["relevance"] = entry["relevance"]
+        post["matched_chunks"] = len(entry["chunks"]) + sum(len(c["chunks"]) for c in entry["comments"].values())
+        if with_vectors:
+            post["vector"] = entry["vector"]
+        results.append(post)
+    return results
 
 
 class RAGQueryEngine:
     """RAG query engine for stock sentiment analysis."""
     
-    def __init__(self, host: str = "localhost", port: int = 6333):
-        self.qdrant_client = QdrantClient(host=host, port=port)
-        self.embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+    def __init__(self, client: Optional[SharedQdrantClient] = None):
+        self.qdrant_client = client or get_qdrant_client()
+        self.embedding_model = load_encoder(DEFAULT_EMBEDDING_MODEL)
+        self.chunk_aggregation = CHUNK_AGGREGATION
+        self._projections: Dict[str, tuple] = {}
+
+    def get_projection(self, collection_name: str) -> Optional[Projection]:
+        """
+        Get the projection a collection's vectors were reduced with.
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            Projection, or None if the collection stores full-dimension vectors
+        """
+        info = get_collection_info(collection_name) or {}
+        reduction = info.get("reduction")
+        if not reduction:
+            self._projections.pop(collection_name, None)
+            return None
+
+        path = PROJECTIONS_FOLDER / reduction["file"]
+        mtime = os.path.getmtime(path)
+        cached = self._projections.get(collection_name)
+        if cached is None or cached[0] != (path, mtime):
+            cached = ((path, mtime), Projection.load(path))
+            self._projections[collection_name] = cached
+        return cached[1]
     
+    def encode_query(self, query: str) -> np.ndarray:
+        """
+        Encode a query with the embedding model.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Full-dimension query embedding
+        """
+        with span("encode_query"):
+            return np.asarray(self.embedding_model.encode(query))
+
+    def search_by_vector(
+        self,
+        embedding: np.ndarray,
+        collection_name: str,
+        top_k: int = 5,
+        mmr_lambda: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Search a collection with an already encoded query.
+        
+        With MMR, ``MMR_CANDIDATE_FACTOR * top_k`` candidate posts are fetched
+        with their vectors and re-ranked for diversity.
+        
+        Args:
+            embedding: Full-dimension query embedding from :meth:`encode_query`
+            collection_name: Name of the collection to search in
+            top_k: Number of similar posts to return
+            mmr_lambda: Relevance/diversity mix of MMR re-ranking, MMR_LAMBDA if None;
+                1.0 skips re-ranking
+            
+        Returns:
+            List of similar posts with payloads, chunk hits merged per post
+        """
+        mmr_lambda = MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+        rerank = mmr_lambda is not None and mmr_lambda < 1.0
+        candidates = top_k * MMR_CANDIDATE_FACTOR if rerank else top_k
+
+        # Reduced collections need the query projected the same way
+        projection = self.get_projection(collection_name)
+        if projection is not None:
+            embedding = projection.transform(embedding)
+        embedding = embedding.tolist()
+
+        # Search for similar entries in Qdrant with the collection's hnsw_ef
+        info = get_collection_info(collection_name) or {}
+        profile = select_profile(info.get("num_points"), info.get("profile"))
+        with span("search"):
+            search_result = self.qdrant_client.query_points(
+                collection_name=collection_name,
+                query=embedding,
+                limit=candidates * CHUNK_OVERFETCH,
+                search_params=profile.search_params(),
+                with_vectors=rerank,
+                timeout=QdrantSettings.SEARCH_TIMEOUT
+            )
+
+        posts = merge_chunk_hits(search_result.points, candidates, self.chunk_aggregation, with_vectors=rerank)
+        if not rerank:
+            return posts
+
+        with span("rerank"):
+            vectors = np.asarray([post.pop("vector") for post in posts], dtype=np.float32)
+            order = mmr_select(np.asarray(embedding, dtype=np.float32), vectors, top_k, mmr_lambda)
+        return [posts[i] for i in order]
+
     def search_similar_posts(
         self, 
         query: str, 
         collection_name: str = "tesla_2025q2", 
-        top_k: int = 5
+        top_k: int = 5,
+        mmr_lambda: Optional[float] = None
     ) -> List[Dict]:
         """
         Search for similar posts in the vector store.
@@ -32,21 +231,38 @@ class RAGQueryEngine:
             query: Search query
             collection_name: Name of the collection to search in
             top_k: Number of similar posts to return
+            mmr_lambda: Relevance/diversity mix of MMR re-ranking, MMR_LAMBDA if None
             
         Returns:
-            List of similar posts with payloads
+            List of similar posts with payloads, chunk hits merged per post
         """
-        # Convert query to embedding
-        embedding = self.embedding_model.encode(query).tolist()
+        return self.search_by_vector(self.encode_query(query), collection_name, top_k, mmr_lambda)
 
-        # Search for similar entries in Qdrant
-        search_result = self.qdrant_client.query_points(
-            collection_name=collection_name,
-            query=embedding,
-            limit=top_k
-        )
+    def search_collections(
+        self,
+        query: str,
+        collection_names: List[str],
+        top_k: int = 5
+    ) -> Dict[str, List[Dict]]:
+        """
+        Search several collections with one query, encoded once and searched concurrently.
+        
+        Args:
+            query: Search query
+            collection_names: Names of the collections to search in
+            top_k: Number of similar posts to return per collection
+            
+        Returns:
+            Similar posts per collection name
+        """
+        embedding = self.encode_query(query)
+        if len(collection_names) <= 1:
+            return {name: self.search_by_vector(embedding, name, top_k) for name in collection_names}
 
-        return [hit.payload for hit in search_result.points]
+        workers = min(len(collection_names), COMPARE_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compare") as executor:
+            results = executor.map(lambda name: self.search_by_vector(embedding, name, top_k), collection_names)
+            return dict(zip(collection_names, results))
     
     def generate_answer_from_context(
         self, 
@@ -63,7 +279,24 @@ class RAGQueryEngine:
         Returns:
             Generated answer
         """
-        return generate_answer_from_context(query, context_posts)
+        return generate_answer(query, context_posts)
+
+    def generate_comparison_from_context(
+        self,
+        query: str,
+        contexts: Dict[str, List[Dict]]
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Generate one comparative answer using per-ticker context posts.
+        
+        Args:
+            query: User's question
+            contexts: Relevant context posts per ticker symbol
+            
+        Returns:
+            Tuple of (answer, number of posts used per ticker)
+        """
+        return generate_comparison(query, contexts)
 
 
 # Global query engine instance
@@ -73,7 +306,8 @@ _default_engine = RAGQueryEngine()
 def search_similar_posts(
     query: str, 
     collection_name: str = "tesla_2025q2", 
-    top_k: int = 5
+    top_k: int = 5,
+    mmr_lambda: Optional[float] = None
 ) -> List[Dict]:
     """
     Convenience function to search similar posts using the default engine.
@@ -82,11 +316,12 @@ def search_similar_posts(
         query: Search query
         collection_name: Name of the collection to search in
         top_k: Number of similar posts to return
+        mmr_lambda: Relevance/diversity mix of MMR re-ranking, MMR_LAMBDA if None
         
     Returns:
         List of similar posts with payloads
     """
-    return _default_engine.search_similar_posts(query, collection_name, top_k)
+    return _default_engine.search_similar_posts(query, collection_name, top_k, mmr_lambda)
 
 
 def generate_answer_from_context(query: str, context_posts: List[Dict]) -> str:
@@ -101,3 +336,32 @@ def generate_answer_from_context(query: str, context_posts: List[Dict]) -> str:
         Generated answer
     """
     return _default_engine.generate_answer_from_context(query, context_posts)
+
+
+def search_collections(query: str, collection_names: List[str], top_k: int = 5) -> Dict[str, List[Dict]]:
+    """
+    Convenience function to search several collections using the default engine.
+    
+    Args:
+        query: Search query
+        collection_names: Names of the collections to search in
+        top_k: Number of similar posts to return per collection
+        
+    Returns:
+        Similar posts per collection name
+    """
+    return _default_engine.search_collections(query, collection_names, top_k)
+
+
+def generate_comparison_from_context(query: str, contexts: Dict[str, List[Dict]]) -> Tuple[str, Dict[str, int]]:
+    """
+    Convenience function to generate comparative answers using the default engine.
+    
+    Args:
+        query: User's question
+        contexts: Relevant context posts per ticker symbol
+        
+    Returns:
+        Tuple of (answer, number of posts used per ticker)
+    """
+    return _default_engine.generate_comparison_from_context(query, contexts)
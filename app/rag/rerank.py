@@ -0,0 +1,60 @@
+"""
+Maximal marginal relevance (MMR) re-ranking of retrieved posts.
+
+Hot tickers often return several paraphrases of the same take as top hits.
+MMR picks posts one at a time, trading relevance to the query against
+similarity to the posts already picked, so the context covers more distinct
+views. All similarities come from two matrix products; each pick is one
+vectorized update of the per-candidate redundancy.
+"""
+
+from typing import List
+
+import numpy as np
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.clip(np.linalg.norm(x, axis=-1, keepdims=True), 1e-12, None)
+
+
+def mmr_select(
+    query_vector: np.ndarray,
+    candidate_vectors: np.ndarray,
+    top_k: int,
+    mmr_lambda: float = 0.5
+) -> List[int]:
+    """
+    Select diverse, relevant candidates by maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    ``lambda * sim(query, c) - (1 - lambda) * max(sim(c, s) for s in selected)``.
+
+    Args:
+        query_vector: Query embedding, shape (dim,)
+        candidate_vectors: Candidate embeddings, shape (n, dim)
+        top_k: Number of candidates to select
+        mmr_lambda: 1.0 ranks by relevance only, 0.0 by diversity only
+
+    Returns:
+        Indices of the selected candidates in selection order
+    """
+    n = len(candidate_vectors)
+    if n == 0 or top_k <= 0:
+        return []
+
+    vectors = _normalize(np.asarray(candidate_vectors, dtype=np.float32))
+    relevance = vectors @ _normalize(np.asarray(query_vector, dtype=np.float32))
+    similarity = vectors @ vectors.T
+
+    relevance_term = mmr_lambda * relevance
+    redundancy = np.zeros(n, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected = []
+    for _ in range(min(top_k, n)):
+        scores = np.where(available, relevance_term - (1.0 - mmr_lambda) * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        # Redundancy of a candidate is its highest similarity to any selected one
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return selected
@@ -0,0 +1,284 @@
+"""
+Precomputed answers to canonical questions per collection.
+
+Once a collection is complete, a low-priority background worker runs a
+configurable list of common questions ("overall sentiment?", "main risks?")
+through retrieval and the LLM and stores the answers next to the collection.
+``/api/query`` serves them without any search or LLM call.
+
+Stored answers carry the collection's content version from the registry: the
+SHA-256 of its embedding matrix plus the time of the last in-place payload
+update. Ingesting or appending posts, folding in reposts and refreshing scores
+change the version, so outdated answers are no longer served (and refreshed by
+the next warm-up), also in other processes.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from app.monitoring.metrics import span
+from app.vector_store.registry import get_collection_info
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
+ANSWERS_FOLDER = ROOT_FOLDER / "data" / "processed" / "answers"
+
+DEFAULT_QUESTIONS = (
+    "Wie ist die allgemeine Stimmung zu {symbol}?"
+    "|Was sind die wichtigsten bullishen Argumente für {symbol}?"
+    "|Was sind die größten Risiken für {symbol}?"
+)
+
+
+class WarmupConfig:
+    """Configuration for the post-ingest warm-up."""
+
+    # Warm up every completed collection
+    ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # "|"-separated questions; "{symbol}" is replaced by the ticker symbol
+    QUESTIONS = [q.strip() for q in os.getenv("WARMUP_QUESTIONS", DEFAULT_QUESTIONS).split("|") if q.strip()]
+
+    # Context posts per question; /api/query serves an answer only for the same top_k
+    TOP_K = int(os.getenv("WARMUP_TOP_K", "5"))
+
+    # Nice value of the warm-up thread (Linux), so queries and ingestion go first
+    NICENESS = int(os.getenv("WARMUP_NICENESS", "10"))
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question for matching against precomputed answers.
+
+    Args:
+        question: Question as asked
+
+    Returns:
+        Case-folded question with collapsed whitespace and without trailing punctuation
+    """
+    return " ".join(question.casefold().split()).rstrip(" ?!.")
+
+
+def collection_version(collection_name: str) -> Optional[str]:
+    """
+    Content version of a collection: the SHA-256 of its embedding matrix and
+    the time reposts were last folded into known posts, if ever.
+
+    Refreshed scores and comment counts do not change the version; re-running
+    every precomputed question for upvote drift would cost LLM calls on almost
+    every refresh of an active ticker.
+
+    Args:
+        collection_name: Name of the collection
+
+    Returns:
+        Version string, or None if the collection is not registered
+    """
+    info = get_collection_info(collection_name) or {}
+    version = info.get("npy_sha256")
+    if version and info.get("folded_at"):
+        version = f"{version}@{info['folded_at']}"
+    return version
+
+
+class AnswerStore:
+    """JSON files with the precomputed answers of each collection."""
+
+    def __init__(self, folder: Path = ANSWERS_FOLDER):
+        self.folder = Path(folder)
+        self._lock = threading.Lock()
+
+    def _path(self, collection_name: str) -> Path:
+        return self.folder / f"{collection_name}.json"
+
+    def load(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the stored answers of a collection regardless of their version.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Stored document with "version" and "answers", or None
+        """
+        path = self._path(collection_name)
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def get(self, collection_name: str, question: str, top_k: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the precomputed answer to a question if it is still current.
+
+        Args:
+            collection_name: Name of the collection
+            question: Question as asked
+            top_k: Requested number of context posts
+
+        Returns:
+            Stored answer entry, or None
+        """
+        stored = self.load(collection_name)
+        if stored is None or stored.get("version") != collection_version(collection_name):
+            return None
+        entry = stored["answers"].get(normalize_question(question))
+        if entry is None or entry["top_k"] != top_k:
+            return None
+        return entry
+
+    def put(self, collection_name: str, version: Optional[str], entries: List[Dict[str, Any]]) -> None:
+        """
+        Replace the stored answers of a collection.
+
+        Args:
+            collection_name: Name of the collection
+            version: Content version the answers were computed on
+            entries: Answer entries with "question"
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        document = {
+            "collection_name": collection_name,
+            "version": version,
+            "answers": {normalize_question(e["question"]): e for e in entries},
+        }
+        path = self._path(collection_name)
+        tmp_path = path.with_suffix(".json.tmp")
+        with self._lock:
+            with open(tmp_path, "w") as f:
+                json.dump(document, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+
+def _lower_priority() -> None:
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), WarmupConfig.NICENESS)
+    except (AttributeError, OSError):
+        # Not supported on this platform; the single worker still limits the load
+        pass
+
+
+class AnswerWarmer:
+    """Precomputes answers to the canonical questions on one low-priority worker."""
+
+    def __init__(
+        self,
+        store: Optional[AnswerStore] = None,
+        questions: Optional[List[str]] = None,
+        top_k: Optional[int] = None
+    ):
+        self.store = store or AnswerStore()
+        self.questions = questions or WarmupConfig.QUESTIONS
+        self.top_k = top_k or WarmupConfig.TOP_K
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="warmup", initializer=_lower_priority
+        )
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+
+    def schedule(self, collection_name: str, symbol: str) -> bool:
+        """
+        Queue the warm-up of a collection.
+
+        Args:
+            collection_name: Name of the completed collection
+            symbol: Ticker symbol inserted into the questions
+
+        Returns:
+            False if warm-up is disabled or the collection is already queued
+        """
+        if not WarmupConfig.ENABLED or not self.questions:
+            return False
+        with self._lock:
+            if collection_name in self._pending:
+                return False
+            self._pending.add(collection_name)
+        self._executor.submit(self._run, collection_name, symbol)
+        return True
+
+    def _run(self, collection_name: str, symbol: str) -> None:
+        with self._lock:
+            self._pending.discard(collection_name)
+        try:
+            self.warm(collection_name, symbol)
+        except Exception as e:
+            print(f"⚠️ Warm-up von {collection_name} fehlgeschlagen: {str(e)}")
+
+    def warm(self, collection_name: str, symbol: str) -> int:
+        """
+        Answer the canonical questions for a collection and store the answers.
+
+        Answers are discarded if the collection changed meanwhile.
+
+        Args:
+            collection_name: Name of the collection
+            symbol: Ticker symbol inserted into the questions
+
+        Returns:
+            Number of stored answers
+        """
+        # Imported here so the store can be used without loading the embedding model
+        from app.rag.query_engine import search_similar_posts, generate_answer_from_context
+
+        version = collection_version(collection_name)
+        entries = []
+        for template in self.questions:
+            question = template.replace("{symbol}", symbol.upper())
+            with span("warmup_question"):
+                context = search_similar_posts(question, collection_name, self.top_k)
+                answer = generate_answer_from_context(question, context)
+            entries.append({
+                "question": question,
+                "answer": answer,
+                "top_k": self.top_k,
+                "context_posts": len(context),
+                "sources": [
+                    {"post_id": post.get("post_id"), "title": post.get("title"), "relevance": post.get("relevance")}
+                    for post in context
+                ],
+                "computed_at": datetime.now().isoformat(),
+            })
+
+        if collection_version(collection_name) != version:
+            print(f"⚠️ {collection_name} wurde während des Warm-ups aktualisiert, Antworten verworfen")
+            return 0
+        self.store.put(collection_name, version, entries)
+        print(f"🔥 {len(entries)} Antworten für {collection_name} vorberechnet")
+        return len(entries)
+
+
+# Global warmer instance
+_default_warmer = AnswerWarmer()
+
+
+def schedule_warmup(collection_name: str, symbol: str) -> bool:
+    """
+    Convenience function to queue a warm-up with the default warmer.
+
+    Args:
+        collection_name: Name of the completed collection
+        symbol: Ticker symbol inserted into the questions
+
+    Returns:
+        False if warm-up is disabled or the collection is already queued
+    """
+    return _default_warmer.schedule(collection_name, symbol)
+
+
+def get_precomputed_answer(collection_name: str, question: str, top_k: int) -> Optional[Dict[str, Any]]:
+    """
+    Convenience function to look up a current precomputed answer.
+
+    Args:
+        collection_name: Name of the collection
+        question: Question as asked
+        top_k: Requested number of context posts
+
+    Returns:
+        Stored answer entry, or None
+    """
+    return _default_warmer.store.get(collection_name, question, top_k)
@@ -0,0 +1,7 @@
+"""
+Scheduler module for incremental refreshes of watched tickers.
+"""
+
+from .refresh import RefreshScheduler, WatchedTicker, get_scheduler, live_collection_name
+
+__all__ = ["RefreshScheduler", "WatchedTicker", "get_scheduler", "live_collection_name"]
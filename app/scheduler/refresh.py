@@ -0,0 +1,448 @@
+"""
+Scheduled incremental refresh of watched tickers.
+
+Every watched ticker has one live collection (``<symbol>_live``). A refresh
+fetches only posts newer than the collection's watermark, the newest
+``created_utc`` up to which all posts are ingested, which is kept in the
+collection registry. If ``REFRESH_FETCH_LIMIT`` cuts a cycle short, the next
+cycles page further back from the oldest fetched post until the watermark is
+reached, and only then move it. Only new posts are embedded and appended;
+scores and comment counts of recent posts are refreshed in place. Due tickers
+run on a worker pool whose size caps the number of concurrent refreshes.
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import pandas as pd
+
+from app.data.reddit_client import POSTS_FOLDER, fetch_post_stats, processed_posts_path, search_new_posts
+from app.embedding.embed_posts import append_posts
+from app.monitoring.metrics import span
+from app.monitoring.progress import bind_pipeline
+from app.rag.warmup import collection_version, schedule_warmup
+from app.vector_store.client import update_post_fields
+from app.vector_store.registry import get_collection_info, update_collection_info
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
+
+
+class RefreshConfig:
+    """Configuration for scheduled ticker refreshes."""
+
+    # Start the scheduler with the API
+    ENABLED = os.getenv("REFRESH_ENABLED", "false").lower() in ("1", "true", "yes")
+
+    WATCHLIST_PATH = Path(os.getenv("WATCHLIST_PATH", str(ROOT_FOLDER / "data" / "watchlist.json")))
+
+    # Seconds between refreshes of a ticker unless it sets its own interval
+    DEFAULT_INTERVAL = int(os.getenv("REFRESH_INTERVAL_SECONDS", "900"))
+
+    # Refreshes running at the same time across all tickers
+    MAX_CONCURRENCY = int(os.getenv("REFRESH_MAX_CONCURRENCY", "4"))
+
+    # Upper bound of new posts fetched per ticker and cycle
+    FETCH_LIMIT = int(os.getenv("REFRESH_FETCH_LIMIT", "100"))
+
+    # Posts younger than this get their score and comment count refreshed
+    RECENT_HOURS = float(os.getenv("REFRESH_RECENT_HOURS", "48"))
+
+    # Seconds between checks for due tickers
+    TICK_SECONDS = 5.0
+
+
+def live_collection_name(symbol: str) -> str:
+    """
+    Name of the live collection of a ticker.
+
+    Sorts after the timestamped ``<symbol>_<YYYYmmdd_HHMMSS>`` collections, so
+    queries for the ticker use it as the latest collection.
+    """
+    return f"{symbol.lower()}_live"
+
+
+@dataclass
+class WatchedTicker:
+    """A ticker kept current by the scheduler."""
+
+    symbol: str
+    search_query: Optional[str] = None
+    interval_seconds: Optional[int] = None
+
+    @property
+    def collection_name(self) -> str:
+        return live_collection_name(self.symbol)
+
+    @property
+    def query(self) -> str:
+        return self.search_query or f"{self.symbol} stock"
+
+    @property
+    def interval(self) -> int:
+        return self.interval_seconds or RefreshConfig.DEFAULT_INTERVAL
+
+
+class Watchlist:
+    """JSON-file backed list of watched tickers."""
+
+    def __init__(self, path: Path = RefreshConfig.WATCHLIST_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, WatchedTicker]:
+        if not self.path.exists():
+            return {}
+        with open(self.path) as f:
+            return {entry["symbol"]: WatchedTicker(**entry) for entry in json.load(f)}
+
+    def _write(self, tickers: Dict[str, WatchedTicker]) -> None:
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump([asdict(t) for t in tickers.values()], f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def all(self) -> List[WatchedTicker]:
+        """
+        Get all watched tickers.
+
+        Returns:
+            Watched tickers
+        """
+        with self._lock:
+            return list(self._read().values())
+
+    def add(self, ticker: WatchedTicker) -> WatchedTicker:
+        """
+        Add a ticker or replace its settings.
+
+        Args:
+            ticker: Ticker to watch
+
+        Returns:
+            The stored ticker
+        """
+        ticker.symbol = ticker.symbol.upper()
+        with self._lock:
+            tickers = self._read()
+            tickers[ticker.symbol] = ticker
+            self._write(tickers)
+        return ticker
+
+    def remove(self, symbol: str) -> bool:
+        """
+        Stop watching a ticker; its live collection is kept.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            True if the ticker was watched
+        """
+        with self._lock:
+            tickers = self._read()
+            if tickers.pop(symbol.upper(), None) is None:
+                return False
+            self._write(tickers)
+            return True
+
+
+class TickerRefresher:
+    """Appends new posts of a ticker and refreshes counts of recent posts."""
+
+    def refresh(self, ticker: WatchedTicker) -> Dict[str, Any]:
+        """
+        Run one incremental refresh of a ticker.
+
+        Args:
+            ticker: Ticker to refresh
+
+        Returns:
+            Refresh result with the number of appended and updated posts
+        """
+        collection_name = ticker.collection_name
+        info = get_collection_info(collection_name) or {}
+        version = collection_version(collection_name)
+        watermark = float(info.get("watermark_utc", 0.0))
+        # Set while a gap above the watermark is paged through over several cycles
+        backfill_after = info.get("backfill_after")
+        backfill_top = info.get("backfill_top_utc")
+
+        with bind_pipeline(collection_name):
+            with span("refresh_fetch"):
+                batch = search_new_posts(ticker.query, watermark, RefreshConfig.FETCH_LIMIT, backfill_after)
+            posts = batch["posts"]
+            appended = append_posts(collection_name, pd.DataFrame(posts)) if posts else 0
+            with span("refresh_counts"):
+                updated = self.refresh_recent(collection_name)
+
+        # Advanced only after the posts were appended, so a failed cycle is retried
+        if posts and backfill_after is None:
+            backfill_top = max(post["created_utc"] for post in posts)
+        if batch["complete"]:
+            # The gap down to the watermark is closed
+            if backfill_top is not None:
+                watermark = max(watermark, float(backfill_top))
+            backfill_after, backfill_top = None, None
+        else:
+            backfill_after = batch["after"]
+        update_collection_info(
+            collection_name,
+            symbol=ticker.symbol,
+            watermark_utc=watermark,
+            backfill_after=backfill_after,
+            backfill_top_utc=backfill_top,
+            last_refresh=datetime.now().isoformat(),
+        )
+        # New posts and folded reposts outdate the precomputed answers, refreshed counts do not
+        if collection_version(collection_name) != version:
+            schedule_warmup(collection_name, ticker.symbol)
+        return {
+            "symbol": ticker.symbol,
+            "collection_name": collection_name,
+            "status": "completed",
+            "fetched": len(posts),
+            "appended": appended,
+            "updated": updated,
+            "watermark_utc": watermark,
+            "complete": batch["complete"],
+        }
+
+    def refresh_recent(self, collection_name: str) -> int:
+        """
+        Refresh score and comment count of recent posts in the dataset and collection.
+
+        Args:
+            collection_name: Name of the live collection (and dataset)
+
+        Returns:
+            Number of posts whose counts changed
+        """
+        csv_path = processed_posts_path(collection_name)
+        if not csv_path.exists():
+            return 0
+        df = pd.read_csv(csv_path)
+        cutoff = time.time() - RefreshConfig.RECENT_HOURS * 3600
+        recent = df.index[df["created_utc"] >= cutoff]
+        if len(recent) == 0:
+            return 0
+
+        ids = df["id"].astype(str)
+        stats = fetch_post_stats(ids.loc[recent].tolist())
+        updates = {}
+        for i in recent:
+            current = stats.get(ids.loc[i])
+            if current is None:
+                continue
+            if current["score"] == df.loc[i, "score"] and current["num_comments"] == df.loc[i, "num_comments"]:
+                continue
+            fields = {"score": int(current["score"]), "num_comments": int(current["num_comments"])}
+            if "aggregate_score" in df.columns:
+                # The aggregate includes the post's own score; posts stored without
+                # counts have no aggregate yet and start from their own score
+                aggregate = df.loc[i, "aggregate_score"]
+                if pd.isna(aggregate):
+                    aggregate = df.loc[i, "score"]
+                fields["aggregate_score"] = int(aggregate + current["score"] - df.loc[i, "score"])
+            for key, value in fields.items():
+                df.loc[i, key] = value
+            updates[ids.loc[i]] = fields
+
+        if updates:
+            update_post_fields(collection_name, updates)
+            df.to_csv(POSTS_FOLDER / f"{collection_name}.csv", index=False)
+            update_collection_info(collection_name, counts_updated_at=datetime.now().isoformat())
+        return len(updates)
+
+
+class RefreshScheduler:
+    """Runs due ticker refreshes on a bounded worker pool."""
+
+    def __init__(
+        self,
+        watchlist: Optional[Watchlist] = None,
+        refresher: Optional[TickerRefresher] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        self.watchlist = watchlist or Watchlist()
+        self.refresher = refresher or TickerRefresher()
+        self.max_concurrency = max_concurrency or RefreshConfig.MAX_CONCURRENCY
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="refresh")
+        self._lock = threading.Lock()
+        self._running: Set[str] = set()
+        self._next_run: Dict[str, float] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_file = None
+
+    @property
+    def lock_path(self) -> Path:
+        """Lock file next to the watchlist, held by the process running the scheduler."""
+        return self.watchlist.path.with_suffix(".lock")
+
+    def _acquire_lock(self) -> bool:
+        os.makedirs(self.lock_path.parent, exist_ok=True)
+        lock_file = open(self.lock_path, "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def start(self) -> bool:
+        """
+        Start checking for due tickers on a daemon thread.
+
+        Only one process per watchlist runs the scheduler; other API workers
+        or a second refresh script leave it to the process holding the lock.
+
+        Returns:
+            True if this process runs the scheduler
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        if not self._acquire_lock():
+            print(f"⏸️ Refresh-Scheduler läuft bereits in einem anderen Prozess ({self.lock_path})")
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+        print(f"⏰ Refresh-Scheduler gestartet ({len(self.watchlist.all())} Ticker, "
+              f"max. {self.max_concurrency} parallel)")
+        return True
+
+    def stop(self) -> None:
+        """Stop scheduling; running refreshes finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=RefreshConfig.TICK_SECONDS * 2)
+            self._thread = None
+        self._release_lock()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(RefreshConfig.TICK_SECONDS)
+
+    def run_pending(self, force: bool = False) -> int:
+        """
+        Submit refreshes of all due tickers that are not already running.
+
+        Args:
+            force: Submit every watched ticker regardless of its interval
+
+        Returns:
+            Number of submitted refreshes
+        """
+        now = time.time()
+        submitted = 0
+        for ticker in self.watchlist.all():
+            with self._lock:
+                if ticker.symbol in self._running:
+                    continue
+                if not force and self._next_run.get(ticker.symbol, 0.0) > now:
+                    continue
+                self._running.add(ticker.symbol)
+            self._executor.submit(self._run, ticker)
+            submitted += 1
+        return submitted
+
+    def trigger(self, symbol: str) -> bool:
+        """
+        Refresh a watched ticker now.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            False if the ticker is not watched or already refreshing
+        """
+        symbol = symbol.upper()
+        ticker = next((t for t in self.watchlist.all() if t.symbol == symbol), None)
+        if ticker is None:
+            return False
+        with self._lock:
+            if symbol in self._running:
+                return False
+            self._running.add(symbol)
+        self._executor.submit(self._run, ticker)
+        return True
+
+    def run_once(self) -> List[Dict[str, Any]]:
+        """
+        Refresh all watched tickers once and wait for the results.
+
+        Returns:
+            One refresh result per ticker
+        """
+        tickers = self.watchlist.all()
+        with self._lock:
+            self._running.update(t.symbol for t in tickers)
+        return list(self._executor.map(self._run, tickers))
+
+    def _run(self, ticker: WatchedTicker) -> Dict[str, Any]:
+        started = time.time()
+        try:
+            result = self.refresher.refresh(ticker)
+        except Exception as e:
+            print(f"❌ Refresh von {ticker.symbol} fehlgeschlagen: {str(e)}")
+            result = {"symbol": ticker.symbol, "status": "failed", "message": str(e)}
+        result["duration_seconds"] = round(time.time() - started, 2)
+        result["timestamp"] = datetime.now().isoformat()
+        with self._lock:
+            self._results[ticker.symbol] = result
+            self._next_run[ticker.symbol] = time.time() + ticker.interval
+            self._running.discard(ticker.symbol)
+        return result
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        Get the schedule and latest result of every watched ticker.
+
+        Returns:
+            One status entry per watched ticker
+        """
+        entries = []
+        for ticker in self.watchlist.all():
+            with self._lock:
+                next_run = self._next_run.get(ticker.symbol)
+                entries.append({
+                    **asdict(ticker),
+                    "collection_name": ticker.collection_name,
+                    "interval_seconds": ticker.interval,
+                    "running": ticker.symbol in self._running,
+                    "next_run": datetime.fromtimestamp(next_run).isoformat() if next_run else None,
+                    "last_result": self._results.get(ticker.symbol),
+                })
+        return entries
+
+
+# Global scheduler instance
+_default_scheduler = RefreshScheduler()
+
+
+def get_scheduler() -> RefreshScheduler:
+    """
+    Get the refresh scheduler of this process.
+
+    Returns:
+        Shared refresh scheduler
+    """
+    return _default_scheduler
@@ -0,0 +1,8 @@
+"""
+Sentiment module for scoring posts and aggregating stored scores.
+"""
+
+from .scorer import score_posts, score_texts
+from .aggregate import aggregate_sentiment
+
+__all__ = ["score_posts", "score_texts", "aggregate_sentiment"]
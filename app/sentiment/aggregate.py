@@ -0,0 +1,111 @@
+"""
+Sentiment aggregates computed from stored post payloads.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional
+
+
+def _weights(score: pd.Series) -> pd.Series:
+    return 1.0 + np.log1p(score.fillna(0).clip(lower=0).astype("float64"))
+
+
+def _summary(values: pd.Series, weights: pd.Series, count_key: str) -> Dict[str, Any]:
+    return {
+        count_key: int(len(values)),
+        "mean": float(values.mean()) if len(values) else None,
+        "weighted_mean": float(np.average(values, weights=weights)) if len(values) else None,
+        "bullish_share": float((values >= 0.05).mean()) if len(values) else None,
+        "bearish_share": float((values <= -0.05).mean()) if len(values) else None,
+    }
+
+
+def _series(
+    values: pd.Series,
+    weights: pd.Series,
+    created_utc: Optional[pd.Series],
+    bucket: str,
+    count_key: str
+) -> List[Dict[str, Any]]:
+    if created_utc is None or not len(values):
+        return []
+    frame = pd.DataFrame({
+        "sentiment": values,
+        "weighted": values * weights,
+        "weight": weights,
+        "time": pd.to_datetime(created_utc.astype("float64"), unit="s", utc=True),
+    })
+    grouped = frame.groupby(pd.Grouper(key="time", freq=bucket))
+    buckets = grouped.agg(
+        size=("sentiment", "size"),
+        mean=("sentiment", "mean"),
+        weighted=("weighted", "sum"),
+        weight=("weight", "sum"),
+    )
+    buckets = buckets[buckets["size"] > 0]
+    return [
+        {
+            "bucket_start": row.Index.isoformat(),
+            count_key: int(row.size),
+            "mean": float(row.mean),
+            "weighted_mean": float(row.weighted / row.weight),
+        }
+        for row in buckets.itertuples()
+    ]
+
+
+def aggregate_sentiment(payloads: List[Dict[str, Any]], bucket: str = "1D") -> Dict[str, Any]:
+    """
+    Aggregate per-post sentiment scores, and separately the sentiment of comments.
+
+    Posts are weighted by ``1 + log1p(max(score, 0))`` for the score-weighted mean,
+    so a highly upvoted post counts more without drowning out the rest. Comments
+    are weighted the same way by their own score.
+
+    Args:
+        payloads: Point payloads with "sentiment", "score" and "created_utc"; comment
+            points also with "comment_id", "comment_sentiment", "comment_score" and
+            "comment_created_utc"
+        bucket: Pandas offset alias for the time series (e.g. "1h", "1D", "1W")
+
+    Returns:
+        Dictionary with overall aggregates and a time-bucketed series of the posts,
+        and the same for the comments under "comments"
+    """
+    df = pd.DataFrame(payloads)
+    if df.empty or "sentiment" not in df.columns:
+        empty = pd.Series(dtype="float64")
+        result = _summary(empty, empty, "posts")
+        result["bucket"] = bucket
+        result["series"] = []
+        result["comments"] = {**_summary(empty, empty, "comments"), "series": []}
+        return result
+
+    for column in ("comment_id", "comment_sentiment"):
+        if column not in df.columns:
+            df[column] = None
+    is_comment = df["comment_id"].notna()
+    comments = df[is_comment]
+    posts = df[~is_comment]
+
+    # Every chunk point of a post repeats the post's sentiment; count each post once
+    if "post_id" in posts.columns:
+        posts = posts.drop_duplicates(subset="post_id")
+    posts = posts.dropna(subset=["sentiment"])
+    sentiment = posts["sentiment"].astype("float64")
+    weights = _weights(posts.get("score", pd.Series(0, index=posts.index)))
+
+    result = _summary(sentiment, weights, "posts")
+    result["bucket"] = bucket
+    result["series"] = _series(sentiment, weights, posts.get("created_utc"), bucket, "posts")
+
+    # The same holds for the chunks of a comment and its own sentiment
+    comments = comments.drop_duplicates(subset="comment_id").dropna(subset=["comment_sentiment"])
+    comment_sentiment = comments["comment_sentiment"].astype("float64")
+    comment_weights = _weights(comments.get("comment_score", pd.Series(0, index=comments.index)))
+    result["comments"] = _summary(comment_sentiment, comment_weights, "comments")
+    result["comments"]["series"] = _series(
+        comment_sentiment, comment_weights, comments.get("comment_created_utc"), bucket, "comments"
+    )
+    return result
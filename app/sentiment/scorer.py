@@ -0,0 +1,155 @@
+"""
+Lexicon-based sentiment scoring for Reddit posts.
+
+Scoring is vectorized over a whole dataset with pandas string operations, so
+labelling thousands of posts costs a few milliseconds on CPU and no LLM call.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+
+class SentimentConfig:
+    """Configuration for the sentiment lexicon."""
+
+    # Finance / r/wallstreetbets vocabulary, valence in [-3, 3]
+    LEXICON = {
+        # bullish
+        "bull": 2.0, "bullish": 2.5, "buy": 1.5, "buying": 1.5, "bought": 1.0,
+        "long": 1.0, "calls": 1.5, "call": 1.0, "moon": 2.5, "mooning": 2.5,
+        "rocket": 2.0, "🚀": 2.5, "🌙": 2.0, "📈": 2.0, "🐂": 2.0, "💎": 1.5,
+        "undervalued": 2.0, "beat": 1.5, "beats": 1.5, "upgrade": 2.0, "upgraded": 2.0,
+        "growth": 1.5, "strong": 1.5, "rally": 2.0, "rallying": 2.0, "breakout": 2.0,
+        "profit": 1.5, "profits": 1.5, "gain": 1.5, "gains": 1.5, "green": 1.0,
+        "surge": 2.0, "soar": 2.0, "soaring": 2.0, "outperform": 2.0, "tendies": 2.0,
+        "squeeze": 1.5, "hold": 0.5, "hodl": 1.0, "good": 1.5, "great": 2.0,
+        "excellent": 2.5, "love": 1.5, "positive": 1.5, "optimistic": 2.0, "win": 1.5,
+        "record": 1.0, "up": 0.5, "higher": 1.0, "recovery": 1.5, "opportunity": 1.0,
+        # bearish
+        "bear": -2.0, "bearish": -2.5, "sell": -1.5, "selling": -1.5, "sold": -1.0,
+        "short": -1.5, "shorting": -1.5, "puts": -1.5, "put": -1.0, "crash": -3.0,
+        "crashing": -3.0, "dump": -2.5, "dumping": -2.5, "📉": -2.0, "🐻": -2.0,
+        "overvalued": -2.0, "miss": -1.5, "missed": -1.5, "downgrade": -2.0,
+        "downgraded": -2.0, "weak": -1.5, "loss": -2.0, "losses": -2.0, "red": -1.0,
+        "drop": -1.5, "dropping": -1.5, "plunge": -2.5, "tank": -2.5, "tanking": -2.5,
+        "bagholder": -2.0, "bagholders": -2.0, "bubble": -2.0, "fraud": -3.0,
+        "scam": -3.0, "bankrupt": -3.0, "bankruptcy": -3.0, "recession": -2.0,
+        "risk": -1.0, "risky": -1.5, "lawsuit": -2.0, "bad": -1.5, "terrible": -2.5,
+        "worst": -2.5, "negative": -1.5, "fear": -1.5, "down": -0.5, "lower": -1.0,
+        "underperform": -2.0, "layoffs": -2.0, "rip": -1.5, "guh": -2.0,
+    }
+
+    NEGATIONS = frozenset({
+        "not", "no", "never", "dont", "don't", "isnt", "isn't", "wont", "won't",
+        "cant", "can't", "didnt", "didn't", "aint", "ain't", "without",
+    })
+
+    # A negation flips and dampens the valence of the following token
+    NEGATION_FACTOR = -0.75
+
+    # Normalization constant, score = raw / sqrt(raw^2 + alpha) maps into (-1, 1)
+    ALPHA = 15.0
+
+    # Labels for scores outside (-threshold, threshold)
+    LABEL_THRESHOLD = 0.05
+
+    TOKEN_PATTERN = r"[a-z]+(?:'[a-z]+)?|🚀|🌙|📈|📉|🐂|🐻|💎"
+
+
+class SentimentScorer:
+    """Vectorized lexicon scorer producing scores in [-1, 1]."""
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.lexicon = pd.Series(lexicon or SentimentConfig.LEXICON, dtype="float64")
+
+    def score_texts(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Score a batch of texts.
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Array of sentiment scores in [-1, 1], 0 for texts without lexicon hits
+        """
+        texts = pd.Series(list(texts), dtype="object").fillna("").astype(str)
+        if texts.empty:
+            return np.zeros(0, dtype=np.float32)
+
+        tokens = texts.str.lower().str.findall(SentimentConfig.TOKEN_PATTERN).explode()
+        valences = tokens.map(self.lexicon)
+
+        # Negation applies to the directly preceding token of the same text
+        previous = tokens.groupby(level=0).shift(1)
+        negated = previous.isin(SentimentConfig.NEGATIONS)
+        valences = valences.where(~negated, valences * SentimentConfig.NEGATION_FACTOR)
+
+        raw = valences.groupby(level=0).sum(min_count=1).reindex(texts.index).fillna(0.0)
+        raw = raw.to_numpy(dtype=np.float64)
+        scores = raw / np.sqrt(raw * raw + SentimentConfig.ALPHA)
+        return scores.astype(np.float32)
+
+    def score_posts(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add ``sentiment`` and ``sentiment_label`` columns to a posts dataframe.
+
+        Args:
+            df: Dataframe with "title" and "selftext" columns
+
+        Returns:
+            The same dataframe with the sentiment columns set
+        """
+        texts = df["title"].fillna("").astype(str) + " " + df["selftext"].fillna("").astype(str)
+        scores = self.score_texts(texts)
+        df["sentiment"] = scores
+        df["sentiment_label"] = label_scores(scores)
+        return df
+
+
+def label_scores(scores: np.ndarray) -> np.ndarray:
+    """
+    Map sentiment scores to "bullish", "bearish" or "neutral".
+
+    Args:
+        scores: Sentiment scores in [-1, 1]
+
+    Returns:
+        Array of labels
+    """
+    threshold = SentimentConfig.LABEL_THRESHOLD
+    return np.select(
+        [scores >= threshold, scores <= -threshold],
+        ["bullish", "bearish"],
+        default="neutral",
+    )
+
+
+# Global scorer instance
+_default_scorer = SentimentScorer()
+
+
+def score_texts(texts: Iterable[str]) -> np.ndarray:
+    """
+    Convenience function to score texts using the default scorer.
+
+    Args:
+        texts: Texts to score
+
+    Returns:
+        Array of sentiment scores in [-1, 1]
+    """
+    return _default_scorer.score_texts(texts)
+
+
+def score_posts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convenience function to score a posts dataframe using the default scorer.
+
+    Args:
+        df: Dataframe with "title" and "selftext" columns
+
+    Returns:
+        The same dataframe with the sentiment columns set
+    """
+    return _default_scorer.score_posts(df)
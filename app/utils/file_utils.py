@@ -80,3 +80,52 @@ def is_file_recent(file_path: str, hours: int = 24) -> bool:
     file_time = os.path.getmtime(file_path)
     current_time = time.time()
     return (current_time - file_time) < (hours * 3600)
+
+
+def append_npy_rows(file_path: str, rows: "np.ndarray") -> None:
+    """
+    Append rows to a 2-D .npy file without rewriting the existing data.
+    
+    The rows are written at the end of the file and only the header is
+    updated in place; numpy reserves header space for a growing first axis.
+    Falls back to a full rewrite if the header does not fit or the dtypes differ.
+    
+    Args:
+        file_path: Path to the .npy file, created if missing
+        rows: Rows to append, shape (n, d)
+    """
+    import numpy as np
+    from numpy.lib import format as npy_format
+
+    if not os.path.exists(file_path):
+        np.save(file_path, rows)
+        return
+
+    with open(file_path, "r+b") as f:
+        version = npy_format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = npy_format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = npy_format.read_array_header_2_0(f)
+        data_offset = f.tell()
+
+        # Magic string, version bytes and the header length field
+        prefix_length = 8 + (2 if version == (1, 0) else 4)
+        header = repr({
+            "descr": npy_format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (shape[0] + len(rows), shape[1]),
+        }).encode("latin1")
+        space = data_offset - prefix_length
+        compatible = len(shape) == 2 and not fortran_order and rows.shape[1:] == shape[1:]
+        if compatible and rows.dtype == dtype and len(header) < space:
+            # Data first: until the header is updated, readers see the old shape
+            f.seek(0, os.SEEK_END)
+            f.write(np.ascontiguousarray(rows).tobytes())
+            f.flush()
+            f.seek(prefix_length)
+            f.write(header + b" " * (space - len(header) - 1) + b"\n")
+            return
+
+    existing = np.load(file_path)
+    np.save(file_path, np.concatenate([existing, rows.astype(existing.dtype)]))
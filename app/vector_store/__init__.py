@@ -2,6 +2,7 @@
 Vector store module for managing embeddings and vector operations.
 """
 
-from .client import upload_embeddings_with_payloads
+from .client import upload_embeddings_with_payloads, scroll_payloads
+from .connection import get_qdrant_client
 
-__all__ = ["upload_embeddings_with_payloads"]
+__all__ = ["upload_embeddings_with_payloads", "scroll_payloads", "get_qdrant_client"]
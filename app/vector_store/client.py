@@ -3,24 +3,108 @@ Qdrant vector store client for managing embeddings and collections.
 """
 
 import pandas as pd
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import VectorParams, Distance, PointStruct
+from qdrant_client.http.models import (
+    VectorParams,
+    Distance,
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    PayloadSchemaType,
+)
 import numpy as np
-from typing import Optional
+import os
+import uuid
+from typing import Optional, List, Dict, Any
+
+from app.monitoring.metrics import span, VECTORS_UPSERTED
+from app.monitoring.progress import stage_progress
+from app.vector_store.connection import SharedQdrantClient, get_qdrant_client
+from app.vector_store.profiles import CollectionProfile, select_profile
+
+# Points per upsert request
+UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", "512"))
+
+# Optional dataset columns copied into the payload as (column, payload key, type)
+PAYLOAD_FIELDS = (
+    ("id", "post_id", str),
+    ("created_utc", "created_utc", float),
+    ("num_comments", "num_comments", int),
+    ("sentiment", "sentiment", float),
+    ("sentiment_label", "sentiment_label", str),
+    ("duplicate_count", "duplicate_count", int),
+    ("aggregate_score", "aggregate_score", int),
+)
+
+# Namespace for deterministic point IDs derived from post ID and chunk index
+_POINT_NAMESPACE = uuid.UUID("5f0c3a52-8d7e-4a51-9b0e-2f6d1c7a9e34")
+
+
+def point_id(post_id: str, chunk_index: int = 0) -> str:
+    """
+    Deterministic point ID of a post chunk, stable across re-uploads.
+    
+    Args:
+        post_id: Reddit ID of the post
+        chunk_index: Index of the chunk within the post
+        
+    Returns:
+        UUID string usable as Qdrant point ID
+    """
+    return str(uuid.uuid5(_POINT_NAMESPACE, f"{post_id}#{int(chunk_index)}"))
+
+
+def build_payload(row: pd.Series) -> Dict[str, Any]:
+    """
+    Build the point payload for a post row of a dataset.
+    
+    Args:
+        row: Post row with title, selftext, score and optional metadata columns
+        
+    Returns:
+        Payload dictionary
+    """
+    payload = {
+        "title": row["title"],
+        "selftext": row.get("selftext", ""),
+        "score": int(row.get("score", 0)),
+        "source": "Reddit"
+    }
+    # Optional fields used for filtering and aggregation without an LLM
+    for column, key, cast in PAYLOAD_FIELDS:
+        if pd.notna(row.get(column)):
+            payload[key] = cast(row[column])
+    return payload
+
+
+def index_posts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Index a posts dataframe by its Reddit post ID for payload lookups.
+    
+    Args:
+        df: Posts dataframe
+        
+    Returns:
+        Dataframe indexed by the post ID as string (index name "post_id")
+    """
+    post_ids = df["id"].astype(str) if "id" in df.columns else df.index.astype(str)
+    return df.set_index(pd.Index(post_ids, name="post_id"))
 
 
 class VectorStoreClient:
     """Client for managing vector store operations with Qdrant."""
     
-    def __init__(self, host: str = "localhost", port: int = 6333):
-        self.client = QdrantClient(host=host, port=port)
+    def __init__(self, client: Optional[SharedQdrantClient] = None):
+        self.client = client or get_qdrant_client()
     
     def upload_embeddings_with_payloads(
         self, 
         embeddings: np.ndarray, 
         csv_path: str, 
-        collection_name: str = "stocks"
-    ) -> None:
+        collection_name: str = "stocks",
+        chunks: Optional[pd.DataFrame] = None,
+        profile: Optional[str] = None
+    ) -> str:
         """
         Upload embeddings with metadata payloads to Qdrant.
         
@@ -28,34 +112,265 @@ class VectorStoreClient:
             embeddings: Numpy array of embeddings
             csv_path: Path to CSV file with metadata
             collection_name: Name of the collection to store in
+            chunks: Chunk table aligned with the embedding rows (post_id, chunk_index,
+                num_chunks, text); one embedding per post if None
+            profile: Collection profile name, chosen from the number of points if None
+            
+        Returns:
+            Name of the collection profile in use
         """
-        df = pd.read_csv(csv_path)
+        with span("csv_read"):
+            df = pd.read_csv(csv_path)
         dim = embeddings.shape[1]
 
-        # Create collection if it doesn't exist
-        if not self.client.collection_exists(collection_name):
-            print(f"Collection {collection_name} does not exist. Creating...")
-            self.client.create_collection(
+        # Create collection if it doesn't exist, with indexing deferred until after the upload
+        collection_profile = select_profile(len(embeddings), profile)
+        # Every point is rewritten, so a collection of another vector size is rebuilt
+        created = self.create_collection(
+            collection_name, dim, collection_profile, bulk=True, recreate_on_mismatch=True
+        )
+
+        # Prepare points with payloads
+        points = self.build_points(embeddings, df, chunks)
+
+        # Upload to collection
+        self.upsert_points(collection_name, points)
+        if created:
+            self.finish_bulk_load(collection_name, collection_profile)
+        print(f"✅ Uploaded: {len(points)} vectors → Collection '{collection_name}' "
+              f"(Profil: {collection_profile.name})")
+        return collection_profile.name
+
+    def append_embeddings(
+        self,
+        embeddings: np.ndarray,
+        df: pd.DataFrame,
+        collection_name: str,
+        chunks: pd.DataFrame,
+        profile: Optional[str] = None
+    ) -> str:
+        """
+        Append the embeddings of new posts to a growing collection.
+        
+        Unlike a bulk upload, indexing stays enabled so the collection remains
+        searchable while it grows; the collection is created on first use.
+        
+        Args:
+            embeddings: Embeddings of the new chunks
+            df: The new posts
+            collection_name: Name of the collection
+            chunks: Chunk table of the new posts, aligned with the embeddings
+            profile: Collection profile name, the default profile if None
+            
+        Returns:
+            Name of the collection profile in use
+        """
+        collection_profile = select_profile(None, profile)
+        if self.create_collection(collection_name, embeddings.shape[1], collection_profile):
+            # In-place updates of scores and duplicates filter by post ID
+            self.client.create_payload_index(
                 collection_name=collection_name,
-                vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
+                field_name="post_id",
+                field_schema=PayloadSchemaType.KEYWORD,
             )
+        self.upsert_points(collection_name, self.build_points(embeddings, df, chunks))
+        return collection_profile.name
 
-        # Prepare points with payloads
+    def build_points(
+        self,
+        embeddings: np.ndarray,
+        df: pd.DataFrame,
+        chunks: Optional[pd.DataFrame] = None,
+        start: int = 0
+    ) -> List[PointStruct]:
+        """
+        Build points for a slice of embedding rows.
+        
+        Args:
+            embeddings: Embedding rows to convert (a slice of the full matrix)
+            df: Posts dataframe of the dataset, optionally indexed with :func:`index_posts`
+            chunks: Full chunk table of the dataset, including comment rows; one embedding per post if None
+            start: Row offset of ``embeddings`` within the full matrix
+            
+        Returns:
+            List of points with payloads
+        """
         points = []
-        for i in range(len(embeddings)):
-            payload = {
-                "title": df.iloc[i]["title"],
-                "selftext": df.iloc[i].get("selftext", ""),
-                "score": int(df.iloc[i].get("score", 0)),
-                "source": "Reddit"
-            }
+        if chunks is None:
+            for i in range(len(embeddings)):
+                payload = build_payload(df.iloc[start + i])
+                points.append(
+                    PointStruct(id=start + i, vector=embeddings[i].tolist(), payload=payload)
+                )
+            return points
+
+        posts = df if df.index.name == "post_id" else index_posts(df)
+        rows = chunks.iloc[start:start + len(embeddings)]
+        for i, chunk in enumerate(rows.itertuples(index=False)):
+            payload = build_payload(posts.loc[str(chunk.post_id)])
+            payload["post_id"] = str(chunk.post_id)
+            payload["selftext"] = chunk.text if isinstance(chunk.text, str) else ""
+            payload["chunk_index"] = int(chunk.chunk_index)
+            payload["num_chunks"] = int(chunk.num_chunks)
+            doc_id = str(chunk.post_id)
+            comment_id = getattr(chunk, "comment_id", None)
+            if isinstance(comment_id, str) and comment_id:
+                # Comments are child documents: parent post metadata plus their own text and score
+                doc_id = f"{chunk.post_id}/{comment_id}"
+                payload["doc_type"] = "comment"
+                payload["comment_id"] = comment_id
+                payload["comment_score"] = int(chunk.comment_score)
+                payload["comment_created_utc"] = float(chunk.comment_created_utc)
+                if pd.notna(getattr(chunk, "comment_sentiment", None)):
+                    payload["comment_sentiment"] = float(chunk.comment_sentiment)
             points.append(
-                PointStruct(id=i, vector=embeddings[i].tolist(), payload=payload)
+                PointStruct(
+                    id=point_id(doc_id, chunk.chunk_index),
+                    vector=embeddings[i].tolist(),
+                    payload=payload,
+                )
             )
+        return points
 
-        # Upload to collection
-        self.client.upsert(collection_name=collection_name, points=points)
-        print(f"✅ Uploaded: {len(points)} vectors → Collection '{collection_name}'")
+    def create_collection(
+        self,
+        collection_name: str,
+        dim: int,
+        profile: CollectionProfile,
+        bulk: bool = False,
+        recreate_on_mismatch: bool = False
+    ) -> bool:
+        """
+        Create a collection with the settings of a profile unless it exists.
+        
+        An existing collection must store vectors of size ``dim``, e.g. after a
+        reprocess with another reduction.
+        
+        Args:
+            collection_name: Name of the collection
+            dim: Vector dimension
+            profile: Collection profile
+            bulk: Disable indexing until :meth:`finish_bulk_load` is called
+            recreate_on_mismatch: Drop an existing collection of another vector size
+                instead of failing
+            
+        Returns:
+            True if the collection was created
+            
+        Raises:
+            ValueError: If the collection exists with another vector size
+        """
+        if self.client.collection_exists(collection_name):
+            existing_dim = self.vector_size(collection_name)
+            if existing_dim == dim:
+                return False
+            if not recreate_on_mismatch:
+                raise ValueError(
+                    f"Collection {collection_name} stores {existing_dim}-dimensional vectors, "
+                    f"got {dim}; reprocess the dataset to rebuild it"
+                )
+            print(f"⚠️ Collection {collection_name} hat {existing_dim} statt {dim} Dimensionen, wird neu angelegt")
+            self.client.delete_collection(collection_name)
+        print(f"Collection {collection_name} does not exist. Creating ({profile.name})...")
+        self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(size=dim, distance=Distance.COSINE, on_disk=profile.on_disk_vectors),
+            hnsw_config=profile.hnsw_config(),
+            optimizers_config=profile.optimizers_config(bulk=bulk),
+            on_disk_payload=profile.on_disk_payload,
+            quantization_config=profile.quantization_config(),
+        )
+        return True
+
+    def vector_size(self, collection_name: str) -> int:
+        """
+        Get the vector size of an existing collection.
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            Dimension of the stored vectors
+        """
+        vectors = self.client.get_collection(collection_name).config.params.vectors
+        return int(vectors.size)
+
+    def finish_bulk_load(self, collection_name: str, profile: CollectionProfile) -> None:
+        """
+        Re-enable indexing after a bulk load so the index is built once.
+        
+        Args:
+            collection_name: Name of the collection
+            profile: Collection profile
+        """
+        self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=profile.optimizers_config(bulk=False),
+        )
+
+    def upsert_points(self, collection_name: str, points: List[PointStruct]) -> None:
+        """
+        Upsert points in batches of ``UPSERT_BATCH_SIZE``.
+        
+        Args:
+            collection_name: Name of the collection
+            points: Points to write
+        """
+        with span("upsert"), stage_progress("upload", len(points)) as progress:
+            for start in range(0, len(points), UPSERT_BATCH_SIZE):
+                batch = points[start:start + UPSERT_BATCH_SIZE]
+                self.client.upsert(collection_name=collection_name, points=batch)
+                VECTORS_UPSERTED.inc(len(batch))
+                progress.advance(len(batch))
+
+    def update_post_fields(self, collection_name: str, updates: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Overwrite payload fields of posts in place, on all chunks of each post.
+        
+        Args:
+            collection_name: Name of the collection
+            updates: Mapping of post ID to the payload fields to set
+        """
+        with span("payload_update"):
+            for post_id, fields in updates.items():
+                self.client.set_payload(
+                    collection_name=collection_name,
+                    payload=fields,
+                    points=Filter(must=[FieldCondition(key="post_id", match=MatchValue(value=str(post_id)))]),
+                )
+
+    def scroll_payloads(
+        self,
+        collection_name: str,
+        fields: Optional[List[str]] = None,
+        batch_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Read the payloads of all points in a collection without their vectors.
+        
+        Args:
+            collection_name: Name of the collection to read
+            fields: Payload fields to return, all fields if None
+            batch_size: Number of points per scroll request
+            
+        Returns:
+            List of payloads
+        """
+        payloads = []
+        offset = None
+        with span("scroll"):
+            while True:
+                points, offset = self.client.scroll(
+                    collection_name=collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=fields if fields is not None else True,
+                    with_vectors=False,
+                )
+                payloads.extend(point.payload for point in points)
+                if offset is None:
+                    break
+        return payloads
 
 
 # Global client instance
@@ -65,8 +380,10 @@ _default_client = VectorStoreClient()
 def upload_embeddings_with_payloads(
     embeddings: np.ndarray, 
     csv_path: str, 
-    collection_name: str = "stocks"
-) -> None:
+    collection_name: str = "stocks",
+    chunks: Optional[pd.DataFrame] = None,
+    profile: Optional[str] = None
+) -> str:
     """
     Convenience function to upload embeddings using the default client.
     
@@ -74,5 +391,65 @@ def upload_embeddings_with_payloads(
         embeddings: Numpy array of embeddings
         csv_path: Path to CSV file with metadata
         collection_name: Name of the collection to store in
+        chunks: Chunk table aligned with the embedding rows, one embedding per post if None
+        profile: Collection profile name, chosen from the number of points if None
+        
+    Returns:
+        Name of the collection profile in use
+    """
+    return _default_client.upload_embeddings_with_payloads(
+        embeddings, csv_path, collection_name, chunks, profile
+    )
+
+
+def append_embeddings(
+    embeddings: np.ndarray,
+    df: pd.DataFrame,
+    collection_name: str,
+    chunks: pd.DataFrame,
+    profile: Optional[str] = None
+) -> str:
+    """
+    Convenience function to append embeddings of new posts using the default client.
+    
+    Args:
+        embeddings: Embeddings of the new chunks
+        df: The new posts
+        collection_name: Name of the collection
+        chunks: Chunk table of the new posts, aligned with the embeddings
+        profile: Collection profile name, the default profile if None
+        
+    Returns:
+        Name of the collection profile in use
+    """
+    return _default_client.append_embeddings(embeddings, df, collection_name, chunks, profile)
+
+
+def update_post_fields(collection_name: str, updates: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Convenience function to update payload fields of posts using the default client.
+    
+    Args:
+        collection_name: Name of the collection
+        updates: Mapping of post ID to the payload fields to set
+    """
+    _default_client.update_post_fields(collection_name, updates)
+
+
+def scroll_payloads(
+    collection_name: str,
+    fields: Optional[List[str]] = None,
+    batch_size: int = 1000
+) -> List[Dict[str, Any]]:
+    """
+    Convenience function to read all payloads of a collection using the default client.
+    
+    Args:
+        collection_name: Name of the collection to read
+        fields: Payload fields to return, all fields if None
+        batch_size: Number of points per scroll request
+        
+    Returns:
+        List of payloads
     """
-    _default_client.upload_embeddings_with_payloads(embeddings, csv_path, collection_name)
+    return _default_client.scroll_payloads(collection_name, fields, batch_size)
@@ -0,0 +1,221 @@
+"""
+Shared, configurable Qdrant client factory.
+
+Every module that talks to Qdrant goes through :func:`get_qdrant_client`, which
+returns one pooled client per process, configured from the environment:
+gRPC or REST transport, keep-alive connection pooling, timeouts and retries
+with jittered exponential backoff on transient errors. Only idempotent calls
+are retried; a create or delete that timed out after the server applied it
+would fail or act twice on the retry.
+"""
+
+import os
+import random
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+
+import httpx
+from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from app.monitoring.metrics import VECTOR_STORE_RETRIES
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+class QdrantSettings:
+    """Connection settings for Qdrant, read from the environment."""
+
+    URL = os.getenv("QDRANT_URL")  # takes precedence over host/port if set
+    HOST = os.getenv("QDRANT_HOST", "localhost")
+    PORT = int(os.getenv("QDRANT_PORT", "6333"))
+    GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    API_KEY = os.getenv("QDRANT_API_KEY")
+
+    # gRPC avoids JSON serialization of vectors for bulk upserts and searches
+    PREFER_GRPC = _env_flag("QDRANT_PREFER_GRPC")
+
+    # Seconds; the client default applies to all calls, searches get their own budget
+    TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "30"))
+    SEARCH_TIMEOUT = int(os.getenv("QDRANT_SEARCH_TIMEOUT", "5"))
+
+    # Keep-alive connection pool for REST
+    POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "20"))
+    KEEPALIVE_EXPIRY = float(os.getenv("QDRANT_KEEPALIVE_EXPIRY", "60"))
+
+    MAX_RETRIES = int(os.getenv("QDRANT_MAX_RETRIES", "3"))
+    RETRY_BASE_DELAY = float(os.getenv("QDRANT_RETRY_BASE_DELAY", "0.2"))
+    RETRY_MAX_DELAY = float(os.getenv("QDRANT_RETRY_MAX_DELAY", "5.0"))
+
+
+# HTTP status codes worth retrying (rate limiting, restarts, overload)
+_TRANSIENT_STATUS_CODES = {429, 502, 503, 504}
+
+# Client methods that are safe to repeat: reads, and writes of explicit point
+# ids or payload values that leave the same state when applied twice
+RETRYABLE_METHODS = frozenset({
+    "collection_exists",
+    "count",
+    "get_collection",
+    "get_collections",
+    "query_batch_points",
+    "query_points",
+    "retrieve",
+    "scroll",
+    "search",
+    "search_batch",
+    "set_payload",
+    "overwrite_payload",
+    "update_collection",
+    "upsert",
+})
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check whether an error is worth retrying.
+
+    Args:
+        error: Exception raised by a Qdrant call
+
+    Returns:
+        True for connection errors, timeouts and overload/restart responses
+    """
+    if isinstance(error, (ResponseHandlingException, httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in _TRANSIENT_STATUS_CODES
+    try:
+        import grpc
+    except ImportError:
+        return False
+    if isinstance(error, grpc.RpcError):
+        return error.code() in (
+            grpc.StatusCode.UNAVAILABLE,
+            grpc.StatusCode.DEADLINE_EXCEEDED,
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+        )
+    return False
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay of the first attempt
+        maximum: Upper bound of the delay
+
+    Returns:
+        Seconds to sleep
+    """
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+def with_retries(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Call ``func`` and retry transient errors with jittered backoff.
+
+    Args:
+        func: Callable to invoke
+        *args: Positional arguments for ``func``
+        **kwargs: Keyword arguments for ``func``
+
+    Returns:
+        Result of ``func``
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= QdrantSettings.MAX_RETRIES or not is_transient_error(e):
+                raise
+            VECTOR_STORE_RETRIES.labels(getattr(func, "__name__", "call")).inc()
+            time.sleep(backoff_delay(attempt, QdrantSettings.RETRY_BASE_DELAY, QdrantSettings.RETRY_MAX_DELAY))
+            attempt += 1
+
+
+def create_qdrant_client() -> QdrantClient:
+    """
+    Create a new Qdrant client from :class:`QdrantSettings`.
+
+    Returns:
+        Configured QdrantClient
+    """
+    connection = {"url": QdrantSettings.URL} if QdrantSettings.URL else {
+        "host": QdrantSettings.HOST,
+        "port": QdrantSettings.PORT,
+    }
+    return QdrantClient(
+        **connection,
+        grpc_port=QdrantSettings.GRPC_PORT,
+        prefer_grpc=QdrantSettings.PREFER_GRPC,
+        api_key=QdrantSettings.API_KEY,
+        timeout=QdrantSettings.TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=QdrantSettings.POOL_SIZE,
+            max_keepalive_connections=QdrantSettings.POOL_SIZE,
+            keepalive_expiry=QdrantSettings.KEEPALIVE_EXPIRY,
+        ),
+        grpc_options={
+            "grpc.keepalive_time_ms": 30000,
+            "grpc.keepalive_timeout_ms": 10000,
+            "grpc.keepalive_permit_without_calls": 1,
+            "grpc.max_send_message_length": 64 * 1024 * 1024,
+            "grpc.max_receive_message_length": 64 * 1024 * 1024,
+        },
+    )
+
+
+class SharedQdrantClient:
+    """
+    Process-wide Qdrant client whose idempotent methods retry transient errors.
+
+    The underlying client is created lazily and re-created in forked worker
+    processes, since connections and gRPC channels must not cross a fork.
+    """
+
+    def __init__(self, factory: Callable[[], QdrantClient] = create_qdrant_client):
+        self._factory = factory
+        self._client: Optional[QdrantClient] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def raw(self) -> QdrantClient:
+        """The underlying client of this process, without retries."""
+        if self._client is None or self._pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._pid != os.getpid():
+                    self._client = self._factory()
+                    self._pid = os.getpid()
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.raw, name)
+        if name not in RETRYABLE_METHODS or not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            return with_retries(attr, *args, **kwargs)
+        return call
+
+
+_shared_client = SharedQdrantClient()
+
+
+def get_qdrant_client() -> SharedQdrantClient:
+    """
+    Get the shared Qdrant client of this process.
+
+    Returns:
+        Shared client with retrying methods
+    """
+    return _shared_client
@@ -0,0 +1,117 @@
+"""
+Size-aware collection profiles for Qdrant.
+
+A profile bundles storage (RAM vs on-disk vectors and payloads), HNSW graph
+parameters, the indexing threshold and the per-query ``hnsw_ef``. Profiles are
+chosen from the expected number of points unless one is requested explicitly.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from qdrant_client.http.models import (
+    HnswConfigDiff,
+    OptimizersConfigDiff,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+)
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage and index settings of a collection."""
+
+    name: str
+    max_points: Optional[int]
+    on_disk_vectors: bool
+    on_disk_payload: bool
+    hnsw_m: int
+    hnsw_ef_construct: int
+    # Qdrant builds the HNSW index once a segment holds this many KB of vectors
+    indexing_threshold: int
+    hnsw_ef: int
+    # int8 scalar quantization kept in RAM, full vectors on disk for rescoring
+    quantization: bool = False
+
+    def hnsw_config(self) -> HnswConfigDiff:
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def optimizers_config(self, bulk: bool = False) -> OptimizersConfigDiff:
+        # 0 disables indexing; the index is built once after a bulk load
+        return OptimizersConfigDiff(indexing_threshold=0 if bulk else self.indexing_threshold)
+
+    def quantization_config(self) -> Optional[ScalarQuantization]:
+        if not self.quantization:
+            return None
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+
+    def search_params(self) -> SearchParams:
+        quantization = QuantizationSearchParams(rescore=True, oversampling=2.0) if self.quantization else None
+        return SearchParams(hnsw_ef=self.hnsw_ef, quantization=quantization)
+
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    # Brute force over a few thousand vectors beats building a graph
+    "small": CollectionProfile(
+        name="small",
+        max_points=10_000,
+        on_disk_vectors=False,
+        on_disk_payload=False,
+        hnsw_m=16,
+        hnsw_ef_construct=100,
+        indexing_threshold=1_000_000,
+        hnsw_ef=64,
+    ),
+    "medium": CollectionProfile(
+        name="medium",
+        max_points=200_000,
+        on_disk_vectors=False,
+        on_disk_payload=False,
+        hnsw_m=16,
+        hnsw_ef_construct=128,
+        indexing_threshold=20_000,
+        hnsw_ef=96,
+    ),
+    # Originals on disk, quantized copies and the graph in RAM, rescored for recall
+    "large": CollectionProfile(
+        name="large",
+        max_points=None,
+        on_disk_vectors=True,
+        on_disk_payload=True,
+        hnsw_m=24,
+        hnsw_ef_construct=200,
+        indexing_threshold=20_000,
+        hnsw_ef=128,
+        quantization=True,
+    ),
+}
+
+DEFAULT_PROFILE = "medium"
+
+
+def select_profile(expected_points: Optional[int] = None, name: Optional[str] = None) -> CollectionProfile:
+    """
+    Choose a collection profile by name or by the expected number of points.
+
+    Args:
+        expected_points: Expected number of points in the collection
+        name: Explicit profile name, takes precedence
+
+    Returns:
+        Collection profile
+    """
+    if name:
+        if name not in COLLECTION_PROFILES:
+            raise ValueError(f"Unknown collection profile '{name}', choose one of {list(COLLECTION_PROFILES)}")
+        return COLLECTION_PROFILES[name]
+    if expected_points is None:
+        return COLLECTION_PROFILES[DEFAULT_PROFILE]
+    for profile in COLLECTION_PROFILES.values():
+        if profile.max_points is None or expected_points <= profile.max_points:
+            return profile
+    return COLLECTION_PROFILES["large"]
@@ -0,0 +1,143 @@
+"""
+Collection registry: metadata of every collection in a JSON file.
+
+The registry records what the vector store itself cannot hold, such as the
+dataset a collection was built from, the embedding model and the projection
+applied to its vectors.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
+REGISTRY_PATH = ROOT_FOLDER / "data" / "processed" / "collections.json"
+
+
+class CollectionRegistry:
+    """JSON-file backed registry of collection metadata."""
+
+    def __init__(self, path: Path = REGISTRY_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._mtime: Optional[float] = None
+
+    def _refresh(self) -> None:
+        # Other processes (scripts, API workers) may have written the file
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._mtime:
+            with open(self.path) as f:
+                self._entries = json.load(f)
+            self._mtime = mtime
+
+    def _write(self) -> None:
+        os.makedirs(self.path.parent, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._mtime = self.path.stat().st_mtime
+
+    def get(self, collection_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the metadata of a collection.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Metadata dictionary, or None if the collection is not registered
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(collection_name)
+            return dict(entry) if entry is not None else None
+
+    def update(self, collection_name: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Merge fields into the metadata of a collection.
+
+        Args:
+            collection_name: Name of the collection
+            **fields: Metadata fields to set
+
+        Returns:
+            The updated metadata
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._entries.setdefault(collection_name, {})
+            entry.update(fields)
+            self._write()
+            return dict(entry)
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of all registered collections.
+
+        Returns:
+            Mapping of collection name to metadata
+        """
+        with self._lock:
+            self._refresh()
+            return {name: dict(entry) for name, entry in self._entries.items()}
+
+
+# Global registry instance
+_default_registry = CollectionRegistry()
+
+
+def get_registry() -> CollectionRegistry:
+    """
+    Get the registry shared by this process.
+
+    Every writer must use this instance: its lock is what serializes the
+    read-modify-write cycles on the registry file.
+
+    Returns:
+        Shared collection registry
+    """
+    return _default_registry
+
+
+def get_collection_info(collection_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Convenience function to get collection metadata from the default registry.
+
+    Args:
+        collection_name: Name of the collection
+
+    Returns:
+        Metadata dictionary, or None if the collection is not registered
+    """
+    return _default_registry.get(collection_name)
+
+
+def update_collection_info(collection_name: str, **fields: Any) -> Dict[str, Any]:
+    """
+    Convenience function to update collection metadata in the default registry.
+
+    Args:
+        collection_name: Name of the collection
+        **fields: Metadata fields to set
+
+    Returns:
+        The updated metadata
+    """
+    return _default_registry.update(collection_name, **fields)
+
+
+def list_collection_info() -> Dict[str, Dict[str, Any]]:
+    """
+    Convenience function to list all collections of the default registry.
+
+    Returns:
+        Mapping of collection name to metadata
+    """
+    return _default_registry.all()
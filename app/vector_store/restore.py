@@ -0,0 +1,200 @@
+"""
+Bulk restore of collections from saved datasets and embeddings.
+
+Every ingested dataset leaves its posts CSV, the embedding matrix (.npy), the
+chunk table aligned with the matrix rows and, if reduced, the fitted
+projection on disk. A restore rebuilds the collections from these files
+without re-embedding: the matrices are memory-mapped, checked against the
+chunk table and the recorded checksum, and uploaded in parallel batches into
+freshly created collections whose index is built once at the end.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.data.reddit_client import processed_posts_path
+from app.embedding.reduction import PROJECTIONS_FOLDER, Projection
+from app.monitoring.metrics import span, VECTORS_UPSERTED
+from app.monitoring.tracking import file_sha256
+from app.vector_store.client import UPSERT_BATCH_SIZE, VectorStoreClient, index_posts
+from app.vector_store.profiles import select_profile
+from app.vector_store.registry import CollectionRegistry, get_registry
+
+ROOT_FOLDER = Path(__file__).resolve().parent.parent.parent
+NPY_FOLDER = ROOT_FOLDER / "data" / "processed" / "npy"
+CHUNKS_FOLDER = ROOT_FOLDER / "data" / "processed" / "chunks"
+
+
+class RestoreConfig:
+    """Configuration for bulk restores."""
+
+    # Concurrent upsert batches per collection
+    WORKERS = int(os.getenv("RESTORE_WORKERS", "4"))
+
+
+class RestoreError(Exception):
+    """A saved dataset is inconsistent and cannot be restored."""
+
+
+class CollectionRestorer:
+    """Rebuilds collections from saved datasets without re-embedding."""
+
+    def __init__(
+        self,
+        vector_store: Optional[VectorStoreClient] = None,
+        registry: Optional[CollectionRegistry] = None,
+        workers: Optional[int] = None
+    ):
+        self.vector_store = vector_store or VectorStoreClient()
+        # The shared registry, so restores and other writers share one lock
+        self.registry = registry or get_registry()
+        self.workers = workers or RestoreConfig.WORKERS
+
+    def discover_datasets(self) -> List[str]:
+        """
+        Find datasets with both a posts CSV and an embedding matrix.
+
+        Returns:
+            Sorted dataset names
+        """
+        if not NPY_FOLDER.exists():
+            return []
+        return sorted(
+            path.stem for path in NPY_FOLDER.glob("*.npy")
+            if processed_posts_path(path.stem).exists()
+        )
+
+    def restore(self, dataset_name: str, recreate: bool = False) -> Dict[str, Any]:
+        """
+        Restore the collection of one dataset.
+
+        Args:
+            dataset_name: Name of the dataset (and collection)
+            recreate: Drop and rebuild the collection if it already exists
+
+        Returns:
+            Restore result with status, point counts and the checksum
+        """
+        collection_name = dataset_name
+        npy_path = NPY_FOLDER / f"{dataset_name}.npy"
+        csv_path = processed_posts_path(dataset_name)
+        chunks_path = CHUNKS_FOLDER / f"{dataset_name}.csv"
+        info = self.registry.get(collection_name) or {}
+
+        client = self.vector_store.client
+        exists = client.collection_exists(collection_name)
+        if exists and not recreate:
+            return {"dataset": dataset_name, "status": "skipped", "message": "collection exists"}
+
+        # The matrix is paged in batch by batch instead of being read as a whole
+        embeddings = np.load(str(npy_path), mmap_mode="r")
+        with span("csv_read"):
+            df = pd.read_csv(csv_path)
+            chunks = pd.read_csv(
+                chunks_path, dtype={"post_id": str, "comment_id": str}
+            ) if chunks_path.exists() else None
+
+        expected = len(chunks) if chunks is not None else len(df)
+        if len(embeddings) != expected:
+            raise RestoreError(
+                f"{npy_path.name} has {len(embeddings)} rows, expected {expected} "
+                f"from {'the chunk table' if chunks is not None else 'the posts CSV'}"
+            )
+        with span("checksum"):
+            checksum = file_sha256(str(npy_path))
+        if info.get("npy_sha256") and info["npy_sha256"] != checksum:
+            raise RestoreError(f"Checksum of {npy_path.name} does not match the registry")
+
+        projection = None
+        reduction = info.get("reduction")
+        if reduction:
+            projection = Projection.load(PROJECTIONS_FOLDER / reduction["file"])
+            if projection.input_dim != embeddings.shape[1]:
+                raise RestoreError(
+                    f"Projection expects {projection.input_dim} dimensions, "
+                    f"{npy_path.name} has {embeddings.shape[1]}"
+                )
+        stored_dim = projection.output_dim if projection else int(embeddings.shape[1])
+
+        # The recorded profile is kept; unregistered datasets get one chosen by size
+        profile = select_profile(expected, info.get("profile"))
+        # Only drop the old collection once the files are known to be consistent
+        if exists:
+            client.delete_collection(collection_name)
+        self.vector_store.create_collection(collection_name, stored_dim, profile, bulk=True)
+
+        posts = index_posts(df) if chunks is not None else df
+
+        def upload_batch(start: int) -> int:
+            vectors = np.asarray(embeddings[start:start + UPSERT_BATCH_SIZE], dtype=np.float32)
+            if projection is not None:
+                vectors = projection.transform(vectors)
+            points = self.vector_store.build_points(vectors, posts, chunks, start)
+            client.upsert(collection_name=collection_name, points=points, wait=True)
+            VECTORS_UPSERTED.inc(len(points))
+            return len(points)
+
+        with span("restore_upload"):
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                uploaded = sum(executor.map(upload_batch, range(0, expected, UPSERT_BATCH_SIZE)))
+        self.vector_store.finish_bulk_load(collection_name, profile)
+
+        count = client.count(collection_name=collection_name, exact=True).count
+        if count != expected:
+            raise RestoreError(f"Collection '{collection_name}' holds {count} points, expected {expected}")
+
+        self.registry.update(
+            collection_name,
+            dataset=dataset_name,
+            model=info.get("model"),
+            dim=int(embeddings.shape[1]),
+            stored_dim=stored_dim,
+            reduction=reduction,
+            profile=profile.name,
+            num_posts=len(df),
+            num_points=count,
+            npy_sha256=checksum,
+            restored_at=datetime.now().isoformat(),
+        )
+        print(f"♻️ {collection_name}: {uploaded} Vektoren wiederhergestellt (Profil: {profile.name})")
+        return {"dataset": dataset_name, "status": "restored", "num_points": count, "npy_sha256": checksum}
+
+    def restore_all(self, datasets: Optional[List[str]] = None, recreate: bool = False) -> List[Dict[str, Any]]:
+        """
+        Restore several datasets; a failing dataset does not stop the others.
+
+        Args:
+            datasets: Dataset names, all discovered datasets if None
+            recreate: Drop and rebuild collections that already exist
+
+        Returns:
+            One restore result per dataset
+        """
+        results = []
+        for dataset_name in datasets or self.discover_datasets():
+            try:
+                results.append(self.restore(dataset_name, recreate))
+            except Exception as e:
+                print(f"❌ Wiederherstellung von {dataset_name} fehlgeschlagen: {str(e)}")
+                results.append({"dataset": dataset_name, "status": "failed", "message": str(e)})
+        return results
+
+
+def restore_collections(datasets: Optional[List[str]] = None, recreate: bool = False) -> List[Dict[str, Any]]:
+    """
+    Convenience function to restore collections with a default restorer.
+
+    Args:
+        datasets: Dataset names, all discovered datasets if None
+        recreate: Drop and rebuild collections that already exist
+
+    Returns:
+        One restore result per dataset
+    """
+    return CollectionRestorer().restore_all(datasets, recreate)
@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent / "app"))
 
 from app.data.reddit_client import collect as collect_reddit_data
 from app.utils.datetime_utils import generate_dataset_name
+from app.monitoring.metrics import print_stage_summary
 
 
 def main():
@@ -20,6 +21,8 @@ def main():
     parser.add_argument("--query", help="Search query (default: '{stock_symbol} stock')")
     parser.add_argument("--limit", type=int, default=50, help="Number of posts to collect (default: 50)")
     parser.add_argument("--dataset-name", help="Custom dataset name (default: auto-generated)")
+    parser.add_argument("--comments", action="store_true", default=None, help="Also collect comment trees (default: INGEST_COMMENTS)")
+    parser.add_argument("--timings", action="store_true", help="Print per-stage timings when done")
     
     args = parser.parse_args()
     
@@ -37,9 +40,11 @@ def main():
     print(f"📈 Limit: {args.limit} posts")
     
     try:
-        collect_reddit_data(args.query, args.dataset_name, args.limit)
+        collect_reddit_data(args.query, args.dataset_name, args.limit, args.comments)
         print(f"✅ Successfully collected data for {args.stock_symbol}")
         print(f"💾 Dataset saved as: {args.dataset_name}")
+        if args.timings:
+            print_stage_summary()
     except Exception as e:
         print(f"❌ Error collecting data: {str(e)}")
         sys.exit(1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Script to export the embedding model to a quantized ONNX encoder and benchmark it.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from app.embedding.backends import (
+    BackendConfig,
+    DEFAULT_EMBEDDING_MODEL,
+    OnnxEncoder,
+    PARITY_SAMPLE_TEXTS,
+    export_folder,
+    benchmark,
+    export_onnx,
+    load_encoder,
+)
+from app.utils.file_utils import list_files_by_pattern
+
+
+def load_sample_texts(limit: int) -> list:
+    """Use real posts from the collected datasets, fall back to built-in samples."""
+    texts = []
+    for csv_file in sorted(list_files_by_pattern("*.csv", "data/processed/csv")):
+        df = pd.read_csv(csv_file)
+        texts.extend((df["title"].fillna("") + " " + df["selftext"].fillna("")).tolist())
+        if len(texts) >= limit:
+            break
+    return texts[:limit] or PARITY_SAMPLE_TEXTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the embedding model to quantized ONNX")
+    parser.add_argument("--model", default=DEFAULT_EMBEDDING_MODEL, help=f"Embedding model (default: {DEFAULT_EMBEDDING_MODEL})")
+    parser.add_argument("--samples", type=int, default=256, help="Number of texts for parity check and benchmark (default: 256)")
+    parser.add_argument("--benchmark", action="store_true", help="Compare PyTorch and ONNX encode throughput")
+    parser.add_argument("--skip-export", action="store_true", help="Benchmark an existing export only")
+
+    args = parser.parse_args()
+
+    texts = load_sample_texts(args.samples)
+
+    try:
+        if not args.skip_export:
+            print(f"📦 Exporting {args.model} to ONNX (int8) ...")
+            config = export_onnx(args.model, texts)
+            parity = config["parity"]
+            print(f"🔍 Parity: min cosine {parity['min_cosine']:.4f}, mean cosine {parity['mean_cosine']:.4f}")
+            if parity["min_cosine"] < BackendConfig.MIN_PARITY:
+                print(f"❌ Parity below {BackendConfig.MIN_PARITY}, the ONNX backend will not be used")
+                sys.exit(1)
+            print(f"✅ Export saved under {export_folder(args.model)}")
+
+        if args.benchmark:
+            print(f"\n⏱️ Benchmarking on {len(texts)} texts "
+                  f"({BackendConfig.ONNX_INTRA_OP_THREADS} intra-op threads) ...")
+            torch_result = benchmark(load_encoder(args.model, "torch"), texts)
+            onnx_result = benchmark(OnnxEncoder(export_folder(args.model)), texts)
+            print(f"  - PyTorch fp32: {torch_result['texts_per_second']:.1f} texts/s")
+            print(f"  - ONNX int8:    {onnx_result['texts_per_second']:.1f} texts/s")
+            print(f"  - Speedup:      {onnx_result['texts_per_second'] / torch_result['texts_per_second']:.2f}x")
+    except Exception as e:
+        print(f"❌ Error exporting encoder: {str(e)}")
+        sys.exit(1)
+
+    print("\nℹ️ Enable the backend with EMBEDDING_BACKEND=onnx")
+
+
+if __name__ == "__main__":
+    main()
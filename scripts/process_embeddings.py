@@ -12,6 +12,8 @@ sys.path.append(str(Path(__file__).parent.parent / "app"))
 
 from app.embedding.embed_posts import process_and_store_embeddings
 from app.utils.file_utils import list_files_by_pattern
+from app.monitoring.metrics import print_stage_summary
+from app.monitoring.tracking import flush as flush_tracking
 
 
 def main():
@@ -19,6 +21,9 @@ def main():
     parser.add_argument("dataset_name", help="Dataset name to process (e.g., aapl_20241201_143022)")
     parser.add_argument("--model", help="Embedding model to use (default: all-MiniLM-L6-v2)")
     parser.add_argument("--list-available", action="store_true", help="List available datasets")
+    parser.add_argument("--profile", choices=["small", "medium", "large"], help="Collection profile (default: chosen by size)")
+    parser.add_argument("--reduce", help="Reduce stored vectors, e.g. 'pca:128' or 'truncate:256' (default: EMBEDDING_REDUCTION)")
+    parser.add_argument("--timings", action="store_true", help="Print per-stage timings when done")
     
     args = parser.parse_args()
     
@@ -40,13 +45,20 @@ def main():
         print(f"🧠 Using embedding model: {args.model}")
     
     try:
-        embeddings, df = process_and_store_embeddings(args.dataset_name)
+        embeddings, df = process_and_store_embeddings(args.dataset_name, args.reduce, args.profile)
         print(f"✅ Successfully processed embeddings for {args.dataset_name}")
         print(f"📊 Processed {len(df)} posts")
         print(f"🔢 Embedding dimensions: {embeddings.shape[1]}")
+        if args.timings:
+            print_stage_summary()
     except Exception as e:
         print(f"❌ Error processing embeddings: {str(e)}")
+        flush_tracking()
         sys.exit(1)
+    
+    # The tracker runs on a daemon thread; give it a chance to send the run
+    if not flush_tracking():
+        print("⚠️ MLflow tracking did not finish in time, some events were not sent")
 
 
 if __name__ == "__main__":
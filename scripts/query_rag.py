@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent / "app"))
 
 from app.rag.query_engine import search_similar_posts, generate_answer_from_context
 from app.utils.datetime_utils import parse_dataset_name
+from app.monitoring.metrics import print_stage_summary
 
 
 def main():
@@ -20,7 +21,10 @@ def main():
     parser.add_argument("--stock", help="Stock symbol (e.g., AAPL, TSLA)")
     parser.add_argument("--collection", help="Collection name to search in")
     parser.add_argument("--top-k", type=int, default=5, help="Number of similar posts to retrieve (default: 5)")
+    parser.add_argument("--mmr-lambda", type=float, help="Re-rank with MMR: 1.0 = relevance only, "
+                        "lower values favour diverse posts (default: MMR_LAMBDA or off)")
     parser.add_argument("--show-context", action="store_true", help="Show retrieved context posts")
+    parser.add_argument("--timings", action="store_true", help="Print per-stage timings when done")
     
     args = parser.parse_args()
     
@@ -41,11 +45,16 @@ def main():
     print(f"❓ Question: {args.question}")
     print(f"📊 Collection: {collection_name}")
     print(f"📈 Top-k: {args.top_k}")
+    if args.mmr_lambda is not None:
+        if not 0.0 <= args.mmr_lambda <= 1.0:
+            print("❌ --mmr-lambda must be between 0 and 1")
+            sys.exit(1)
+        print(f"🔀 MMR lambda: {args.mmr_lambda}")
     
     try:
         # Search for similar posts
         print("\n🔍 Searching for similar posts...")
-        context_posts = search_similar_posts(args.question, collection_name, args.top_k)
+        context_posts = search_similar_posts(args.question, collection_name, args.top_k, args.mmr_lambda)
         
         if args.show_context:
             print(f"\n📋 Retrieved {len(context_posts)} context posts:")
@@ -60,6 +69,8 @@ def main():
         
         print(f"\n💡 Answer:")
         print(f"{answer}")
+        if args.timings:
+            print_stage_summary()
         
     except Exception as e:
         print(f"❌ Error querying RAG system: {str(e)}")
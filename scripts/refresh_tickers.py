@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Script to keep watched tickers current with incremental refreshes.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from app.scheduler import WatchedTicker, get_scheduler
+from app.monitoring.metrics import print_stage_summary
+from app.monitoring.tracking import flush as flush_tracking
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally refresh watched tickers")
+    parser.add_argument("--add", nargs="+", metavar="SYMBOL", help="Add tickers to the watchlist")
+    parser.add_argument("--remove", nargs="+", metavar="SYMBOL", help="Remove tickers from the watchlist")
+    parser.add_argument("--query", help="Search query for tickers added with --add (default: 'SYMBOL stock')")
+    parser.add_argument("--interval", type=int, help="Refresh interval in seconds for tickers added with --add")
+    parser.add_argument("--list", action="store_true", help="List watched tickers")
+    parser.add_argument("--once", action="store_true", help="Refresh all watched tickers once and exit")
+    parser.add_argument("--timings", action="store_true", help="Print per-stage timings when done (with --once)")
+
+    args = parser.parse_args()
+    scheduler = get_scheduler()
+
+    for symbol in args.add or []:
+        ticker = scheduler.watchlist.add(WatchedTicker(symbol, args.query, args.interval))
+        print(f"👀 Watching {ticker.symbol} → {ticker.collection_name} (every {ticker.interval}s)")
+    for symbol in args.remove or []:
+        if scheduler.watchlist.remove(symbol):
+            print(f"🗑️ Removed {symbol.upper()}")
+        else:
+            print(f"⚠️ {symbol.upper()} is not watched")
+
+    if args.list:
+        tickers = scheduler.watchlist.all()
+        if not tickers:
+            print("❌ Watchlist is empty, add tickers with --add")
+        for ticker in tickers:
+            print(f"  - {ticker.symbol}: '{ticker.query}' every {ticker.interval}s → {ticker.collection_name}")
+        return
+    if args.add or args.remove:
+        if not args.once:
+            return
+
+    if args.once:
+        results = scheduler.run_once()
+        for result in results:
+            if result["status"] == "completed":
+                print(f"✅ {result['symbol']}: {result['appended']} new posts, "
+                      f"{result['updated']} updated ({result['duration_seconds']}s)")
+            else:
+                print(f"❌ {result['symbol']}: {result['message']}")
+        if args.timings:
+            print_stage_summary()
+        flush_tracking()
+        if any(result["status"] == "failed" for result in results):
+            sys.exit(1)
+        return
+
+    if not scheduler.start():
+        sys.exit(1)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        print("🛑 Stopping scheduler")
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
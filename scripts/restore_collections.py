@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Script to restore vector store collections from saved datasets without re-embedding.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+
+from app.vector_store.restore import CollectionRestorer
+from app.monitoring.metrics import print_stage_summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Restore Qdrant collections from saved .npy/dataset files")
+    parser.add_argument("datasets", nargs="*", help="Datasets to restore (default: all saved datasets)")
+    parser.add_argument("--recreate", action="store_true", help="Drop and rebuild collections that already exist")
+    parser.add_argument("--workers", type=int, help="Concurrent upload batches per collection (default: RESTORE_WORKERS)")
+    parser.add_argument("--list-available", action="store_true", help="List restorable datasets")
+    parser.add_argument("--timings", action="store_true", help="Print per-stage timings when done")
+
+    args = parser.parse_args()
+    restorer = CollectionRestorer(workers=args.workers)
+
+    if args.list_available:
+        datasets = restorer.discover_datasets()
+        if datasets:
+            print("📋 Restorable datasets:")
+            for dataset_name in datasets:
+                print(f"  - {dataset_name}")
+        else:
+            print("❌ No datasets with saved embeddings found in data/processed/npy/")
+        return
+
+    results = restorer.restore_all(args.datasets or None, args.recreate)
+    if not results:
+        print("❌ Nothing to restore")
+        sys.exit(1)
+
+    for result in results:
+        status = result["status"]
+        icon = {"restored": "✅", "skipped": "⏭️"}.get(status, "❌")
+        detail = f"{result['num_points']} points" if status == "restored" else result.get("message", "")
+        print(f"{icon} {result['dataset']}: {status} ({detail})")
+
+    if args.timings:
+        print_stage_summary()
+    if any(result["status"] == "failed" for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
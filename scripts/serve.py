@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Production server: gunicorn with uvicorn workers and the app preloaded before forking.
+
+The parent process imports the app, which loads the embedding model once, warms
+it up and freezes the garbage collector, then forks the workers. The model
+weights are shared copy-on-write instead of being loaded per worker, and no
+worker pays the warm-up on its first request.
+
+Prometheus metrics run in multiprocess mode: every worker writes its values to
+``PROMETHEUS_MULTIPROC_DIR``, so a scrape of ``/metrics`` on any worker reports
+the whole server rather than the one worker that answered.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from gunicorn.app.base import BaseApplication
+
+
+class ServerConfig:
+    """Configuration for the preforking server."""
+
+    HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    PORT = int(os.getenv("SERVER_PORT", "8000"))
+    WORKERS = int(os.getenv("SERVER_WORKERS", str(os.cpu_count() or 1)))
+
+    # Seconds a worker may be silent before it is restarted
+    TIMEOUT = int(os.getenv("SERVER_TIMEOUT", "120"))
+
+    # Shared folder for the metric values of all workers, emptied on start
+    METRICS_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "rag-prometheus"))
+
+
+def post_fork(server, worker) -> None:
+    """Re-initialize per-process state inherited from the parent."""
+    from app.embedding.backends import after_fork
+
+    after_fork()
+
+
+def child_exit(server, worker) -> None:
+    """Drop the live metric values of a worker that exited."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def prepare_metrics_dir(path: str) -> None:
+    """
+    Enable multiprocess metrics in ``path`` before the app imports prometheus_client.
+
+    Args:
+        path: Folder for the per-process value files
+    """
+    folder = Path(path)
+    folder.mkdir(parents=True, exist_ok=True)
+    # Values of a previous server run would otherwise be added to the new one
+    for stale in folder.glob("*.db"):
+        stale.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(folder)
+
+
+class PreloadedApplication(BaseApplication):
+    """Gunicorn application that loads and warms the app in the parent process."""
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Forked tokenizers would otherwise warn and disable their thread pool
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+        start = time.perf_counter()
+        from app.main import app
+        from app.embedding.backends import warm_up_encoders
+
+        warm_up_encoders()
+        # Objects created so far are never collected, so the collector's
+        # bookkeeping does not write to (and un-share) their pages in the workers
+        gc.freeze()
+        print(f"🧠 App und Modelle in {time.perf_counter() - start:.1f}s geladen "
+              f"({gc.get_freeze_count()} Objekte eingefroren)")
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with preloaded, shared models")
+    parser.add_argument("--host", default=ServerConfig.HOST, help=f"Bind address (default: {ServerConfig.HOST})")
+    parser.add_argument("--port", type=int, default=ServerConfig.PORT, help=f"Port (default: {ServerConfig.PORT})")
+    parser.add_argument("--workers", type=int, default=ServerConfig.WORKERS,
+                        help=f"Number of worker processes (default: {ServerConfig.WORKERS})")
+    parser.add_argument("--timeout", type=int, default=ServerConfig.TIMEOUT,
+                        help=f"Worker timeout in seconds (default: {ServerConfig.TIMEOUT})")
+
+    args = parser.parse_args()
+
+    prepare_metrics_dir(ServerConfig.METRICS_DIR)
+    print(f"🚀 Starte {args.workers} Worker auf {args.host}:{args.port}")
+    PreloadedApplication({
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "timeout": args.timeout,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# tests/conftest.py
+import hashlib
+import os
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+
+
+class FakeEncoder:
+    """Deterministic bag-of-words encoder standing in for the embedding model."""
+
+    max_seq_length = 128
+    tokenizer = None
+    dim = 16
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[i, int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+
+
+@pytest.fixture
+def qdrant_memory(monkeypatch):
+    """Route the shared Qdrant client to a fresh in-memory instance."""
+    from app.vector_store.connection import get_qdrant_client
+
+    shared = get_qdrant_client()
+    monkeypatch.setattr(shared, "_client", QdrantClient(":memory:"))
+    monkeypatch.setattr(shared, "_pid", os.getpid())
+    return shared
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """Point the dataset files and the collection registry at a temporary folder."""
+    from app.data import reddit_client
+    from app.embedding import embed_posts
+    from app.scheduler import refresh
+    from app.vector_store import registry
+
+    folders = {name: tmp_path / name for name in ("csv", "posts", "npy", "chunks", "dedup", "projections")}
+    for folder in folders.values():
+        folder.mkdir()
+    for module in (reddit_client, embed_posts):
+        monkeypatch.setattr(module, "CSV_FOLDER", folders["csv"])
+    for module in (reddit_client, embed_posts, refresh):
+        monkeypatch.setattr(module, "POSTS_FOLDER", folders["posts"])
+    monkeypatch.setattr(
+        registry, "_default_registry", registry.CollectionRegistry(tmp_path / "collections.json")
+    )
+    return folders
+
+
+@pytest.fixture
+def processor(data_dirs, qdrant_memory, monkeypatch):
+    """Embedding processor with a fake encoder writing into ``data_dirs``."""
+    from app.embedding import embed_posts
+
+    monkeypatch.setattr(embed_posts, "load_encoder", lambda *args, **kwargs: FakeEncoder())
+    processor = embed_posts.EmbeddingProcessor()
+    processor.npy_folder = data_dirs["npy"]
+    processor.chunks_folder = data_dirs["chunks"]
+    processor.dedup_folder = data_dirs["dedup"]
+    processor.projections_folder = data_dirs["projections"]
+    return processor
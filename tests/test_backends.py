@@ -0,0 +1,48 @@
+# tests/test_backends.py
+import json
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from app.embedding import backends
+
+
+class SeededEncoder:
+    """Random but deterministic embeddings, optionally drifting like a lossy export."""
+
+    def __init__(self, noise=0.0):
+        self.noise = noise
+
+    def encode(self, texts, **kwargs):
+        base = np.random.default_rng(0).normal(size=(len(texts), 16))
+        drift = np.random.default_rng(1).normal(scale=self.noise, size=base.shape)
+        return (base + drift).astype(np.float32)
+
+
+def test_identical_encoders_pass_parity():
+    parity = backends.parity_check(SeededEncoder(), SeededEncoder())
+    assert parity["min_cosine"] > 0.999
+    assert parity["mean_cosine"] > 0.999
+
+
+def test_drifting_encoder_fails_parity():
+    parity = backends.parity_check(SeededEncoder(), SeededEncoder(noise=0.5), ["bullish on tsla", "sell apple now"])
+    assert parity["min_cosine"] <= parity["mean_cosine"]
+    assert parity["min_cosine"] < backends.BackendConfig.MIN_PARITY
+
+
+@pytest.mark.parametrize("min_cosine", [None, 0.5])
+def test_onnx_backend_falls_back_to_torch_without_passing_export(tmp_path, monkeypatch, min_cosine):
+    monkeypatch.setattr(backends, "ONNX_FOLDER", tmp_path)
+    if min_cosine is not None:
+        folder = backends.export_folder("org/model")
+        folder.mkdir()
+        with open(folder / "encoder.json", "w") as f:
+            json.dump({"parity": {"min_cosine": min_cosine}}, f)
+    torch_module = types.SimpleNamespace(SentenceTransformer=lambda name: ("torch", name))
+    monkeypatch.setitem(sys.modules, "sentence_transformers", torch_module)
+    monkeypatch.setattr(backends, "OnnxEncoder", lambda folder: pytest.fail("loaded a failing export"))
+
+    assert backends._load_encoder("org/model", "onnx") == ("torch", "org/model")
@@ -0,0 +1,86 @@
+# tests/test_chunking.py
+import pandas as pd
+
+from app.embedding.chunking import build_chunks, build_comment_chunks, chunk_text
+
+POSTS = pd.DataFrame({"id": ["p1"], "title": ["TSLA earnings"], "selftext": [""]})
+
+
+
+def count_words(texts):
+    return [len(text.split()) for text in texts]
+
+
+def sentences(n):
+    return [f"Sentence number {i} about deliveries." for i in range(n)]
+
+
+def test_short_text_stays_one_passage():
+    assert chunk_text("Short post. Two sentences.", 50, 10, count_words) == ["Short post. Two sentences."]
+    assert chunk_text("   ", 50) == []
+
+
+def test_long_text_is_split_on_sentences_with_overlap():
+    text = " ".join(sentences(20))
+    passages = chunk_text(text, max_tokens=20, overlap_tokens=5, count_tokens=count_words)
+
+    assert len(passages) > 1
+    assert all(n <= 20 for n in count_words(passages))
+    # Every sentence is kept, and consecutive passages share their boundary sentence
+    assert all(any(s in p for p in passages) for s in sentences(20))
+    for previous, following in zip(passages, passages[1:]):
+        assert following.startswith(previous.split(". ")[-1].rstrip("."))
+
+
+def test_oversized_sentence_is_split_into_word_windows():
+    text = " ".join(f"word{i}" for i in range(100))
+    passages = chunk_text(text, max_tokens=30, count_tokens=count_words)
+    assert all(n <= 30 for n in count_words(passages))
+    assert " ".join(passages).split() == text.split()
+
+
+def test_build_chunks_prefixes_title_and_keeps_empty_posts():
+    df = pd.DataFrame({
+        "id": ["p1", "p2"],
+        "title": ["TSLA DD", "Link only"],
+        "selftext": [" ".join(sentences(40)), None],
+    })
+    chunks = build_chunks(df, max_tokens=64, overlap_tokens=8, count_tokens=count_words)
+
+    long_post = chunks[chunks["post_id"] == "p1"]
+    assert len(long_post) > 1
+    assert (long_post["num_chunks"] == len(long_post)).all()
+    assert long_post["embed_text"].str.startswith("TSLA DD ").all()
+    assert (chunks["num_tokens"] <= 64).all()
+    assert chunks[chunks["post_id"] == "p2"][["chunk_index", "embed_text"]].values.tolist() == [[0, "Link only"]]
+
+
+def test_comment_chunks_are_child_documents_of_known_posts():
+    comments = pd.DataFrame({
+        "id": ["c1", "c2", "c3"],
+        "post_id": ["p1", "p1", "gone"],
+        "body": ["Margins look great.", " ".join(["Long thread about deliveries."] * 40), "orphan"],
+        "score": [12, 3, 1],
+        "created_utc": [100.0, 200.0, 300.0],
+    })
+
+    chunks = build_comment_chunks(comments, POSTS, max_tokens=64)
+
+    # Comments of posts dropped by dedup are left out
+    assert set(chunks["comment_id"]) == {"c1", "c2"}
+    assert (chunks["post_id"] == "p1").all()
+    assert chunks["embed_text"].str.startswith("TSLA earnings ").all()
+    assert (chunks["num_tokens"] <= 64).all()
+
+    long_comment = chunks[chunks["comment_id"] == "c2"]
+    assert len(long_comment) > 1
+    assert long_comment["chunk_index"].tolist() == list(range(len(long_comment)))
+    assert (long_comment["num_chunks"] == len(long_comment)).all()
+    assert chunks.loc[chunks["comment_id"] == "c1", "comment_score"].tolist() == [12]
+
+
+def test_comment_chunks_of_empty_input_keep_columns():
+    comments = pd.DataFrame(columns=["id", "post_id", "body", "score", "created_utc"])
+    chunks = build_comment_chunks(comments, POSTS, max_tokens=64)
+    assert chunks.empty
+    assert "comment_id" in chunks.columns
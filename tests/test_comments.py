@@ -0,0 +1,80 @@
+# tests/test_comments.py
+import threading
+import time
+
+import pandas as pd
+
+from app.data import comments as comments_module
+from app.data.comments import CommentCollector
+
+LONG = "I think the delivery numbers will surprise everyone this quarter"
+
+
+class FakeComment:
+    def __init__(self, id, body, replies=(), parent_id="t3_p"):
+        self.id = id
+        self.body = body
+        self.replies = list(replies)
+        self.parent_id = parent_id
+        self.score = 1
+        self.created_utc = 1.7e9
+
+
+class FakeMoreComments:
+    """Stands in for PRAW's MoreComments, which has no body."""
+
+
+class FakeForest(list):
+    def __init__(self, items, source):
+        super().__init__(items)
+        self.source = source
+
+    def replace_more(self, limit):
+        self.source.replace_more_limits.append(limit)
+        return []
+
+
+class FakeSource:
+    """Fake PRAW source that records concurrency and replace_more limits."""
+
+    def __init__(self, trees):
+        self.trees = trees
+        self.replace_more_limits = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def submission(self, id):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        if id == "broken":
+            raise RuntimeError("404")
+        tree = self.trees.get(id, [])
+        return type("Submission", (), {"comments": FakeForest(tree, self)})()
+
+
+def test_comment_trees_are_bounded_and_streamed_to_csv(tmp_path, monkeypatch):
+    monkeypatch.setattr(comments_module, "COMMENTS_FOLDER", tmp_path)
+    deep = FakeComment("c3", LONG + " depth 2", [FakeComment("c4", LONG + " depth 3")])
+    trees = {
+        f"p{i}": [
+            FakeComment(f"p{i}a", LONG, [FakeComment(f"p{i}b", LONG + " reply", [deep])]),
+            FakeComment(f"p{i}s", "+1"),
+            FakeMoreComments(),
+        ]
+        for i in range(10)
+    }
+    source = FakeSource(trees)
+    collector = CommentCollector(source, max_workers=3, max_depth=1, replace_more_limit=2)
+
+    written = collector.collect([f"p{i}" for i in range(10)] + ["broken"], "tsla")
+
+    result = pd.read_csv(tmp_path / "tsla.csv")
+    assert written == len(result) == 20
+    assert set(result["depth"]) == {0, 1}
+    assert set(source.replace_more_limits) == {2}
+    assert source.max_active <= 3
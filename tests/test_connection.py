@@ -0,0 +1,86 @@
+# tests/test_connection.py
+import os
+
+import pytest
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from app.vector_store import connection
+from app.vector_store.connection import SharedQdrantClient
+
+
+def unexpected(status_code):
+    return UnexpectedResponse(status_code, "", b"", None)
+
+
+class FlakyClient:
+    """Client whose ``search`` fails with the given errors before answering."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def search(self, collection_name):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return collection_name
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(connection.time, "sleep", lambda seconds: None)
+
+
+def test_transient_errors_are_retried():
+    flaky = FlakyClient([ConnectionError(), unexpected(503)])
+    client = SharedQdrantClient(lambda: flaky)
+    assert client.search("posts") == "posts"
+    assert flaky.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    flaky = FlakyClient([unexpected(404)])
+    client = SharedQdrantClient(lambda: flaky)
+    with pytest.raises(UnexpectedResponse):
+        client.search("posts")
+    assert flaky.calls == 1
+
+
+def test_retries_are_bounded(monkeypatch):
+    monkeypatch.setattr(connection.QdrantSettings, "MAX_RETRIES", 2)
+    flaky = FlakyClient([TimeoutError()] * 5)
+    client = SharedQdrantClient(lambda: flaky)
+    with pytest.raises(TimeoutError):
+        client.search("posts")
+    assert flaky.calls == 3
+
+
+def test_backoff_stays_within_cap():
+    for attempt in range(10):
+        assert 0 <= connection.backoff_delay(attempt, 0.2, 1.0) <= min(1.0, 0.2 * 2 ** attempt)
+
+
+def test_client_is_recreated_after_fork(monkeypatch):
+    created = []
+    client = SharedQdrantClient(lambda: created.append(object()) or created[-1])
+    first = client.raw
+    assert client.raw is first
+    child_pid = os.getpid() + 1
+    monkeypatch.setattr(connection.os, "getpid", lambda: child_pid)
+    assert client.raw is not first
+    assert len(created) == 2
+
+
+def test_non_idempotent_calls_are_not_retried():
+    class Client:
+        calls = 0
+
+        def create_collection(self, collection_name):
+            self.calls += 1
+            raise TimeoutError()
+
+    raw = Client()
+    client = SharedQdrantClient(lambda: raw)
+    with pytest.raises(TimeoutError):
+        client.create_collection("posts")
+    assert raw.calls == 1
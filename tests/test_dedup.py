@@ -0,0 +1,48 @@
+# tests/test_dedup.py
+import pandas as pd
+
+from app.data.dedup import NearDuplicateIndex
+
+DD_TEXT = (
+    "Tesla delivered record numbers this quarter and I think the stock will "
+    "rally hard after earnings because margins improved a lot"
+)
+
+
+def test_cross_posts_collapse_into_highest_scored_post():
+    df = pd.DataFrame({
+        "id": ["a", "b", "c", "d"],
+        "title": ["DD: TSLA", "DD: TSLA", "Apple", "[xpost] DD: TSLA"],
+        "selftext": [DD_TEXT, DD_TEXT + " edit: typo", "I sold all my Apple shares today", DD_TEXT],
+        "score": [5, 50, 3, 1],
+    })
+    result, _ = NearDuplicateIndex(threshold=0.8).deduplicate(df)
+    assert result["id"].tolist() == ["b", "c"]
+    assert result.loc[0, "duplicate_count"] == 2
+    assert result.loc[0, "aggregate_score"] == 56
+
+
+def test_incremental_add_matches_saved_index(tmp_path):
+    index = NearDuplicateIndex(threshold=0.8)
+    assert index.add("a", DD_TEXT) is None
+    index.save(tmp_path / "index.npz")
+
+    restored = NearDuplicateIndex.load(tmp_path / "index.npz")
+    new_posts = pd.DataFrame({"id": ["e"], "title": [""], "selftext": [DD_TEXT], "score": [2]})
+    result, external = restored.deduplicate(new_posts)
+    assert result.empty
+    assert external == {"a": [0]}
+
+
+def test_posts_without_text_are_kept_apart():
+    df = pd.DataFrame({
+        "id": ["img1", "img2", "img3"],
+        "title": ["", "TSLA", None],
+        "selftext": ["", "  ", None],
+        "score": [10, 5, 1],
+    })
+    index = NearDuplicateIndex(threshold=0.8)
+    result, _ = index.deduplicate(df)
+    assert result["id"].tolist() == ["img1", "img2", "img3"]
+    assert result["duplicate_count"].tolist() == [0, 0, 0]
+    assert index.query("") is None
@@ -0,0 +1,80 @@
+# tests/test_embed_posts.py
+import pandas as pd
+
+DD_TEXT = (
+    "Tesla delivered record numbers this quarter and I think the stock will "
+    "rally hard after earnings because margins improved a lot"
+)
+
+
+def raw_posts():
+    return pd.DataFrame({
+        "id": ["a", "b", "c"],
+        "title": ["DD: TSLA", "[xpost] DD: TSLA", "Apple"],
+        "score": [50, 5, 3],
+        "url": ["", "", ""],
+        "created_utc": [1000.0, 1001.0, 1002.0],
+        "num_comments": [4, 1, 0],
+        "selftext": [DD_TEXT, DD_TEXT, "I sold all my Apple shares today"],
+    })
+
+
+def test_reprocessing_keeps_raw_csv_and_duplicate_counts(processor, data_dirs):
+    raw_path = data_dirs["csv"] / "tsla.csv"
+    raw_posts().to_csv(raw_path, index=False)
+
+    for _ in range(2):
+        _, df, _ = processor.generate_chunk_embeddings("tsla")
+        assert df["id"].tolist() == ["a", "c"]
+        assert df.loc[0, "duplicate_count"] == 1
+        assert df.loc[0, "aggregate_score"] == 55
+
+    assert len(pd.read_csv(raw_path)) == 3
+    stored = pd.read_csv(data_dirs["posts"] / "tsla.csv")
+    assert stored["id"].tolist() == ["a", "c"]
+    assert "sentiment" in stored.columns
+
+
+def test_append_posts_folds_reposts_into_known_posts(processor, data_dirs):
+    from app.rag.warmup import collection_version
+    from app.vector_store.client import scroll_payloads
+
+    posts = raw_posts()
+    assert processor.append_posts("tsla_live", posts.iloc[[0, 2]]) == 2
+
+    version = collection_version("tsla_live")
+    repost = posts.iloc[[1]].assign(id="d")
+    assert processor.append_posts("tsla_live", repost) == 0
+    # Already seen, so it is not counted twice
+    assert processor.append_posts("tsla_live", repost) == 0
+    # The fold-in changes payloads only, which still outdates precomputed answers
+    assert collection_version("tsla_live") != version
+
+    stored = pd.read_csv(data_dirs["posts"] / "tsla_live.csv").set_index("id")
+    assert stored.loc["a", "duplicate_count"] == 1
+    assert stored.loc["a", "aggregate_score"] == 55
+    assert pd.read_csv(data_dirs["csv"] / "tsla_live.csv")["id"].tolist() == ["a", "c", "d"]
+
+    payloads = scroll_payloads("tsla_live", ["post_id", "duplicate_count", "aggregate_score"])
+    assert {p["post_id"] for p in payloads} == {"a", "c"}
+    assert [p["aggregate_score"] for p in payloads if p["post_id"] == "a"] == [55]
+
+
+def test_append_posts_folds_into_posts_stored_without_counts(processor, data_dirs):
+    from app.data.dedup import NearDuplicateIndex
+
+    posts = raw_posts()
+    stored = posts.iloc[[0, 2]].reset_index(drop=True)
+    processor.append_posts("tsla_live", stored)
+    # As written by a collection built with DEDUP_THRESHOLD=0
+    stored.to_csv(data_dirs["posts"] / "tsla_live.csv", index=False)
+    index = NearDuplicateIndex(0.8)
+    index.deduplicate(stored)
+    index.save(data_dirs["dedup"] / "tsla_live.npz")
+
+    assert processor.append_posts("tsla_live", posts.iloc[[1]].assign(id="d")) == 0
+
+    result = pd.read_csv(data_dirs["posts"] / "tsla_live.csv").set_index("id")
+    assert result.loc["a", "duplicate_count"] == 1
+    assert result.loc["a", "aggregate_score"] == 55
+    assert pd.isna(result.loc["c", "duplicate_count"])
@@ -0,0 +1,28 @@
+# tests/test_file_utils.py
+import numpy as np
+
+from app.utils.file_utils import append_npy_rows
+
+
+def test_append_npy_rows_grows_matrix_in_place(tmp_path):
+    path = str(tmp_path / "embeddings.npy")
+    first = np.random.rand(3, 4).astype(np.float32)
+    second = np.random.rand(1200, 4).astype(np.float32)
+
+    append_npy_rows(path, first)
+    append_npy_rows(path, second)
+
+    stored = np.load(path, mmap_mode="r")
+    assert stored.shape == (1203, 4)
+    np.testing.assert_array_equal(stored[:3], first)
+    np.testing.assert_array_equal(stored[3:], second)
+
+
+def test_append_npy_rows_rewrites_on_dtype_mismatch(tmp_path):
+    path = str(tmp_path / "embeddings.npy")
+    append_npy_rows(path, np.zeros((2, 4), dtype=np.float32))
+    append_npy_rows(path, np.ones((1, 4), dtype=np.float64))
+
+    stored = np.load(path)
+    assert stored.shape == (3, 4)
+    assert stored[2].tolist() == [1.0] * 4
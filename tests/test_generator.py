@@ -0,0 +1,14 @@
+# tests/test_generator.py
+from app.llm.generator import build_context_block
+
+
+def test_context_block_stays_within_budget_and_cuts_only_the_first_post():
+    posts = [{"title": f"Post {i}", "selftext": "word " * 40} for i in range(5)]
+
+    block, used = build_context_block(posts, max_tokens=120)
+    assert used == 2
+    assert block.count("Post ") == 2
+
+    block, used = build_context_block(posts, max_tokens=20)
+    assert used == 1
+    assert len(block.split()) < 20
@@ -0,0 +1,151 @@
+# tests/test_llm_gateway.py
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+from app.llm.gateway import LLMConfig, LLMGateway, LLMUnavailableError
+
+
+class FakeOpenAIServer:
+    """OpenAI-compatible /v1/chat/completions answering with the requested model name."""
+
+    def __init__(self, delay=0.0, rate_limited=0, rate_limited_models=()):
+        self.calls = []
+        self.delay = delay
+        self.rate_limited = rate_limited
+        self.rate_limited_models = set(rate_limited_models)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.calls.append(body["model"])
+                time.sleep(server.delay)
+                if server.rate_limited > 0 or body["model"] in server.rate_limited_models:
+                    server.rate_limited -= 1
+                    self._send(429, {"error": {"message": "rate limited", "type": "rate_limit"}},
+                               {"Retry-After": "0"})
+                    return
+                self._send(200, {
+                    "id": "chatcmpl-1",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": f"answer from {body['model']}"}}],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                })
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.client = OpenAI(
+            api_key="test", base_url=f"http://127.0.0.1:{self.httpd.server_port}/v1", max_retries=0
+        )
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_server():
+    servers = []
+
+    def start(**kwargs):
+        servers.append(FakeOpenAIServer(**kwargs))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_identical_concurrent_requests_share_one_call(fake_server):
+    server = fake_server(delay=0.3)
+    gateway = LLMGateway(client=server.client, model="primary", fallback_model="")
+    messages = [{"role": "user", "content": "Wie ist die Stimmung zu TSLA?"}]
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: gateway.complete(messages), range(5)))
+
+    assert server.calls == ["primary"]
+    assert {r.text for r in results} == {"answer from primary"}
+    assert sum(r.coalesced for r in results) == 4
+
+
+def test_rate_limit_is_retried(fake_server, monkeypatch):
+    monkeypatch.setattr(LLMConfig, "MAX_RETRIES", 3)
+    server = fake_server(rate_limited=2)
+    gateway = LLMGateway(client=server.client, model="primary", fallback_model="")
+
+    result = gateway.complete([{"role": "user", "content": "Frage"}])
+
+    assert server.calls == ["primary"] * 3
+    assert result.model == "primary"
+
+
+def test_falls_back_when_primary_stays_rate_limited(fake_server, monkeypatch):
+    monkeypatch.setattr(LLMConfig, "MAX_RETRIES", 1)
+    server = fake_server(rate_limited_models={"primary"})
+    gateway = LLMGateway(client=server.client, model="primary", fallback_model="cheap")
+
+    result = gateway.complete([{"role": "user", "content": "Frage"}])
+
+    assert server.calls == ["primary", "primary", "cheap"]
+    assert result.text == "answer from cheap"
+
+
+def test_falls_back_when_primary_budget_is_exhausted(fake_server, monkeypatch):
+    monkeypatch.setattr(LLMConfig, "FALLBACK_AFTER_SECONDS", 0.05)
+    server = fake_server()
+    # One request per minute: the second request would wait about a minute for the primary
+    gateway = LLMGateway(client=server.client, model="primary", fallback_model="cheap", requests_per_minute=1)
+
+    first = gateway.complete([{"role": "user", "content": "Frage 1"}])
+    second = gateway.complete([{"role": "user", "content": "Frage 2"}])
+
+    assert (first.model, second.model) == ("primary", "cheap")
+
+
+def test_fails_instead_of_waiting_when_no_model_has_budget(fake_server, monkeypatch):
+    monkeypatch.setattr(LLMConfig, "FALLBACK_AFTER_SECONDS", 0.05)
+    monkeypatch.setattr(LLMConfig, "MAX_BUDGET_WAIT_SECONDS", 0.1)
+    server = fake_server()
+    gateway = LLMGateway(client=server.client, model="primary", fallback_model="cheap", requests_per_minute=1)
+    gateway.complete([{"role": "user", "content": "Frage 1"}])
+    gateway.complete([{"role": "user", "content": "Frage 2"}])
+
+    started = time.perf_counter()
+    with pytest.raises(LLMUnavailableError):
+        gateway.complete([{"role": "user", "content": "Frage 3"}])
+    assert time.perf_counter() - started < 1.0
+    assert server.calls == ["primary", "cheap"]
+
+
+def test_rate_limited_primary_gets_its_tokens_back(fake_server, monkeypatch):
+    monkeypatch.setattr(LLMConfig, "MAX_RETRIES", 0)
+    server = fake_server(rate_limited_models={"primary"})
+    gateway = LLMGateway(client=server.client, model="primary", fallback_model="cheap", tokens_per_minute=2000)
+
+    result = gateway.complete([{"role": "user", "content": "Frage"}], max_tokens=800)
+
+    assert result.model == "cheap"
+    assert gateway._model_buckets("primary")[1].try_acquire(1500)
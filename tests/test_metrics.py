@@ -0,0 +1,51 @@
+# tests/test_metrics.py
+import time
+
+import pytest
+
+from app.monitoring.metrics import render_metrics, span, stage_summary, timed
+
+
+def test_span_records_duration_and_errors():
+    with span("test_sleep") as result:
+        time.sleep(0.01)
+    with pytest.raises(RuntimeError):
+        with span("test_sleep"):
+            raise RuntimeError("boom")
+
+    assert result.elapsed >= 0.01
+    summary = stage_summary()["test_sleep"]
+    assert summary["count"] == 2
+    assert summary["total_seconds"] >= 0.01
+
+    payload, content_type = render_metrics()
+    text = payload.decode()
+    assert 'rag_stage_errors_total{stage="test_sleep"} 1.0' in text
+    assert 'rag_stage_duration_seconds_count{stage="test_sleep"} 2.0' in text
+    assert content_type.startswith("text/plain")
+
+
+def test_timed_decorator_keeps_the_return_value():
+    @timed("test_timed")
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    assert stage_summary()["test_timed"]["count"] == 1
+
+
+def test_multiprocess_scrape_sums_all_workers(tmp_path):
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    root = Path(__file__).resolve().parent.parent
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    record = "from app.monitoring.metrics import POSTS_EMBEDDED; POSTS_EMBEDDED.inc(3)"
+    render = "from app.monitoring.metrics import render_metrics; print(render_metrics()[0].decode())"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], cwd=root, env=env, check=True)
+    scrape = subprocess.run([sys.executable, "-c", render], cwd=root, env=env, check=True, capture_output=True, text=True)
+
+    assert "rag_posts_embedded_total 6.0" in scrape.stdout
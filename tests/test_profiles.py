@@ -0,0 +1,51 @@
+# tests/test_profiles.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.vector_store.profiles import DEFAULT_PROFILE, select_profile
+
+
+@pytest.mark.parametrize("points, expected", [
+    (0, "small"),
+    (10_000, "small"),
+    (10_001, "medium"),
+    (200_000, "medium"),
+    (200_001, "large"),
+    (5_000_000, "large"),
+])
+def test_profile_follows_collection_size(points, expected):
+    assert select_profile(points).name == expected
+
+
+def test_explicit_profile_wins_over_size():
+    assert select_profile(50, "large").name == "large"
+    assert select_profile(None).name == DEFAULT_PROFILE
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        select_profile(50, "huge")
+
+
+def test_bulk_load_defers_indexing_and_large_collections_are_quantized():
+    small, large = select_profile(100), select_profile(1_000_000)
+    assert small.optimizers_config(bulk=True).indexing_threshold == 0
+    assert small.optimizers_config().indexing_threshold == small.indexing_threshold
+    assert small.quantization_config() is None
+    assert large.quantization_config() is not None
+    assert large.search_params().quantization.rescore
+
+
+def test_upload_applies_chosen_profile(qdrant_memory, tmp_path):
+    from app.vector_store.client import VectorStoreClient
+
+    csv_path = tmp_path / "posts.csv"
+    pd.DataFrame({"id": ["a", "b"], "title": ["TSLA", "AAPL"], "selftext": ["up", "down"]}).to_csv(csv_path, index=False)
+    embeddings = np.random.default_rng(0).random((2, 8)).astype(np.float32)
+    store = VectorStoreClient(qdrant_memory)
+
+    assert store.upload_embeddings_with_payloads(embeddings, str(csv_path), "sized") == "small"
+    assert store.upload_embeddings_with_payloads(embeddings, str(csv_path), "forced", profile="large") == "large"
+    params = qdrant_memory.get_collection("forced").config.params
+    assert params.vectors.on_disk
@@ -0,0 +1,23 @@
+# tests/test_progress.py
+import asyncio
+
+from app.monitoring.progress import ProgressBroker
+
+
+def test_slow_subscriber_keeps_newest_events_and_late_subscriber_gets_latest():
+    async def scenario():
+        broker = ProgressBroker(buffer_size=3)
+        slow = broker.subscribe("tsla")
+        for i in range(10):
+            broker.publish("tsla", {"type": "progress", "stage": "encode", "items": i})
+        events = await slow.get(timeout=1)
+        late = broker.subscribe("tsla")
+        replayed = await late.get(timeout=1)
+        broker.unsubscribe("tsla", slow)
+        broker.unsubscribe("tsla", late)
+        return slow, events, replayed
+
+    slow, events, replayed = asyncio.run(scenario())
+    assert [e["items"] for e in events] == [7, 8, 9]
+    assert slow.dropped == 7
+    assert replayed[0]["items"] == 9
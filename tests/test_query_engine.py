@@ -0,0 +1,57 @@
+# tests/test_query_engine.py
+from types import SimpleNamespace
+
+from app.rag.query_engine import merge_chunk_hits
+
+
+def hit(point_id, score, **payload):
+    return SimpleNamespace(id=point_id, score=score, payload=payload, vector=None)
+
+
+def test_comment_hits_are_listed_under_their_post():
+    hits = [
+        hit(1, 0.9, post_id="p1", title="TSLA", chunk_index=0, selftext="Deliveries beat.",
+            doc_type="comment", comment_id="c1", comment_score=40, comment_sentiment=0.7),
+        hit(2, 0.8, post_id="p2", title="AAPL", chunk_index=0, selftext="Services grow."),
+        hit(3, 0.7, post_id="p1", title="TSLA", chunk_index=1, selftext="Margins shrink."),
+        hit(4, 0.6, post_id="p1", title="TSLA", chunk_index=1, selftext="second part",
+            doc_type="comment", comment_id="c1", comment_score=40),
+        hit(5, 0.5, post_id="p1", title="TSLA", chunk_index=0, selftext="Sell.",
+            doc_type="comment", comment_id="c2", comment_score=2),
+    ]
+
+    posts = merge_chunk_hits(hits, top_k=2)
+
+    assert [p["post_id"] for p in posts] == ["p1", "p2"]
+    tesla = posts[0]
+    # Comment fields of the best hit do not leak into the post
+    assert "comment_id" not in tesla and "doc_type" not in tesla
+    assert tesla["selftext"] == "Margins shrink."
+    assert tesla["comments"] == [
+        {"comment_id": "c1", "score": 40, "text": "Deliveries beat. […] second part"},
+        {"comment_id": "c2", "score": 2, "text": "Sell."},
+    ]
+    assert tesla["relevance"] == 0.9
+    assert tesla["matched_chunks"] == 4
+
+
+def test_sum_aggregation_adds_chunk_scores():
+    hits = [
+        hit(1, 0.9, post_id="p1", chunk_index=0, selftext="a"),
+        hit(2, 0.8, post_id="p2", chunk_index=0, selftext="b"),
+        hit(3, 0.5, post_id="p2", chunk_index=1, selftext="c"),
+    ]
+    posts = merge_chunk_hits(hits, top_k=1, aggregation="sum")
+    assert posts[0]["post_id"] == "p2"
+    assert posts[0]["selftext"] == "b […] c"
+
+
+def test_negative_similarities_keep_their_order():
+    # Dot-product scores can be negative; the ranking must still follow them
+    hits = [
+        hit(1, -0.2, post_id="a", chunk_index=0, selftext="a0"),
+        hit(2, -0.5, post_id="b", chunk_index=0, selftext="b0"),
+    ]
+    posts = merge_chunk_hits(list(reversed(hits)), top_k=2)
+    assert [p["post_id"] for p in posts] == ["a", "b"]
+    assert [p["relevance"] for p in posts] == [-0.2, -0.5]
@@ -0,0 +1,34 @@
+# tests/test_rate_limit.py
+import time
+
+from app.utils.rate_limit import TokenBucket
+
+
+def test_acquire_times_out_when_empty():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.acquire(2, timeout=0)
+
+    started = time.perf_counter()
+    assert not bucket.acquire(1, timeout=0.05)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_acquire_waits_for_refill():
+    bucket = TokenBucket(rate=50.0, capacity=1)
+    assert bucket.try_acquire()
+
+    started = time.perf_counter()
+    assert bucket.acquire(1, timeout=1.0)
+    assert 0.01 < time.perf_counter() - started < 0.5
+
+
+def test_refund_returns_tokens_up_to_capacity():
+    bucket = TokenBucket(rate=0.001, capacity=100)
+    assert bucket.acquire(80, timeout=0)
+    assert not bucket.try_acquire(50)
+
+    bucket.refund(60)
+    assert bucket.try_acquire(50)
+    bucket.refund(1000)
+    assert bucket.try_acquire(100)
+    assert not bucket.try_acquire(1)
@@ -0,0 +1,19 @@
+# tests/test_readiness.py
+import app.monitoring.readiness as readiness_module
+from app.monitoring.readiness import Readiness
+
+
+def test_ready_only_after_successful_warm_up(monkeypatch):
+    readiness = Readiness()
+    assert not readiness.ready
+
+    def failing_warm_up():
+        raise RuntimeError("model missing")
+
+    monkeypatch.setattr(readiness_module, "warm_up_encoders", failing_warm_up)
+    assert not readiness.warm_up()
+    assert readiness.status()["status"] == "failed"
+
+    monkeypatch.setattr(readiness_module, "warm_up_encoders", lambda: 0.01)
+    assert readiness.warm_up()
+    assert readiness.ready
@@ -0,0 +1,55 @@
+# tests/test_reduction.py
+import numpy as np
+import pytest
+
+from app.embedding.reduction import Projection, parse_reduction_spec, recall_at_k
+
+
+def clustered(n=400, dim=32, clusters=8, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(clusters, size=n)] + 0.1 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def test_pca_projection_round_trips_through_file(tmp_path):
+    embeddings = clustered()
+    projection = Projection.fit(embeddings, "pca", 8)
+    reduced = projection.transform(embeddings)
+
+    assert reduced.shape == (400, 8)
+    np.testing.assert_allclose(np.linalg.norm(reduced, axis=1), 1.0, rtol=1e-5)
+
+    projection.save(tmp_path / "tsla.npz")
+    loaded = Projection.load(tmp_path / "tsla.npz")
+    assert (loaded.method, loaded.input_dim, loaded.output_dim) == ("pca", 32, 8)
+    # Query vectors are projected the same way as the stored ones
+    np.testing.assert_allclose(loaded.transform(embeddings[0]), reduced[0], rtol=1e-5)
+
+
+def test_truncation_keeps_leading_dimensions(tmp_path):
+    embeddings = clustered()
+    projection = Projection.fit(embeddings, "truncate", 4)
+    projection.save(tmp_path / "tsla.npz")
+
+    reduced = Projection.load(tmp_path / "tsla.npz").transform(embeddings)
+    expected = embeddings[:, :4] / np.linalg.norm(embeddings[:, :4], axis=1, keepdims=True)
+    np.testing.assert_allclose(reduced, expected, rtol=1e-5)
+
+
+def test_recall_check_separates_good_and_bad_reductions():
+    embeddings = clustered()
+    good = Projection.fit(embeddings, "pca", 16).transform(embeddings)
+    noise = np.random.default_rng(1).normal(size=(400, 16)).astype(np.float32)
+
+    assert recall_at_k(embeddings, embeddings, k=10) == 1.0
+    assert recall_at_k(embeddings, good, k=10) > 0.5
+    assert recall_at_k(embeddings, noise, k=10) < 0.2
+
+
+def test_reduction_spec_validation():
+    assert parse_reduction_spec("") is None
+    assert parse_reduction_spec("PCA:128") == ("pca", 128)
+    with pytest.raises(ValueError):
+        parse_reduction_spec("svd:64")
+    with pytest.raises(ValueError):
+        Projection.fit(clustered(dim=8), "pca", 8)
@@ -0,0 +1,145 @@
+# tests/test_refresh.py
+from types import SimpleNamespace
+
+import pytest
+
+from app.data import reddit_client
+from app.scheduler import refresh
+from app.scheduler.refresh import TickerRefresher, WatchedTicker
+from app.vector_store.registry import get_collection_info
+
+
+class FakeSubreddit:
+    """Search listing sorted by creation time, newest first, paged like Reddit's."""
+
+    def __init__(self):
+        self.submissions = []
+
+    def post(self, count):
+        start = len(self.submissions)
+        for n in range(start, start + count):
+            self.submissions.insert(0, SimpleNamespace(
+                id=f"p{n}", fullname=f"t3_p{n}", title=f"Post {n}", score=1, url="",
+                created_utc=1000.0 + n, num_comments=0, selftext="",
+            ))
+
+    def search(self, keyword, sort="new", limit=100, params=None):
+        ids = [s.fullname for s in self.submissions]
+        after = (params or {}).get("after")
+        start = ids.index(after) + 1 if after else 0
+        return iter(self.submissions[start:start + limit])
+
+
+@pytest.fixture
+def subreddit(monkeypatch):
+    fake = FakeSubreddit()
+    monkeypatch.setattr(reddit_client, "reddit", SimpleNamespace(subreddit=lambda name: fake))
+    return fake
+
+
+def test_search_new_posts_reports_whether_watermark_was_reached(subreddit):
+    subreddit.post(250)
+
+    capped = reddit_client.search_new_posts("TSLA", since_utc=1000.0, limit=100)
+    assert len(capped["posts"]) == 100
+    assert not capped["complete"]
+    assert capped["after"] == "t3_p150"
+
+    reached = reddit_client.search_new_posts("TSLA", since_utc=1199.0, limit=100)
+    assert len(reached["posts"]) == 50
+    assert reached["complete"]
+
+
+def test_refresh_pages_through_gap_before_moving_watermark(subreddit, data_dirs, monkeypatch):
+    collected = []
+
+    def fake_append(collection_name, df):
+        new = df[~df["id"].isin(collected)]
+        collected.extend(new["id"])
+        return len(new)
+
+    monkeypatch.setattr(refresh, "append_posts", fake_append)
+    monkeypatch.setattr(refresh, "schedule_warmup", lambda *args: False)
+    monkeypatch.setattr(refresh.RefreshConfig, "FETCH_LIMIT", 100)
+    monkeypatch.setattr(TickerRefresher, "refresh_recent", lambda self, name: 0)
+    refresher = TickerRefresher()
+    ticker = WatchedTicker(symbol="TSLA")
+
+    subreddit.post(250)
+    results = [refresher.refresh(ticker) for _ in range(2)]
+    # Posts arriving during the backfill are picked up once the gap is closed
+    subreddit.post(30)
+    results.append(refresher.refresh(ticker))
+    assert [r["fetched"] for r in results] == [100, 100, 50]
+    assert [r["watermark_utc"] for r in results] == [0.0, 0.0, 1249.0]
+
+    result = refresher.refresh(ticker)
+    assert (result["fetched"], result["complete"]) == (30, True)
+    assert sorted(collected) == sorted(f"p{n}" for n in range(280))
+    assert get_collection_info(ticker.collection_name)["backfill_after"] is None
+
+
+def test_refreshed_scores_do_not_schedule_a_warmup(data_dirs, monkeypatch):
+    import time
+
+    import pandas as pd
+
+    from app.vector_store.registry import update_collection_info
+
+    ticker = WatchedTicker(symbol="TSLA")
+    pd.DataFrame({
+        "id": ["p1"], "title": ["TSLA"], "score": [1], "num_comments": [0], "created_utc": [time.time()],
+    }).to_csv(data_dirs["posts"] / f"{ticker.collection_name}.csv", index=False)
+    update_collection_info(ticker.collection_name, npy_sha256="abc")
+
+    scheduled = []
+    monkeypatch.setattr(refresh, "search_new_posts", lambda *args: {"posts": [], "complete": True, "after": None})
+    monkeypatch.setattr(refresh, "fetch_post_stats", lambda ids: {"p1": {"score": 42, "num_comments": 3}})
+    monkeypatch.setattr(refresh, "update_post_fields", lambda name, updates: None)
+    monkeypatch.setattr(refresh, "schedule_warmup", lambda name, symbol: scheduled.append(name))
+
+    result = TickerRefresher().refresh(ticker)
+
+    assert (result["appended"], result["updated"]) == (0, 1)
+    assert scheduled == []
+
+
+def test_refresh_recent_handles_posts_stored_without_counts(data_dirs, monkeypatch):
+    import time
+
+    import pandas as pd
+
+    name = "tsla_live"
+    now = time.time()
+    # Folded-in post "a" carries counts, "c" was stored before dedup kept them
+    pd.DataFrame({
+        "id": ["a", "c"], "title": ["TSLA", "AAPL"], "score": [50, 3], "num_comments": [4, 0],
+        "created_utc": [now, now], "duplicate_count": [1, None], "aggregate_score": [55, None],
+    }).to_csv(data_dirs["posts"] / f"{name}.csv", index=False)
+
+    pushed = {}
+    monkeypatch.setattr(refresh, "fetch_post_stats", lambda ids: {
+        "a": {"score": 60, "num_comments": 4}, "c": {"score": 10, "num_comments": 1},
+    })
+    monkeypatch.setattr(refresh, "update_post_fields", lambda collection, updates: pushed.update(updates))
+
+    assert TickerRefresher().refresh_recent(name) == 2
+    assert pushed["a"]["aggregate_score"] == 65
+    assert pushed["c"]["aggregate_score"] == 10
+    stored = pd.read_csv(data_dirs["posts"] / f"{name}.csv").set_index("id")
+    assert stored.loc["c", "aggregate_score"] == 10
+
+
+def test_only_one_process_runs_the_scheduler(tmp_path, monkeypatch):
+    from app.scheduler.refresh import RefreshScheduler, Watchlist
+
+    monkeypatch.setattr(refresh.RefreshConfig, "TICK_SECONDS", 0.01)
+    first = RefreshScheduler(Watchlist(tmp_path / "watchlist.json"))
+    # A second worker process opens the lock file on its own
+    second = RefreshScheduler(Watchlist(tmp_path / "watchlist.json"))
+
+    assert first.start()
+    assert not second.start()
+    first.stop()
+    assert second.start()
+    second.stop()
@@ -0,0 +1,21 @@
+# tests/test_rerank.py
+import numpy as np
+
+from app.rag.rerank import mmr_select
+
+
+def test_mmr_skips_paraphrases_of_the_top_hit():
+    query = np.array([1.0, 0.0, 0.0])
+    candidates = np.array([
+        [0.95, 0.31, 0.0],   # top hit
+        [0.94, 0.34, 0.0],   # paraphrase of the top hit
+        [0.80, 0.0, 0.60],   # different take, slightly less relevant
+    ])
+
+    assert mmr_select(query, candidates, 2, mmr_lambda=1.0) == [0, 1]
+    assert mmr_select(query, candidates, 2, mmr_lambda=0.5) == [0, 2]
+
+
+def test_mmr_handles_small_pools():
+    assert mmr_select(np.ones(4), np.zeros((0, 4)), 3) == []
+    assert sorted(mmr_select(np.ones(4), np.eye(4)[:2], 5)) == [0, 1]
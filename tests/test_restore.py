@@ -0,0 +1,62 @@
+# tests/test_restore.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.vector_store import registry, restore
+from app.vector_store.client import VectorStoreClient
+from app.vector_store.restore import CollectionRestorer, RestoreError
+
+
+@pytest.fixture
+def restorer(processor, data_dirs, qdrant_memory, monkeypatch):
+    """Restorer reading the files of a dataset ingested through ``processor``."""
+    monkeypatch.setattr(restore, "NPY_FOLDER", data_dirs["npy"])
+    monkeypatch.setattr(restore, "CHUNKS_FOLDER", data_dirs["chunks"])
+    posts = pd.DataFrame({
+        "id": ["a", "b"],
+        "title": ["TSLA to the moon", "Selling AAPL"],
+        "score": [10, 2],
+        "url": ["", ""],
+        "created_utc": [1000.0, 2000.0],
+        "num_comments": [0, 0],
+        "selftext": ["Record deliveries this quarter", "Margins are shrinking"],
+    })
+    processor.append_posts("tsla", posts)
+    return CollectionRestorer(VectorStoreClient(qdrant_memory), workers=2)
+
+
+def test_restore_rebuilds_collection_from_saved_files(restorer, qdrant_memory):
+    expected = qdrant_memory.count("tsla", exact=True).count
+    assert restorer.discover_datasets() == ["tsla"]
+    assert restorer.restore("tsla")["status"] == "skipped"
+
+    result = restorer.restore("tsla", recreate=True)
+    assert result["status"] == "restored"
+    assert result["num_points"] == expected
+    assert result["npy_sha256"] == registry.get_collection_info("tsla")["npy_sha256"]
+
+
+def test_restore_rejects_altered_matrix_and_keeps_collection(restorer, data_dirs, qdrant_memory):
+    npy_path = data_dirs["npy"] / "tsla.npy"
+    embeddings = np.load(npy_path)
+    np.save(npy_path, embeddings + 0.01)
+    expected = qdrant_memory.count("tsla", exact=True).count
+
+    with pytest.raises(RestoreError, match="Checksum"):
+        restorer.restore("tsla", recreate=True)
+    # Nothing was dropped before the files were found inconsistent
+    assert qdrant_memory.count("tsla", exact=True).count == expected
+
+
+def test_restore_rejects_matrix_not_matching_chunk_table(restorer, data_dirs):
+    npy_path = data_dirs["npy"] / "tsla.npy"
+    np.save(npy_path, np.load(npy_path)[:-1])
+
+    result, = restorer.restore_all(recreate=True)
+    assert result["status"] == "failed"
+    assert "rows" in result["message"]
+
+
+def test_restorer_shares_the_process_registry(restorer):
+    assert restorer.registry is registry.get_registry()
@@ -0,0 +1,87 @@
+# tests/test_sentiment.py
+import pandas as pd
+
+from app.sentiment.aggregate import aggregate_sentiment
+from app.sentiment.scorer import score_posts, score_texts
+
+DAY = 86400.0
+
+
+def test_scores_follow_lexicon_and_negation():
+    bullish, bearish, negated, neutral = score_texts([
+        "Bullish on TSLA, buying calls 🚀",
+        "This stock will crash, sell now",
+        "not bullish",
+        "Earnings are on Tuesday",
+    ])
+    assert bullish > 0.5
+    assert bearish < -0.5
+    assert negated < 0
+    assert neutral == 0.0
+
+
+def test_score_posts_labels_title_and_body():
+    df = pd.DataFrame({
+        "title": ["Great quarter", "Bagholders everywhere", "Question"],
+        "selftext": ["rally incoming", None, "When is the call?"],
+    })
+    score_posts(df)
+    assert df["sentiment_label"].tolist()[:2] == ["bullish", "bearish"]
+    assert df["sentiment"].between(-1, 1).all()
+
+
+def test_weighted_mean_favours_upvoted_posts():
+    payloads = [
+        {"post_id": "a", "sentiment": 0.8, "score": 1000, "created_utc": 0.0},
+        {"post_id": "b", "sentiment": -0.4, "score": 0, "created_utc": 0.0},
+    ]
+    result = aggregate_sentiment(payloads)
+    assert result["posts"] == 2
+    assert abs(result["mean"] - 0.2) < 1e-9
+    assert result["weighted_mean"] > result["mean"]
+    assert result["bullish_share"] == 0.5
+
+
+def test_chunks_of_a_post_count_once_and_fill_buckets():
+    payloads = [
+        {"post_id": "a", "sentiment": 0.5, "score": 3, "created_utc": 0.0},
+        {"post_id": "a", "sentiment": 0.5, "score": 3, "created_utc": 0.0},
+        {"post_id": "b", "sentiment": -0.5, "score": 3, "created_utc": 2 * DAY},
+    ]
+    result = aggregate_sentiment(payloads, bucket="1D")
+    assert result["posts"] == 2
+    # Empty days in between are left out
+    assert [(b["posts"], b["mean"]) for b in result["series"]] == [(1, 0.5), (1, -0.5)]
+    assert result["series"][1]["bucket_start"].startswith("1970-01-03")
+
+
+def test_empty_input():
+    result = aggregate_sentiment([])
+    assert result["posts"] == 0
+    assert result["mean"] is None
+    assert result["series"] == []
+    # Same keys as a non-empty result
+    assert set(result) == set(aggregate_sentiment([{"sentiment": 0.1}]))
+    assert result["bullish_share"] is None and result["bearish_share"] is None
+    assert set(result["comments"]) == {
+        "comments", "mean", "weighted_mean", "bullish_share", "bearish_share", "series",
+    }
+
+
+def test_comments_are_aggregated_separately():
+    post = {"post_id": "a", "sentiment": 0.6, "score": 10, "created_utc": 0.0}
+    payloads = [
+        post,
+        {**post, "comment_id": "c1", "comment_sentiment": -0.8, "comment_score": 50, "comment_created_utc": DAY},
+        {**post, "comment_id": "c1", "comment_sentiment": -0.8, "comment_score": 50, "comment_created_utc": DAY},
+        {**post, "comment_id": "c2", "comment_sentiment": 0.2, "comment_score": 0, "comment_created_utc": DAY},
+    ]
+    result = aggregate_sentiment(payloads)
+    assert (result["posts"], result["mean"]) == (1, 0.6)
+
+    comments = result["comments"]
+    assert comments["comments"] == 2
+    assert abs(comments["mean"] - (-0.3)) < 1e-9
+    # The upvoted bearish comment dominates the weighted mean
+    assert comments["weighted_mean"] < comments["mean"]
+    assert [b["comments"] for b in comments["series"]] == [2]
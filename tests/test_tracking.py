@@ -0,0 +1,59 @@
+# tests/test_tracking.py
+import threading
+import time
+
+from app.monitoring.metrics import TRACKING_EVENTS_DROPPED
+from app.monitoring.tracking import BackgroundTracker, file_sha256
+
+
+def make_tracker(monkeypatch, process, **kwargs):
+    monkeypatch.delenv("MLFLOW_TRACKING_DISABLED", raising=False)
+    tracker = BackgroundTracker(flush_interval=0.01, **kwargs)
+    monkeypatch.setattr(tracker, "_process", process)
+    return tracker
+
+
+def test_events_are_sent_from_the_background_thread(monkeypatch):
+    batches = []
+    tracker = make_tracker(monkeypatch, lambda events: batches.append((threading.current_thread().name, events)))
+
+    run = tracker.start_run("embeddings_tsla")
+    run.log_params({"model": "all-MiniLM-L6-v2"})
+    run.log_metrics({"embed_seconds": 1.5})
+    run.end("FINISHED")
+
+    assert tracker.flush(timeout=5)
+    assert {name for name, _ in batches} == {"mlflow-tracker"}
+    events = [event for _, batch in batches for event in batch]
+    assert [kind for kind, _, _ in events] == ["start", "params", "metrics", "end"]
+    assert {key for _, key, _ in events} == {run.run_key}
+
+
+def test_slow_or_failing_server_never_blocks_the_caller(monkeypatch):
+    release = threading.Event()
+
+    def stuck(events):
+        release.wait(5)
+        raise ConnectionError("tracking server down")
+
+    tracker = make_tracker(monkeypatch, stuck, max_queue_size=2)
+    dropped = TRACKING_EVENTS_DROPPED._value.get()
+
+    started = time.perf_counter()
+    run = tracker.start_run("embeddings_tsla")
+    for step in range(20):
+        run.log_metrics({"loss": step}, step=step)
+    assert time.perf_counter() - started < 0.5
+
+    release.set()
+    assert tracker.flush(timeout=5)
+    # Queue overflow and the failed batches are all counted
+    assert TRACKING_EVENTS_DROPPED._value.get() - dropped == 21
+
+
+def test_file_sha256_matches_hashlib(tmp_path):
+    import hashlib
+
+    path = tmp_path / "embeddings.npy"
+    path.write_bytes(b"x" * (3 * 1024 * 1024 + 7))
+    assert file_sha256(str(path)) == hashlib.sha256(path.read_bytes()).hexdigest()
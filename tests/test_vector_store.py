@@ -0,0 +1,38 @@
+# tests/test_vector_store.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.vector_store.client import VectorStoreClient
+from app.vector_store.profiles import select_profile
+
+POSTS = pd.DataFrame({
+    "id": ["a", "b"], "title": ["TSLA", "AAPL"], "selftext": ["up", "down"], "score": [1, 2],
+})
+
+
+def vectors(dim):
+    return np.random.default_rng(0).random((2, dim)).astype(np.float32)
+
+
+def test_upload_rebuilds_collection_of_another_vector_size(qdrant_memory, tmp_path):
+    store = VectorStoreClient(qdrant_memory)
+    csv_path = tmp_path / "posts.csv"
+    POSTS.to_csv(csv_path, index=False)
+
+    store.upload_embeddings_with_payloads(vectors(16), str(csv_path), "tsla")
+    # Reprocessed with a reduction to 8 dimensions
+    store.upload_embeddings_with_payloads(vectors(8), str(csv_path), "tsla")
+
+    assert store.vector_size("tsla") == 8
+    assert qdrant_memory.count("tsla").count == 2
+
+
+def test_create_collection_rejects_another_vector_size(qdrant_memory):
+    store = VectorStoreClient(qdrant_memory)
+    profile = select_profile(None, None)
+    assert store.create_collection("tsla_live", 16, profile)
+    assert not store.create_collection("tsla_live", 16, profile)
+
+    with pytest.raises(ValueError, match="16-dimensional"):
+        store.create_collection("tsla_live", 8, profile)
@@ -0,0 +1,38 @@
+# tests/test_warmup.py
+import app.rag.warmup as warmup
+from app.rag.warmup import AnswerStore
+
+
+def test_stored_answers_are_served_only_for_the_current_collection_version(tmp_path, monkeypatch):
+    versions = {"tsla_live": "v1"}
+    monkeypatch.setattr(warmup, "collection_version", lambda name: versions.get(name))
+    store = AnswerStore(tmp_path)
+    store.put("tsla_live", "v1", [{
+        "question": "Wie ist die allgemeine Stimmung zu TSLA?",
+        "answer": "Überwiegend bullish.",
+        "top_k": 5,
+        "context_posts": 5,
+        "sources": [],
+        "computed_at": "2025-01-01T00:00:00",
+    }])
+
+    assert store.get("tsla_live", "wie ist die allgemeine  Stimmung zu tsla", 5)["answer"] == "Überwiegend bullish."
+    assert store.get("tsla_live", "Wie ist die allgemeine Stimmung zu TSLA?", 3) is None
+
+    # Appending posts changes the embedding checksum in the registry
+    versions["tsla_live"] = "v2"
+    assert store.get("tsla_live", "Wie ist die allgemeine Stimmung zu TSLA?", 5) is None
+
+
+def test_folded_reposts_change_collection_version(data_dirs):
+    from app.vector_store.registry import update_collection_info
+
+    update_collection_info("tsla_live", npy_sha256="abc")
+    before = warmup.collection_version("tsla_live")
+    # Scores refreshed in place keep the precomputed answers
+    update_collection_info("tsla_live", counts_updated_at="2025-01-01T12:00:00")
+    assert warmup.collection_version("tsla_live") == before == "abc"
+
+    # Reposts folded in, the embedding matrix is unchanged
+    update_collection_info("tsla_live", folded_at="2025-01-01T12:00:00")
+    assert warmup.collection_version("tsla_live") != before